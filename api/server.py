@@ -0,0 +1,609 @@
+"""
+Servicio HTTP local de generación de códigos QR
+Expone QRGenerator y QRExporter (PNG, SVG, PDF) en las rutas de
+config.API_ENDPOINTS. El bucle de eventos solo atiende sockets: todo el
+renderizado se hace en un pool de procesos.
+
+Uso:
+    python main.py serve --port 5000 --workers 4
+    python -m api.server
+
+QR dinámicos: create_qr con {"dynamic": true, "target": "...", "type": "pdf"}
+crea un slug cuyo QR codifica '/r/<slug>'; get/update/delete/list_qr lo
+administran y redirect_qr redirige al destino actual.
+
+Las imágenes de create_qr se guardan en la caché en disco
+(core.qr_disk_cache): una petición repetida se sirve sin renderizar.
+
+Ejemplo:
+    curl -X POST http://localhost:5000/api/qr/create \\
+         -d '{"content": "https://www.example.com", "format": "svg"}' -o qr.svg
+
+El cuerpo de create_qr es un elemento de core.qr_batch.parse_item ('content'
+o 'type' y sus campos, más parámetros de estilo) con la clave opcional
+'format' ('png' por defecto).
+
+Este módulo no importa Qt.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qsl, quote, unquote, urlsplit
+
+import config
+from core.qr_batch import init_worker, parse_item, render_item
+from core.qr_content import parse_bool
+
+
+# Método HTTP de cada endpoint de config.API_ENDPOINTS
+ENDPOINT_METHODS = {
+    'create_qr': 'POST',
+    'upload_file': 'POST',
+    'get_qr': 'GET',
+    'update_qr': 'PUT',
+    'delete_qr': 'DELETE',
+    'list_qr': 'GET',
+    'redirect_qr': 'GET'
+}
+
+# Formatos de salida de create_qr: formato de render_item y Content-Type
+OUTPUT_FORMATS = {
+    'png': ('PNG', 'image/png'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'webp': ('WEBP', 'image/webp'),
+    'svg': ('SVG', 'image/svg+xml'),
+    'pdf': ('PDF', 'application/pdf')
+}
+
+# Extensión de los archivos de la caché en disco por formato de render_item
+CACHE_EXTENSIONS = {
+    'PNG': '.png',
+    'JPEG': '.jpg',
+    'WEBP': '.webp',
+    'SVG': '.svg',
+    'PDF': '.pdf'
+}
+
+# Límites de las peticiones
+MAX_HEADER_SIZE = 16 * 1024
+MAX_BODY_SIZE = 1024 * 1024
+
+# Segundos que una conexión keep-alive puede estar inactiva
+KEEPALIVE_TIMEOUT = 15
+
+# Petición ya leída del socket
+Request = namedtuple('Request', ['method', 'path', 'query', 'headers', 'body'])
+
+# Respuesta: estado, tipo de contenido, cuerpo (bytes) y cabeceras adicionales
+Response = namedtuple('Response', ['status', 'content_type', 'body', 'headers'], defaults=(None,))
+
+
+class HTTPError(Exception):
+    """Error que se responde al cliente con un estado HTTP y un mensaje JSON"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def json_response(data, status=200):
+    """Respuesta JSON"""
+    body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+    return Response(status, 'application/json; charset=utf-8', body)
+
+
+def read_json(request):
+    """
+    Cuerpo JSON de una petición
+
+    Raises:
+        HTTPError: 400 si el cuerpo no es un objeto JSON
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise HTTPError(400, f"JSON inválido: {e}")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "El cuerpo debe ser un objeto JSON")
+    return data
+
+
+def default_address():
+    """Host y puerto por defecto, tomados de config.API_BASE_URL"""
+    url = urlsplit(config.API_BASE_URL)
+    return url.hostname or 'localhost', url.port or 5000
+
+
+class Router:
+    """
+    Tabla de rutas con parámetros ('/api/qr/{slug}')
+
+    Las rutas sin parámetros tienen prioridad, de modo que '/api/qr/list' no
+    se interpreta como el slug 'list'.
+    """
+
+    def __init__(self):
+        """Inicializar la tabla vacía"""
+        self._exact = {}
+        self._patterns = []
+
+    def add(self, method, template, handler):
+        """
+        Registrar una ruta
+
+        Args:
+            method: Método HTTP ('GET', 'POST', ...)
+            template: Ruta con parámetros entre llaves
+            handler: Corrutina handler(request, **parámetros) -> Response
+        """
+        if '{' not in template:
+            self._exact.setdefault(template, {})[method] = handler
+            return
+
+        regex = re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', template)
+        for pattern, methods in self._patterns:
+            if pattern.pattern == f"^{regex}$":
+                methods[method] = handler
+                return
+        self._patterns.append((re.compile(f"^{regex}$"), {method: handler}))
+
+    def resolve(self, method, path):
+        """
+        Buscar el handler de una petición
+
+        Returns:
+            tuple: (handler, parámetros de la ruta)
+
+        Raises:
+            HTTPError: 404 si la ruta no existe, 405 si no admite el método
+        """
+        methods, params = self._exact.get(path), {}
+        if methods is None:
+            for pattern, candidate in self._patterns:
+                match = pattern.match(path)
+                if match:
+                    methods = candidate
+                    params = {name: unquote(value) for name, value in match.groupdict().items()}
+                    break
+
+        if methods is None:
+            raise HTTPError(404, f"Ruta no encontrada: {path}")
+        if method not in methods:
+            raise HTTPError(405, f"Método {method} no permitido en {path}")
+        return methods[method], params
+
+
+class QRServer:
+    """
+    Servidor HTTP/1.1 con conexiones keep-alive sobre asyncio
+
+    El renderizado (CPU) se envía a un ProcessPoolExecutor; el número de
+    renders en cola está acotado para que la memoria no crezca con la carga.
+    Los almacenes SQLite (slugs e historial) se usan desde un único hilo
+    propio: sus commits no detienen el bucle de eventos.
+    """
+
+    def __init__(self, host=None, port=None, workers=None, slug_db=None, history_db=None,
+                 disk_cache=None):
+        """
+        Inicializar el servidor
+
+        Args:
+            host: Dirección de escucha (None = la de config.API_BASE_URL)
+            port: Puerto (None = el de config.API_BASE_URL)
+            workers: Procesos de renderizado (None = todos los núcleos)
+            slug_db: Base de datos de QR dinámicos (None = config.SLUG_DB)
+            history_db: Base de datos del historial (None = config.HISTORY_DB)
+            disk_cache: Caché en disco de imágenes (QRDiskCache, True = la compartida,
+                        None o False = sin caché)
+        """
+        default_host, default_port = default_address()
+        self.host = host or default_host
+        self.port = default_port if port is None else port
+        self.workers = workers or os.cpu_count() or 1
+        self.slug_db = slug_db
+        self.history_db = history_db
+        self.disk_cache = disk_cache
+
+        self.router = Router()
+        for name, template in config.API_ENDPOINTS.items():
+            handler = getattr(self, f"handle_{name}", None) or self.handle_not_implemented
+            self.router.add(ENDPOINT_METHODS.get(name, 'GET'), template, handler)
+
+        self._executor = None
+        self._store_executor = None
+        self._server = None
+        self.slugs = None
+        self.history = None
+        self._render_slots = None
+        self._connections = {}
+        self.requests = 0
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    async def start(self):
+        """Arrancar el pool de procesos, abrir los almacenes y el socket de escucha"""
+        loop = asyncio.get_running_loop()
+
+        # Los procesos se crean antes que cualquier socket o base de datos: si
+        # se crearan con la primera petición, heredarían el socket de escucha y
+        # los de los clientes conectados, y una respuesta con 'Connection: close'
+        # no llegaría nunca al fin de archivo (el socket seguiría abierto en ellos).
+        # ProcessPoolExecutor crea un proceso por cada tarea enviada sin procesos libres.
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker)
+        await asyncio.gather(*[
+            loop.run_in_executor(self._executor, os.getpid) for _ in range(self.workers)
+        ])
+        self._render_slots = asyncio.Semaphore(self.workers * 4)
+
+        # Las conexiones SQLite solo se pueden usar desde el hilo que las abrió
+        from core.qr_history import QRHistory
+        from core.qr_slug_store import QRSlugStore
+        self._store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='qr-store')
+        self.slugs = await self.store_call(QRSlugStore, self.slug_db)
+        self.history = await self.store_call(QRHistory, self.history_db)
+
+        if self.disk_cache is True:
+            from core.qr_disk_cache import get_disk_cache
+            self.disk_cache = get_disk_cache()
+        self._server = await asyncio.start_server(
+            self.handle_connection, self.host, self.port, limit=MAX_HEADER_SIZE
+        )
+        # Puerto real (si se pidió el 0, lo elige el sistema)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Atender peticiones hasta que se cancele la tarea"""
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """Cerrar el socket, las conexiones abiertas y el pool de procesos"""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+        # Cerrar los sockets: las lecturas pendientes terminan y cada handler sale solo
+        connections = list(self._connections.items())
+        for _, writer in connections:
+            writer.close()
+        await asyncio.gather(*[task for task, _ in connections], return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self.slugs is not None:
+            await self.store_call(self.slugs.close)
+            self.slugs = None
+        if self.history is not None:
+            await self.store_call(self.history.close)
+            self.history = None
+        if self._store_executor is not None:
+            self._store_executor.shutdown(wait=True)
+            self._store_executor = None
+
+    async def render(self, *args):
+        """Ejecutar render_item en el pool sin bloquear el bucle de eventos"""
+        async with self._render_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, render_item, *args)
+
+    async def store_call(self, function, *args):
+        """Ejecutar una operación de los almacenes SQLite en su hilo"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._store_executor, function, *args)
+
+    # ------------------------------------------------------------------
+    # Protocolo HTTP
+    # ------------------------------------------------------------------
+
+    async def handle_connection(self, reader, writer):
+        """Atender una conexión: varias peticiones seguidas mientras haya keep-alive"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                try:
+                    request, keep_alive = await self._read_request(reader)
+                except HTTPError as e:
+                    await self._write_response(writer, self._error_response(e), keep_alive=False)
+                    break
+                if request is None:
+                    break
+
+                response = await self.dispatch(request)
+                await self._write_response(writer, response, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _read_request(self, reader):
+        """
+        Leer una petición del socket
+
+        Returns:
+            tuple: (Request o None si el cliente cerró, keep-alive)
+        """
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError):
+            return None, False
+        except asyncio.LimitOverrunError:
+            raise HTTPError(431, "Cabeceras demasiado grandes")
+
+        try:
+            lines = head.decode('latin-1').split('\r\n')
+            method, target, version = lines[0].split(' ')
+        except ValueError:
+            raise HTTPError(400, "Línea de petición inválida")
+
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get('connection', '').lower()
+        if version == 'HTTP/1.1':
+            keep_alive = connection != 'close'
+        else:
+            keep_alive = connection == 'keep-alive'
+
+        if 'chunked' in headers.get('transfer-encoding', '').lower():
+            raise HTTPError(411, "Se requiere Content-Length")
+        try:
+            length = int(headers.get('content-length', 0))
+        except ValueError:
+            raise HTTPError(400, "Content-Length inválido")
+        if length > MAX_BODY_SIZE:
+            raise HTTPError(413, "Cuerpo demasiado grande")
+
+        try:
+            body = await reader.readexactly(length) if length else b''
+        except asyncio.IncompleteReadError:
+            return None, False
+
+        url = urlsplit(target)
+        request = Request(method.upper(), url.path, dict(parse_qsl(url.query)), headers, body)
+        return request, keep_alive
+
+    async def _write_response(self, writer, response, keep_alive):
+        """Escribir la respuesta completa y esperar al buffer del socket"""
+        status = HTTPStatus(response.status)
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {response.content_type}\r\n"
+            f"Content-Length: {len(response.body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            + ''.join(f"{name}: {value}\r\n" for name, value in (response.headers or {}).items())
+            + "\r\n"
+        )
+        writer.write(head.encode('latin-1') + response.body)
+        await writer.drain()
+
+    def _error_response(self, error):
+        """Respuesta JSON para un HTTPError"""
+        return json_response({'error': error.message}, error.status)
+
+    async def dispatch(self, request):
+        """
+        Resolver la ruta y ejecutar su handler
+
+        Args:
+            request: Request leída del socket
+
+        Returns:
+            Response: Respuesta del handler o del error producido
+        """
+        self.requests += 1
+        try:
+            handler, params = self.router.resolve(request.method, request.path)
+            return await handler(request, **params)
+        except HTTPError as e:
+            return self._error_response(e)
+        except Exception as e:
+            print(f"❌ Error en {request.method} {request.path}: {type(e).__name__}: {e}", file=sys.stderr)
+            return json_response({'error': 'Error interno del servidor'}, 500)
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+
+    async def handle_create_qr(self, request):
+        """
+        POST create_qr: generar un QR y devolver la imagen
+
+        Cuerpo JSON: 'content' (o 'type' y sus campos), parámetros de estilo
+        de generate(), 'error_correction' y 'format' (png, jpeg, webp, svg, pdf).
+
+        Con "dynamic": true se crea un QR dinámico ('target', 'type' y
+        'title' opcional): sin 'format' responde el registro JSON, con
+        'format' la imagen de su URL corta y el slug en X-QR-Slug.
+        """
+        item = read_json(request)
+        output_format = item.pop('format', request.query.get('format'))
+
+        headers = None
+        qr_type = item.get('type', 'text')
+        # Mismo criterio que el resto de campos booleanos: "false" no es verdadero
+        if parse_bool(item.pop('dynamic', False)):
+            try:
+                record = await self.store_call(
+                    self.slugs.create,
+                    item.pop('target', None),
+                    item.pop('type', 'url'),
+                    item.pop('title', None)
+                )
+            except ValueError as e:
+                raise HTTPError(400, str(e))
+            qr_type = record['type']
+            if output_format is None:
+                await self._record_history(qr_type, record['url'])
+                return json_response(record, 201)
+            item['content'] = record['url']
+            headers = {'X-QR-Slug': record['slug']}
+
+        output_format = str(output_format or 'png').lower()
+        if output_format not in OUTPUT_FORMATS:
+            raise HTTPError(400, f"Formato no soportado: {output_format}")
+        encode, content_type = OUTPUT_FORMATS[output_format]
+
+        try:
+            content, error_correction, options = parse_item(item)
+            data = await self._cached_render(item, encode, content, error_correction, options)
+        except (ValueError, TypeError) as e:
+            # Contenido inválido, parámetros desconocidos o datos que no caben en un QR
+            raise HTTPError(400, f"{type(e).__name__}: {e}")
+
+        await self._record_history(qr_type, content, options)
+        return Response(200 if headers is None else 201, content_type, data, headers)
+
+    async def _cached_render(self, item, encode, content, error_correction, options):
+        """Imagen desde la caché en disco, o renderizada en el pool y guardada"""
+        if not self.disk_cache:
+            return await self.render(item, None, encode)
+
+        from core.qr_disk_cache import make_key
+        key = make_key(encode, content, error_correction, **options)
+        extension = CACHE_EXTENSIONS[encode]
+        # La E/S de disco va al pool de hilos: el bucle solo atiende sockets
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(None, self.disk_cache.get, key, extension)
+        if data is None:
+            data = await self.render(item, None, encode)
+            await loop.run_in_executor(None, self.disk_cache.put, key, extension, data)
+        return data
+
+    async def _record_history(self, qr_type, content, options=None):
+        """Guardar un código generado en el historial (un fallo no afecta a la respuesta)"""
+        try:
+            await self.store_call(self.history.add, qr_type, content, options or None)
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar en el historial: {e}", file=sys.stderr)
+
+    async def _get_record(self, slug):
+        """Registro de un slug o error 404"""
+        record = await self.store_call(self.slugs.get, slug)
+        if record is None:
+            raise HTTPError(404, f"QR dinámico no encontrado: {slug}")
+        return record
+
+    async def handle_get_qr(self, request, slug):
+        """GET get_qr: registro de un QR dinámico"""
+        return json_response(await self._get_record(slug))
+
+    async def handle_update_qr(self, request, slug):
+        """PUT update_qr: cambiar el destino ('target') o el nombre ('title')"""
+        changes = read_json(request)
+        try:
+            record = await self.store_call(self.slugs.update, slug, changes.get('target'), changes.get('title'))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        if record is None:
+            raise HTTPError(404, f"QR dinámico no encontrado: {slug}")
+        return json_response(record)
+
+    async def handle_delete_qr(self, request, slug):
+        """DELETE delete_qr: borrar un QR dinámico"""
+        if not await self.store_call(self.slugs.delete, slug):
+            raise HTTPError(404, f"QR dinámico no encontrado: {slug}")
+        return json_response({'deleted': slug})
+
+    async def handle_list_qr(self, request):
+        """GET list_qr: página de QR dinámicos (?limit=50&after=<slug>)"""
+        try:
+            page = await self.store_call(
+                self.slugs.list, request.query.get('limit', 50), request.query.get('after')
+            )
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        return json_response(page)
+
+    async def handle_redirect_qr(self, request, slug):
+        """GET redirect_qr: redirección temporal al destino actual del QR"""
+        target = await self.store_call(self.slugs.resolve, slug)
+        if target is None:
+            raise HTTPError(404, f"QR dinámico no encontrado: {slug}")
+        # 302 y sin caché: el destino puede cambiar en cualquier momento
+        headers = {
+            'Location': quote(target, safe=":/?#[]@!$&'()*+,;=%~"),
+            'Cache-Control': 'no-store'
+        }
+        return Response(302, 'text/plain; charset=utf-8', b'', headers)
+
+    async def handle_not_implemented(self, request, **params):
+        """Endpoints de config.API_ENDPOINTS que aún no tienen implementación"""
+        raise HTTPError(501, f"{request.method} {request.path} aún no está disponible")
+
+
+def add_serve_arguments(parser):
+    """Opciones del servidor (compartidas por 'main.py serve' y 'python -m api.server')"""
+    host, port = default_address()
+    parser.add_argument('--host', default=host, help=f'Dirección de escucha (por defecto {host})')
+    parser.add_argument('--port', type=int, default=port, help=f'Puerto (por defecto {port})')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Procesos de renderizado (por defecto, todos los núcleos)')
+    parser.add_argument('--slug-db', default=None,
+                        help=f'Base de datos de QR dinámicos (por defecto {config.SLUG_DB})')
+    parser.add_argument('--history-db', default=None,
+                        help=f'Base de datos del historial (por defecto {config.HISTORY_DB})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help=f'No usar la caché en disco de imágenes ({config.CACHE_DIR})')
+
+
+def run_server(args):
+    """
+    Punto de entrada del subcomando 'serve'
+
+    Args:
+        args: Argumentos con host, port, workers, slug_db, history_db y no_cache
+
+    Returns:
+        int: Código de salida
+    """
+    server = QRServer(args.host, args.port, args.workers, args.slug_db, args.history_db,
+                      disk_cache=not args.no_cache)
+
+    async def serve():
+        await server.start()
+        print(f"🚀 Servidor en http://{server.host}:{server.port} ({server.workers} procesos)")
+        for name, template in config.API_ENDPOINTS.items():
+            print(f"   {ENDPOINT_METHODS.get(name, 'GET'):<6} {template}")
+        try:
+            await server.serve_forever()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"\n👋 Servidor detenido ({server.requests} peticiones atendidas)")
+    except OSError as e:
+        print(f"❌ No se pudo iniciar el servidor: {e}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def main(argv=None):
+    """Ejecutar el servidor como módulo: python -m api.server"""
+    parser = argparse.ArgumentParser(prog='python -m api.server', description=__doc__.splitlines()[1])
+    add_serve_arguments(parser)
+    return run_server(parser.parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Benchmark de generación por lotes con QRGenerator.generate_many
+Mide códigos por segundo según el número de procesos
+
+Uso:
+    python -m benchmarks.bench_batch [elementos] [patrón]
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.qr_generator import QRGenerator
+
+
+def run_benchmark(count=400, pattern_style='circles'):
+    """Genera el mismo lote con 1..N procesos y compara el rendimiento"""
+    generator = QRGenerator()
+    style = {'scale': 10, 'pattern_style': pattern_style, 'frame_style': 'scan_me_top'}
+    cores = os.cpu_count() or 1
+
+    worker_counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+
+    print(f"Elementos: {count}, patrón: {pattern_style}, núcleos: {cores}")
+    print(f"{'procesos':>8} {'tiempo (s)':>11} {'códigos/s':>10} {'speedup':>8}")
+    print("-" * 42)
+
+    baseline = None
+    for workers in worker_counts:
+        # Contenidos distintos por ejecución: sin aciertos en las cachés
+        items = (f"https://www.example.com/{workers}/{i}" for i in range(count))
+
+        start = time.perf_counter()
+        failures = sum(
+            1 for result in generator.generate_many(items, style, workers=workers, encode='PNG')
+            if result.error
+        )
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>11.2f} {count / elapsed:>10.1f} {baseline / elapsed:>7.2f}x")
+        if failures:
+            print(f"❌ {failures} elementos fallaron")
+            return False
+
+    return True
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    pattern = sys.argv[2] if len(sys.argv) > 2 else 'circles'
+    if not run_benchmark(count, pattern):
+        sys.exit(1)
@@ -0,0 +1,119 @@
+"""
+Benchmark del rasterizador de patrones personalizados
+Compara el dibujo módulo a módulo con ImageDraw contra el renderizador vectorizado
+
+Uso:
+    python -m benchmarks.bench_custom_pattern
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import segno
+from PIL import Image, ImageDraw
+
+import config
+from core.qr_pattern_renderer import QRPatternRenderer
+
+
+PATTERNS = ['circles', 'flowers', 'hearts', 'dots']
+VERSIONS = [1, 5, 10, 20, 30, 40]
+REPEAT = 3
+
+
+def legacy_custom_pattern(qr, scale, dark_rgb, light_rgb, pattern_style):
+    """Implementación original: una llamada a ImageDraw por módulo oscuro"""
+    matrix = qr.matrix
+    size = len(matrix)
+    img_size = size * scale
+    image = Image.new('RGB', (img_size, img_size), light_rgb)
+    draw = ImageDraw.Draw(image)
+
+    for row in range(size):
+        for col in range(size):
+            if matrix[row][col]:
+                x = col * scale
+                y = row * scale
+                if pattern_style == 'circles':
+                    margin = scale * 0.1
+                    draw.ellipse([x + margin, y + margin, x + scale - margin, y + scale - margin], fill=dark_rgb)
+                elif pattern_style == 'flowers':
+                    quarter = scale / 4
+                    radius = scale / 6
+                    positions = [
+                        (x + quarter, y + quarter),
+                        (x + 3*quarter, y + quarter),
+                        (x + quarter, y + 3*quarter),
+                        (x + 3*quarter, y + 3*quarter)
+                    ]
+                    for px, py in positions:
+                        draw.ellipse([px - radius, py - radius, px + radius, py + radius], fill=dark_rgb)
+                elif pattern_style == 'hearts':
+                    margin = scale * 0.15
+                    draw.ellipse([x + margin, y + margin, x + scale - margin, y + scale - margin], fill=dark_rgb)
+                elif pattern_style == 'dots':
+                    margin = scale * 0.3
+                    draw.ellipse([x + margin, y + margin, x + scale - margin, y + scale - margin], fill=dark_rgb)
+                else:
+                    draw.rectangle([x, y, x + scale, y + scale], fill=dark_rgb)
+
+    return image
+
+
+def best_time(func, repeat=REPEAT):
+    """Retorna el mejor tiempo (segundos) de varias ejecuciones"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def check_identical(scales=range(1, 31)):
+    """Verifica que ambos métodos producen exactamente los mismos píxeles"""
+    renderer = QRPatternRenderer()
+    qr = segno.make("https://www.example.com/benchmark", error='Q', version=7, boost_error=False)
+    dark, light = (18, 52, 86), (250, 240, 230)
+
+    for pattern in PATTERNS + ['unknown']:
+        for scale in scales:
+            expected = np.asarray(legacy_custom_pattern(qr, scale, dark, light, pattern))
+            actual = np.asarray(renderer.render(qr.matrix, scale, dark, light, pattern).convert('RGB'))
+            if not np.array_equal(expected, actual):
+                print(f"❌ Diferencia en patrón '{pattern}' con escala {scale}")
+                return False
+
+    print("✅ Salida idéntica para todos los patrones y escalas 1-30")
+    return True
+
+
+def run_benchmark():
+    """Ejecuta el benchmark por versión, escala y patrón"""
+    renderer = QRPatternRenderer()
+    dark, light = (0, 0, 0), (255, 255, 255)
+
+    print(f"{'patrón':<9} {'versión':>7} {'escala':>6} {'original (ms)':>14} {'numpy (ms)':>11} {'speedup':>8}")
+    print("-" * 60)
+
+    for pattern in PATTERNS:
+        for version in VERSIONS:
+            qr = segno.make("BENCHMARK", error='Q',
+                            version=version, boost_error=False)
+            for scale in config.EXPORT_SCALES.values():
+                legacy = best_time(lambda: legacy_custom_pattern(qr, scale, dark, light, pattern))
+                vectorized = best_time(lambda: renderer.render(qr.matrix, scale, dark, light, pattern).convert('RGB'))
+                print(f"{pattern:<9} {version:>7} {scale:>6} {legacy * 1000:>14.2f} "
+                      f"{vectorized * 1000:>11.2f} {legacy / vectorized:>7.1f}x")
+
+
+if __name__ == "__main__":
+    if not check_identical():
+        sys.exit(1)
+    print()
+    run_benchmark()
@@ -0,0 +1,53 @@
+"""
+Benchmark del historial (core.qr_history)
+Mide el alta de entradas y las consultas paginadas sobre N entradas
+
+Uso:
+    python -m benchmarks.bench_history [entradas]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.qr_history import QRHistory
+
+
+def timed(label, function, repeat=100):
+    """Ejecuta una función varias veces y muestra el tiempo medio"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    elapsed = (time.perf_counter() - start) / repeat
+    print(f"{label:<32} {elapsed * 1000:>8.3f} ms")
+    return result
+
+
+def run_benchmark(count=1000000):
+    """Llena el historial con N entradas y mide altas y consultas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        with QRHistory(tmp / 'history.db', tmp / 'history.json') as history:
+            style = {'pattern_style': 'circles', 'frame_style': 'none'}
+
+            start = time.perf_counter()
+            for i in range(count):
+                history.add('wifi' if i % 3 == 0 else 'url', f"https://www.example.com/{i}", style)
+            elapsed = time.perf_counter() - start
+            print(f"Alta de {count} entradas: {elapsed:.1f} s ({elapsed / count * 1e6:.1f} µs/entrada)")
+
+            timed("Alta (una entrada)", lambda: history.add('url', 'https://www.example.com', style))
+            page = timed("Últimas 50", lambda: history.list(50))
+            timed("Página siguiente", lambda: history.list(50, before=page['next']))
+            timed("Página a mitad del historial", lambda: history.list(50, before=count // 2))
+            timed("Últimas 50 de tipo 'wifi'", lambda: history.list(50, qr_type='wifi'))
+            timed("Buscar por contenido", lambda: history.find_content(f"https://www.example.com/{count // 2}"))
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    run_benchmark(count)
@@ -0,0 +1,92 @@
+"""
+Benchmark del servicio HTTP local (api.server)
+Mide peticiones por segundo con varios clientes keep-alive concurrentes
+
+Uso:
+    python -m benchmarks.bench_server [peticiones] [clientes] [formato]
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from api.server import QRServer
+
+
+async def client(port, requests, output_format, client_id, latencies):
+    """Cliente con una sola conexión keep-alive que envía peticiones seguidas"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    path = config.API_ENDPOINTS['create_qr']
+    failures = 0
+
+    for i in range(requests):
+        body = json.dumps({
+            'content': f"https://www.example.com/{client_id}/{i}",
+            'pattern_style': 'circles',
+            'format': output_format
+        }).encode('utf-8')
+        start = time.perf_counter()
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: localhost\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+        )
+        await writer.drain()
+
+        head = await reader.readuntil(b'\r\n\r\n')
+        headers = dict(
+            line.split(': ', 1) for line in head.decode('latin-1').split('\r\n')[1:] if line
+        )
+        await reader.readexactly(int(headers['Content-Length']))
+        latencies.append(time.perf_counter() - start)
+        if not head.startswith(b'HTTP/1.1 200'):
+            failures += 1
+
+    writer.close()
+    await writer.wait_closed()
+    return failures
+
+
+async def run_benchmark(total=2000, clients=32, output_format='png'):
+    """Lanza el servidor en un puerto libre y lo carga con clientes concurrentes"""
+    # Sin caché en disco: se mide el renderizado, no la lectura de archivos
+    server = QRServer('127.0.0.1', 0, disk_cache=False)
+    await server.start()
+    serve_task = asyncio.create_task(server.serve_forever())
+
+    # Calentar el pool (arranque de procesos e imports)
+    await client(server.port, server.workers, output_format, 'warmup', [])
+
+    latencies = []
+    per_client = total // clients
+    start = time.perf_counter()
+    failures = sum(await asyncio.gather(*[
+        client(server.port, per_client, output_format, n, latencies) for n in range(clients)
+    ]))
+    elapsed = time.perf_counter() - start
+
+    serve_task.cancel()
+    await server.close()
+
+    latencies.sort()
+    count = len(latencies)
+    print(f"Procesos: {server.workers}, clientes: {clients}, formato: {output_format}")
+    print(f"{count} peticiones en {elapsed:.2f} s: {count / elapsed:.1f} peticiones/s")
+    print(f"Latencia p50: {latencies[count // 2] * 1000:.1f} ms, "
+          f"p99: {latencies[int(count * 0.99)] * 1000:.1f} ms")
+    if failures:
+        print(f"❌ {failures} peticiones fallaron")
+    return failures == 0
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    output_format = sys.argv[3] if len(sys.argv) > 3 else 'png'
+    if not asyncio.run(run_benchmark(total, clients, output_format)):
+        sys.exit(1)
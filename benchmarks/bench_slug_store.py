@@ -0,0 +1,68 @@
+"""
+Benchmark del almacén de QR dinámicos (core.qr_slug_store)
+Mide la resolución de slugs con la caché fría y caliente sobre N códigos
+
+Uso:
+    python -m benchmarks.bench_slug_store [códigos] [búsquedas]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.qr_slug_store import QRSlugStore, encode_slug
+
+
+def timed_lookups(store, slugs):
+    """Resuelve todos los slugs y retorna microsegundos por búsqueda"""
+    start = time.perf_counter()
+    for slug in slugs:
+        if store.resolve(slug) is None:
+            raise RuntimeError(f"Slug no encontrado: {slug}")
+    return (time.perf_counter() - start) / len(slugs) * 1e6
+
+
+def run_benchmark(count=1000000, lookups=100000):
+    """Crea N códigos y mide búsquedas, actualizaciones y paginación"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'slugs.db'
+
+        with QRSlugStore(db_path) as store:
+            start = time.perf_counter()
+            store.create_many(f"https://www.example.com/{i}" for i in range(count))
+            elapsed = time.perf_counter() - start
+            print(f"Alta de {count} códigos: {elapsed:.1f} s ({count / elapsed:.0f} códigos/s)")
+
+        slugs = [encode_slug(random.randint(1, count)) for _ in range(lookups)]
+
+        # Proceso nuevo en la práctica: caché vacía, cada búsqueda va a SQLite
+        with QRSlugStore(db_path) as store:
+            cold = timed_lookups(store, slugs)
+            warm = timed_lookups(store, slugs)
+
+            start = time.perf_counter()
+            for slug in slugs[:10000]:
+                store.update(slug, target=f"https://www.example.com/v2/{slug}")
+            update = (time.perf_counter() - start) / 10000 * 1e6
+
+            start = time.perf_counter()
+            page = store.list(limit=50)
+            for _ in range(100):
+                page = store.list(limit=50, after=page['next'])
+            listing = (time.perf_counter() - start) / 101 * 1e3
+
+        print(f"Resolución (caché fría):   {cold:.1f} µs")
+        print(f"Resolución (caché caliente): {warm:.1f} µs")
+        print(f"Actualización:             {update:.1f} µs")
+        print(f"Página de 50:              {listing:.2f} ms")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    run_benchmark(count, lookups)
@@ -0,0 +1,84 @@
+"""
+Micro-benchmark de la ruta de módulos cuadrados ('squares' / 'rounded')
+Compara el ida y vuelta PNG de segno (guardar en BytesIO + Image.open) contra
+la construcción directa de la imagen desde la matriz
+
+Uso:
+    python -m benchmarks.bench_squares_path [escala]
+"""
+
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import segno
+from PIL import Image
+
+from core.qr_pattern_renderer import QRPatternRenderer
+
+
+REPEAT = 5
+
+
+def png_round_trip(qr, scale, dark_rgb, light_rgb):
+    """Ruta original: segno escribe un PNG y Pillow lo vuelve a leer"""
+    buffer = BytesIO()
+    qr.save(buffer, kind='png', scale=scale, dark=dark_rgb, light=light_rgb)
+    buffer.seek(0)
+    image = Image.open(buffer)
+    image.load()  # Image.open es perezoso: forzar la decodificación
+    return image
+
+
+def direct_path(renderer, qr, scale, dark_rgb, light_rgb):
+    """Ruta nueva: imagen de paleta construida desde la matriz"""
+    return renderer.render_squares(qr.matrix, scale, dark_rgb, light_rgb,
+                                   border=qr.default_border_size)
+
+
+def best_time(func, repeat=REPEAT):
+    """Retorna el mejor tiempo (segundos) de varias ejecuciones"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(scale=10):
+    """Compara ambas rutas para las versiones 1-40 y verifica que los píxeles coinciden"""
+    renderer = QRPatternRenderer()
+    dark, light = (18, 52, 86), (250, 240, 230)
+
+    print(f"Escala: {scale}")
+    print(f"{'versión':>7} {'píxeles':>10} {'PNG (ms)':>9} {'directo (ms)':>13} {'speedup':>8}")
+    print("-" * 52)
+
+    for version in range(1, 41):
+        qr = segno.make("BENCHMARK", error='Q', version=version, boost_error=False)
+
+        expected = np.asarray(png_round_trip(qr, scale, dark, light).convert('RGB'))
+        actual = np.asarray(direct_path(renderer, qr, scale, dark, light).convert('RGB'))
+        if not np.array_equal(expected, actual):
+            print(f"❌ Diferencia de píxeles en la versión {version}")
+            return False
+
+        old = best_time(lambda: png_round_trip(qr, scale, dark, light))
+        new = best_time(lambda: direct_path(renderer, qr, scale, dark, light))
+        pixels = expected.shape[0] * expected.shape[1]
+        print(f"{version:>7} {pixels:>10} {old * 1000:>9.2f} {new * 1000:>13.2f} {old / new:>7.1f}x")
+
+    print("\n✅ Ambas rutas producen los mismos píxeles en todas las versiones")
+    return True
+
+
+if __name__ == "__main__":
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    if not run_benchmark(scale):
+        sys.exit(1)
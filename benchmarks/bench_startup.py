@@ -0,0 +1,139 @@
+"""
+Benchmark de arranque de la interfaz gráfica
+Mide el tiempo hasta el primer pintado de la ventana principal con la
+plataforma Qt 'offscreen', en procesos nuevos, y falla si supera el
+presupuesto o si antes de pintar se importan módulos de render.
+
+La ventana se abre con main.main([]), el mismo camino que 'python main.py'.
+tests/test_startup.py ejecuta esta medida con pytest.
+
+Uso:
+    python -m benchmarks.bench_startup [--runs 5] [--budget-ms 250]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Instante de arranque del proceso hijo (antes de cualquier import pesado)
+START = time.perf_counter()
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(ROOT))
+
+# Presupuesto por defecto hasta el primer pintado (ms)
+DEFAULT_BUDGET_MS = 250
+
+# Módulos que solo deben cargarse con el primer QR (o con los subcomandos batch/serve)
+DEFERRED_MODULES = [
+    'PIL', 'segno', 'numpy', 'reportlab', 'sqlite3', 'core',
+    'api', 'asyncio', 'multiprocessing', 'concurrent'
+]
+
+
+def measure_first_paint():
+    """
+    Proceso hijo: arranca la aplicación con main.main([]) y sale en el primer pintado
+
+    Imprime un JSON con los tiempos (ms desde el arranque del proceso) y
+    los módulos diferidos que ya estaban cargados.
+    """
+    from PyQt6 import QtWidgets
+    from PyQt6.QtCore import QEvent, QObject
+
+    result = {}
+    marks = {}
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and not result:
+                result.update({
+                    'app_ms': (marks['app'] - START) * 1000,
+                    'first_paint_ms': (time.perf_counter() - START) * 1000,
+                    'loaded': sorted({name.split('.')[0] for name in sys.modules} & set(DEFERRED_MODULES))
+                })
+                QtWidgets.QApplication.instance().quit()
+            return False
+
+    class ProbeApplication(QtWidgets.QApplication):
+        """QApplication que vigila el primer pintado desde que se crea"""
+
+        def __init__(self, argv):
+            super().__init__(argv)
+            marks['app'] = time.perf_counter()
+            self.first_paint = FirstPaint()
+            self.installEventFilter(self.first_paint)
+
+    # main.run_gui() importa QApplication al ejecutarse: recibe la subclase
+    QtWidgets.QApplication = ProbeApplication
+
+    import main
+    main.main([])
+    print(json.dumps(result))
+
+
+def collect_samples(runs=5):
+    """
+    Medir el arranque en varios procesos nuevos
+
+    Returns:
+        list: Resultado de measure_first_paint() de cada proceso
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, '--child'],
+            cwd=ROOT, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def run_benchmark(runs=5, budget_ms=DEFAULT_BUDGET_MS):
+    """
+    Lanza varios procesos nuevos y compara la mediana con el presupuesto
+
+    Returns:
+        int: 0 si se cumple el presupuesto, 1 si no
+    """
+    samples = collect_samples(runs)
+
+    for name in ('app_ms', 'first_paint_ms'):
+        values = [sample[name] for sample in samples]
+        print(f"{name:<16} mediana {statistics.median(values):>7.1f} ms   mín {min(values):>7.1f} ms")
+
+    failed = False
+    loaded = sorted({module for sample in samples for module in sample['loaded']})
+    if loaded:
+        print(f"❌ Módulos cargados antes del primer pintado: {', '.join(loaded)}")
+        failed = True
+
+    first_paint = statistics.median(sample['first_paint_ms'] for sample in samples)
+    if first_paint > budget_ms:
+        print(f"❌ Primer pintado en {first_paint:.0f} ms (presupuesto {budget_ms} ms)")
+        failed = True
+    else:
+        print(f"✅ Primer pintado en {first_paint:.0f} ms (presupuesto {budget_ms} ms)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=5, help='Procesos a medir')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Presupuesto hasta el primer pintado (por defecto {DEFAULT_BUDGET_MS} ms)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_first_paint()
+    else:
+        sys.exit(run_benchmark(args.runs, args.budget_ms))
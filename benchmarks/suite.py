@@ -0,0 +1,435 @@
+"""
+Suite de benchmarks del pipeline de render
+Mide QRGenerator.generate sobre una matriz de versiones (1-40), patrones,
+escalas de exportación y marcos, y las exportaciones PNG/SVG de QRExporter.
+Cada caso se mide en frío (cachés de render vaciadas) y se informa de los
+percentiles de latencia, los píxeles por segundo y la memoria. El grupo
+'encode' mide solo la codificación con segno, que en las versiones altas
+es buena parte del tiempo de los demás casos.
+
+Los resultados se guardan en JSON para comparar ejecuciones:
+
+    python -m benchmarks.suite                       # suite completa (varios minutos)
+    python -m benchmarks.suite --quick               # versiones 1, 10, 25 y 40
+    python -m benchmarks.suite --groups frames --versions 1-10
+    python -m benchmarks.suite --compare storage/profiles/suite-base.json
+
+La memoria se da en dos cifras: el pico de tracemalloc (Python y numpy) y
+el tamaño de la imagen resultante. Los búferes de píxeles de Pillow no
+pasan por el asignador de Python y tracemalloc no los ve.
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime
+from pathlib import Path
+
+# Permitir ejecutar el script directamente desde la raíz del proyecto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import segno
+
+import config
+from core.qr_cache import clear_render_caches, make_symbol
+from core.qr_exporter import QRExporter
+from core.qr_frame_generator import frame_templates
+from core.qr_generator import QRGenerator
+
+
+# Mismos estilos que ofrece el panel de personalización
+PATTERN_STYLES = ['squares', 'rounded', 'circles', 'flowers', 'hearts', 'dots']
+FRAME_STYLES = [
+    'none', 'scan_me_top', 'scan_me_bottom', 'simple_border',
+    'rounded_border', 'camera_icon', 'smartphone_icon', 'elegant'
+]
+
+VERSIONS = list(range(1, 41))
+QUICK_VERSIONS = [1, 10, 25, 40]
+
+GROUPS = ['encode', 'generate', 'frames', 'export']
+
+# Mediciones por caso (más una ejecución aparte con tracemalloc)
+DEFAULT_REPEAT = 5
+QUICK_REPEAT = 3
+
+# Empeoramiento de la mediana a partir del cual --compare marca una regresión
+DEFAULT_THRESHOLD = 0.10
+
+# Prefijo del contenido; se rellena hasta alcanzar cada versión (la 1 admite 11 bytes)
+PAYLOAD_PREFIX = "https://"
+
+# Un caso de la matriz: run() devuelve (píxeles, bytes de la imagen o archivo);
+# en el grupo 'encode', módulos del símbolo en lugar de píxeles
+Case = namedtuple('Case', ['id', 'group', 'params', 'run'])
+
+
+def payload_for_version(version, error='Q'):
+    """
+    Contenido más corto que se codifica exactamente en la versión pedida
+
+    Args:
+        version: Versión del QR (1-40)
+        error: Nivel de corrección de errores
+
+    Returns:
+        str: Contenido (URL rellenada con letras, modo byte)
+    """
+    def content(length):
+        return PAYLOAD_PREFIX + ('abcdefghij' * (length // 10 + 1))[:length]
+
+    def version_of(length):
+        try:
+            version = make_symbol(content(length), error=error, boost_error=False).version
+        except segno.DataOverflowError:
+            # No cabe ni en la versión 40
+            return 41
+        # Los contenidos muy cortos se codifican como Micro QR ('M1'...'M4')
+        return version if isinstance(version, int) else 0
+
+    # Búsqueda binaria sobre la longitud del relleno (la versión crece con ella)
+    low, high = 0, 4096
+    while low < high:
+        middle = (low + high) // 2
+        if version_of(middle) < version:
+            low = middle + 1
+        else:
+            high = middle
+    if version_of(low) != version:
+        raise ValueError(f"No hay contenido que se codifique en la versión {version}")
+    return content(low)
+
+
+def parse_versions(text):
+    """
+    Interpreta una lista de versiones ('1,5,10-20')
+
+    Returns:
+        list: Versiones ordenadas y sin repetir
+    """
+    versions = set()
+    for part in text.split(','):
+        part = part.strip()
+        if '-' in part:
+            first, last = part.split('-', 1)
+            versions.update(range(int(first), int(last) + 1))
+        elif part:
+            versions.add(int(part))
+    if not versions or min(versions) < 1 or max(versions) > 40:
+        raise argparse.ArgumentTypeError(f"Versiones fuera de 1-40: {text}")
+    return sorted(versions)
+
+
+def _image_bytes(image):
+    """Memoria de los píxeles de una imagen de Pillow"""
+    return image.width * image.height * len(image.getbands())
+
+
+def _reset_caches():
+    """Vaciar las cachés de render: cada medición empieza en frío"""
+    clear_render_caches()
+    frame_templates.clear()
+
+
+def build_cases(versions, groups, output_dir):
+    """
+    Construir los casos de la matriz
+
+    Args:
+        versions: Versiones a medir
+        groups: Grupos de casos ('encode', 'generate', 'frames', 'export')
+        output_dir: Directorio para los archivos de las exportaciones
+
+    Returns:
+        list: Casos (Case) en orden de ejecución
+    """
+    generator = QRGenerator(config.DEFAULT_ERROR_CORRECTION)
+    exporter = QRExporter(disk_cache=False)
+    scale = config.DEFAULT_EXPORT_SCALE
+    cases = []
+
+    for version in versions:
+        content = payload_for_version(version, config.DEFAULT_ERROR_CORRECTION)
+
+        def generate(scale, pattern_style, frame_style='none', content=content):
+            image = generator.generate(content, scale=scale, pattern_style=pattern_style, frame_style=frame_style)
+            return image.width * image.height, _image_bytes(image)
+
+        if 'encode' in groups:
+            def encode(content=content):
+                qr = make_symbol(content, config.DEFAULT_ERROR_CORRECTION)
+                width, height = qr.symbol_size(border=0)
+                # Módulos del símbolo en lugar de píxeles
+                return width * height, width * height
+
+            cases.append(Case(f"encode/v{version}", 'encode', {'version': version}, encode))
+
+        if 'generate' in groups:
+            for pattern_style in PATTERN_STYLES:
+                for size_name, export_scale in config.EXPORT_SCALES.items():
+                    cases.append(Case(
+                        f"generate/v{version}/{pattern_style}/{size_name}",
+                        'generate',
+                        {'version': version, 'pattern_style': pattern_style, 'scale': export_scale},
+                        lambda s=export_scale, p=pattern_style, g=generate: g(s, p)
+                    ))
+
+        if 'frames' in groups:
+            for frame_style in FRAME_STYLES:
+                cases.append(Case(
+                    f"frames/v{version}/{frame_style}",
+                    'frames',
+                    {'version': version, 'frame_style': frame_style, 'scale': scale},
+                    lambda f=frame_style, g=generate: g(scale, 'squares', f)
+                ))
+
+        if 'export' in groups:
+            # Píxeles del QR a esa escala (el SVG equivale a una imagen de ese tamaño)
+            width, height = make_symbol(content, config.DEFAULT_ERROR_CORRECTION).symbol_size(scale=scale)
+
+            def export(method, path, pattern_style, content=content, pixels=width * height):
+                if not method(content, path, scale=scale, pattern_style=pattern_style):
+                    raise RuntimeError(f"Falló la exportación de {path.name}")
+                return pixels, path.stat().st_size
+
+            for pattern_style in PATTERN_STYLES:
+                for extension, method in (('png', exporter.export_png), ('svg', exporter.export_svg)):
+                    path = Path(output_dir) / f"v{version}-{pattern_style}.{extension}"
+                    cases.append(Case(
+                        f"export_{extension}/v{version}/{pattern_style}",
+                        'export',
+                        {'version': version, 'pattern_style': pattern_style, 'scale': scale, 'format': extension},
+                        lambda m=method, p=path, s=pattern_style, e=export: e(m, p, s)
+                    ))
+
+    return cases
+
+
+def percentile(values, fraction):
+    """Percentil con interpolación lineal (fraction entre 0 y 1)"""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def measure_case(case, repeat):
+    """
+    Medir un caso en frío
+
+    Las cachés se vacían antes de cada ejecución, fuera del tiempo medido.
+    El recolector de basura se desactiva durante la medida, como en timeit.
+
+    Args:
+        case: Caso a medir
+        repeat: Número de ejecuciones cronometradas
+
+    Returns:
+        dict: Resultado del caso
+    """
+    samples = []
+    # Los mensajes del exportador no deben llenar la salida de la suite
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            _reset_caches()
+            gc.collect()
+            gc.disable()
+            try:
+                start = time.perf_counter()
+                pixels, output_bytes = case.run()
+                samples.append(time.perf_counter() - start)
+            finally:
+                gc.enable()
+
+        # Memoria en una ejecución aparte: tracemalloc ralentiza las asignaciones
+        _reset_caches()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    samples_ms = [sample * 1000 for sample in samples]
+    median = percentile(samples, 0.5)
+    return {
+        'id': case.id,
+        'group': case.group,
+        'params': case.params,
+        'repeat': repeat,
+        'samples_ms': [round(sample, 3) for sample in samples_ms],
+        'min_ms': round(min(samples_ms), 3),
+        'p50_ms': round(percentile(samples_ms, 0.5), 3),
+        'p90_ms': round(percentile(samples_ms, 0.9), 3),
+        'p99_ms': round(percentile(samples_ms, 0.99), 3),
+        'max_ms': round(max(samples_ms), 3),
+        'pixels': pixels,
+        'megapixels_per_s': round(pixels / median / 1e6, 3),
+        'peak_traced_bytes': peak,
+        'output_bytes': output_bytes
+    }
+
+
+def environment():
+    """Datos del entorno para interpretar (y comparar) una ejecución"""
+    import numpy
+    import PIL
+    import segno
+
+    return {
+        'app_version': config.APP_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'pillow': PIL.__version__,
+        'segno': segno.__version__,
+        'numpy': numpy.__version__
+    }
+
+
+def run_suite(versions, groups, repeat):
+    """
+    Ejecutar la suite
+
+    Args:
+        versions: Versiones a medir
+        groups: Grupos de casos
+        repeat: Ejecuciones cronometradas por caso
+
+    Returns:
+        dict: Informe con el entorno y los resultados de cada caso
+    """
+    results = []
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        cases = build_cases(versions, groups, output_dir)
+
+        # Calentamiento (un caso por grupo): imports diferidos, plugins de Pillow y fuentes
+        warmup = {case.group: case for case in reversed(cases)}
+        with contextlib.redirect_stdout(io.StringIO()):
+            for case in warmup.values():
+                case.run()
+
+        print(f"{'caso':<36} {'p50 (ms)':>9} {'p90 (ms)':>9} {'MP/s':>8} {'pico (KiB)':>11} {'salida (KiB)':>13}")
+        print("-" * 92)
+        for case in cases:
+            result = measure_case(case, repeat)
+            results.append(result)
+            print(f"{case.id:<36} {result['p50_ms']:>9.2f} {result['p90_ms']:>9.2f} "
+                  f"{result['megapixels_per_s']:>8.1f} {result['peak_traced_bytes'] / 1024:>11.0f} "
+                  f"{result['output_bytes'] / 1024:>13.0f}")
+
+    return {
+        'suite': 'render',
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'duration_s': round(time.perf_counter() - started, 1),
+        'environment': environment(),
+        'options': {'versions': versions, 'groups': groups, 'repeat': repeat},
+        'results': results
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    Comparar dos informes caso a caso por la mediana
+
+    Args:
+        baseline: Informe de referencia
+        current: Informe nuevo
+        threshold: Empeoramiento relativo que cuenta como regresión
+
+    Returns:
+        list: Identificadores de los casos que empeoraron
+    """
+    previous = {result['id']: result for result in baseline['results']}
+    regressions = []
+    ratios = []
+
+    print(f"\n{'caso':<36} {'antes (ms)':>11} {'ahora (ms)':>11} {'cambio':>8}")
+    print("-" * 70)
+    for result in current['results']:
+        before = previous.get(result['id'])
+        if before is None:
+            continue
+        ratio = result['p50_ms'] / before['p50_ms'] if before['p50_ms'] else 1.0
+        ratios.append(ratio)
+        marker = ''
+        if ratio > 1 + threshold:
+            regressions.append(result['id'])
+            marker = ' ❌'
+        elif ratio < 1 - threshold:
+            marker = ' ✅'
+        print(f"{result['id']:<36} {before['p50_ms']:>11.2f} {result['p50_ms']:>11.2f} "
+              f"{(ratio - 1) * 100:>+7.1f}%{marker}")
+
+    if not ratios:
+        print("⚠️ No hay casos comunes entre los dos informes")
+        return regressions
+
+    # Media geométrica: un resumen que no dominan los casos más lentos
+    geometric_mean = 1.0
+    for ratio in ratios:
+        geometric_mean *= ratio ** (1 / len(ratios))
+    print(f"\nCasos comparados: {len(ratios)}, cambio medio (geométrico): {(geometric_mean - 1) * 100:+.1f}%")
+    if baseline.get('environment') != current.get('environment'):
+        print("⚠️ Los entornos de los dos informes son distintos")
+    if regressions:
+        print(f"❌ {len(regressions)} casos empeoran más de un {threshold * 100:.0f}%")
+    else:
+        print(f"✅ Ningún caso empeora más de un {threshold * 100:.0f}%")
+    return regressions
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--versions', type=parse_versions, help="Versiones a medir, p. ej. '1,5,10-20' (por defecto 1-40)")
+    parser.add_argument('--groups', default=','.join(GROUPS),
+                        help=f"Grupos de casos separados por comas ({', '.join(GROUPS)})")
+    parser.add_argument('--repeat', type=int, help=f'Ejecuciones por caso (por defecto {DEFAULT_REPEAT})')
+    parser.add_argument('--quick', action='store_true',
+                        help=f'Versiones {QUICK_VERSIONS} y {QUICK_REPEAT} ejecuciones por caso')
+    parser.add_argument('--output', type=Path, help='Archivo JSON del informe (por defecto en storage/profiles)')
+    parser.add_argument('--compare', type=Path, metavar='INFORME', help='Informe de referencia con el que comparar')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Empeoramiento que cuenta como regresión (por defecto {DEFAULT_THRESHOLD})')
+    args = parser.parse_args(argv)
+
+    groups = [group.strip() for group in args.groups.split(',') if group.strip()]
+    unknown = set(groups) - set(GROUPS)
+    if unknown:
+        parser.error(f"Grupos desconocidos: {', '.join(sorted(unknown))}")
+
+    versions = args.versions or (QUICK_VERSIONS if args.quick else VERSIONS)
+    repeat = args.repeat or (QUICK_REPEAT if args.quick else DEFAULT_REPEAT)
+
+    # Cargar la referencia antes de medir: un error aquí no debe costar una ejecución
+    baseline = json.loads(args.compare.read_text(encoding='utf-8')) if args.compare else None
+
+    report = run_suite(versions, groups, repeat)
+
+    output = args.output or config.PROFILES_DIR / f"suite-{datetime.now():%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\n📁 Informe: {output} ({len(report['results'])} casos, {report['duration_s']} s)")
+
+    if baseline is not None and compare(baseline, report, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,11 +25,15 @@ ICONS_DIR = RESOURCES_DIR / "icons"
 PRESETS_DIR = RESOURCES_DIR / "presets"
 FRAMES_DIR = RESOURCES_DIR / "frames"
 SOCIAL_ICONS_DIR = RESOURCES_DIR / "social_icons"
+FONTS_DIR = RESOURCES_DIR / "fonts"
 
 # Subdirectorios de storage
 CACHE_DIR = STORAGE_DIR / "cache"
 EXPORTS_DIR = STORAGE_DIR / "exports"
-HISTORY_FILE = STORAGE_DIR / "history.json"
+HISTORY_FILE = STORAGE_DIR / "history.json"      # Formato anterior (se migra a HISTORY_DB)
+HISTORY_DB = STORAGE_DIR / "history.db"
+SLUG_DB = STORAGE_DIR / "slugs.db"
+PROFILES_DIR = STORAGE_DIR / "profiles"   # Informes de --profile-startup y benchmarks.suite
 
 # ============================================================================
 # CONFIGURACIÓN DE LA APLICACIÓN
@@ -46,6 +50,12 @@ WINDOW_HEIGHT = 900
 WINDOW_MIN_WIDTH = 1200
 WINDOW_MIN_HEIGHT = 700
 
+# Tiempo sin actividad antes de pre-renderizar las opciones vecinas del preview (ms)
+PREVIEW_PREFETCH_DELAY_MS = 400
+
+# Memoria máxima de los previews ya renderizados (el actual y sus vecinos)
+PREVIEW_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 # ============================================================================
 # CONFIGURACIÓN DE QR
 # ============================================================================
@@ -73,6 +83,44 @@ DEFAULT_EXPORT_SCALE = 10
 # DPI para exportación PNG
 EXPORT_DPI = 300
 
+# Tamaño máximo de la caché en disco de exportaciones (CACHE_DIR)
+DISK_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
+# Hojas de etiquetas para exportación PDF (márgenes y separación en mm)
+# margins_mm: (superior, derecho, inferior, izquierdo), gutter_mm: (horizontal, vertical)
+PDF_LABEL_SHEETS = {
+    "A4": {
+        "page_size": "A4",
+        "columns": 3,
+        "rows": 8,
+        "margins_mm": (10, 10, 10, 10),
+        "gutter_mm": (5, 5)
+    },
+    "Letter": {
+        "page_size": "Letter",
+        "columns": 3,
+        "rows": 8,
+        "margins_mm": (10, 10, 10, 10),
+        "gutter_mm": (5, 5)
+    },
+    "avery_l7160": {           # A4, 21 etiquetas de 63,5 x 38,1 mm
+        "page_size": "A4",
+        "columns": 3,
+        "rows": 7,
+        "margins_mm": (15.15, 7.25, 15.15, 7.25),
+        "gutter_mm": (2.5, 0)
+    },
+    "avery_5160": {            # Letter, 30 etiquetas de 2,625 x 1 pulgadas
+        "page_size": "Letter",
+        "columns": 3,
+        "rows": 10,
+        "margins_mm": (12.7, 4.7625, 12.7, 4.7625),
+        "gutter_mm": (3.175, 0)
+    }
+}
+
+DEFAULT_PDF_LABEL_SHEET = "A4"
+
 # ============================================================================
 # TIPOS DE QR SOPORTADOS
 # ============================================================================
@@ -207,6 +255,9 @@ CORNER_DOT_STYLES = [
     "dot_large"       # Punto grande
 ]
 
+# Texto por defecto de los marcos con leyenda
+DEFAULT_FRAME_CAPTION = "SCAN ME"
+
 # Colores predefinidos
 DEFAULT_QR_COLOR = "#000000"  # Negro
 DEFAULT_BG_COLOR = "#FFFFFF"  # Blanco
@@ -277,9 +328,13 @@ API_ENDPOINTS = {
     "get_qr": "/api/qr/{slug}",
     "update_qr": "/api/qr/{slug}",
     "delete_qr": "/api/qr/{slug}",
-    "list_qr": "/api/qr/list"
+    "list_qr": "/api/qr/list",
+    "redirect_qr": "/r/{slug}"
 }
 
+# URL pública de las redirecciones de QR dinámicos (lo que se imprime en el código)
+REDIRECT_BASE_URL = API_BASE_URL
+
 # Timeout para peticiones HTTP (segundos)
 API_TIMEOUT = 30
 
@@ -387,10 +442,15 @@ def is_file_allowed(filename, file_type):
 
 
 def ensure_directories():
-    """Crea todos los directorios necesarios si no existen"""
+    """
+    Crea todos los directorios necesarios si no existen
+    
+    No se llama al importar: cada módulo crea el directorio que usa justo
+    antes de escribir en él (exportaciones, caché, bases de datos).
+    """
     directories = [
         UI_DIR, CORE_DIR, API_DIR, UTILS_DIR, RESOURCES_DIR, STORAGE_DIR,
-        ICONS_DIR, PRESETS_DIR, FRAMES_DIR, SOCIAL_ICONS_DIR,
+        ICONS_DIR, PRESETS_DIR, FRAMES_DIR, SOCIAL_ICONS_DIR, FONTS_DIR,
         CACHE_DIR, EXPORTS_DIR
     ]
     
@@ -398,9 +458,6 @@ def ensure_directories():
         directory.mkdir(parents=True, exist_ok=True)
 
 
-# Crear directorios al importar el módulo
-ensure_directories()
-
 
 if __name__ == "__main__":
     # Test de configuración
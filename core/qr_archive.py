@@ -0,0 +1,205 @@
+"""
+Archivos ZIP/TAR para exportaciones masivas
+Escribe los códigos generados directamente dentro de un único archivo, sin
+un archivo suelto por código, junto con un índice para leer entradas sueltas
+"""
+
+import json
+import tarfile
+import time
+import zipfile
+import zlib
+from io import BytesIO
+from pathlib import Path, PurePosixPath
+
+
+# Formatos ya comprimidos: se guardan tal cual (sin recomprimir)
+STORED_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.gif', '.pdf')
+
+# Índices ya leídos por read_entry, por ruta del archivo
+_index_cache = {}
+
+
+def index_path(archive_path):
+    """Ruta del índice asociado a un archivo ('salida.zip' -> 'salida.zip.index.json')"""
+    archive_path = Path(archive_path)
+    return archive_path.with_name(archive_path.name + '.index.json')
+
+
+class QRArchiveWriter:
+    """
+    Escritor de archivos ZIP o TAR en streaming
+
+    Cada entrada se escribe en cuanto se recibe. Al cerrar se guarda un índice
+    JSON (nombre -> posición de los datos, tamaño y compresión) que permite
+    leer una entrada con un solo seek, sin descomprimir el archivo.
+    """
+
+    def __init__(self, filepath, archive_format=None, compress_text=True):
+        """
+        Abrir el archivo de salida
+
+        Args:
+            filepath: Ruta del archivo (.zip, .tar)
+            archive_format: 'zip' o 'tar' (None = según la extensión)
+            compress_text: Comprimir entradas de texto (SVG) en ZIP
+        """
+        self.filepath = Path(filepath)
+        if archive_format is None:
+            archive_format = 'tar' if self.filepath.suffix.lower() == '.tar' else 'zip'
+        if archive_format not in ('zip', 'tar'):
+            raise ValueError(f"Formato de archivo no soportado: {archive_format}")
+
+        self.archive_format = archive_format
+        self.compress_text = compress_text
+        self.entries = {}
+
+        self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        if archive_format == 'zip':
+            self._archive = zipfile.ZipFile(self.filepath, 'w', allowZip64=True)
+        else:
+            # TAR sin comprimir: los datos de cada entrada quedan contiguos
+            self._archive = tarfile.open(self.filepath, 'w', format=tarfile.PAX_FORMAT)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _entry_name(self, name):
+        """
+        Nombre relativo y seguro de una entrada
+
+        Conserva los subdirectorios pedidos ('a/x.png'), pero sin partes
+        absolutas, '.' ni '..' que pudieran escribir fuera al extraer.
+        """
+        parts = [
+            part for part in PurePosixPath(str(name).replace('\\', '/')).parts
+            if part not in ('/', '.', '..')
+        ]
+        if not parts:
+            raise ValueError(f"Nombre de entrada inválido: {name!r}")
+        return '/'.join(parts)
+
+    def _unique_name(self, name):
+        """Evita nombres repetidos en el mismo directorio (el índice debe ser inequívoco)"""
+        if name not in self.entries:
+            return name
+        path = PurePosixPath(name)
+        counter = 2
+        while str(path.with_name(f"{path.stem}_{counter}{path.suffix}")) in self.entries:
+            counter += 1
+        return str(path.with_name(f"{path.stem}_{counter}{path.suffix}"))
+
+    def add(self, name, data):
+        """
+        Agregar una entrada al archivo
+
+        Args:
+            name: Nombre de la entrada, con subdirectorios opcionales
+                  (ej: 'cliente_001.png', 'tienda/cliente_001.png')
+            data: Contenido (bytes)
+
+        Returns:
+            str: Nombre final de la entrada (con sufijo si ya existía)
+
+        Raises:
+            ValueError: Si el nombre no tiene ninguna parte válida
+        """
+        name = self._unique_name(self._entry_name(name))
+
+        if self.archive_format == 'zip':
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            stored = name.lower().endswith(STORED_EXTENSIONS) or not self.compress_text
+            info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+            self._archive.writestr(info, data)
+
+            # Tras escribir, el puntero queda justo al final de los datos
+            offset = self._archive.fp.tell() - info.compress_size
+            entry = {
+                'offset': offset,
+                'size': info.file_size,
+                'compressed_size': info.compress_size,
+                'compression': 'stored' if stored else 'deflated'
+            }
+        else:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = int(time.time())
+            self._archive.addfile(info, BytesIO(data))
+
+            # Los datos terminan en el último bloque escrito (rellenado a 512 bytes)
+            blocks, remainder = divmod(info.size, tarfile.BLOCKSIZE)
+            padded_size = (blocks + (1 if remainder else 0)) * tarfile.BLOCKSIZE
+            entry = {
+                'offset': self._archive.offset - padded_size,
+                'size': info.size,
+                'compressed_size': info.size,
+                'compression': 'stored'
+            }
+
+        self.entries[name] = entry
+        return name
+
+    def close(self):
+        """Cerrar el archivo y escribir el índice"""
+        if self._archive is None:
+            return
+        self._archive.close()
+        self._archive = None
+
+        index = {
+            'archive': self.filepath.name,
+            'format': self.archive_format,
+            'entries': self.entries
+        }
+        with open(index_path(self.filepath), 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+        _index_cache.pop(str(self.filepath), None)
+
+
+def load_index(archive_path):
+    """
+    Leer el índice de un archivo (se guarda en memoria tras la primera lectura)
+
+    Args:
+        archive_path: Ruta del archivo ZIP/TAR
+
+    Returns:
+        dict: Índice con 'format' y 'entries'
+    """
+    key = str(archive_path)
+    index = _index_cache.get(key)
+    if index is None:
+        with open(index_path(archive_path), encoding='utf-8') as f:
+            index = json.load(f)
+        _index_cache[key] = index
+    return index
+
+
+def read_entry(archive_path, name):
+    """
+    Leer una sola entrada sin desempaquetar el archivo
+
+    Args:
+        archive_path: Ruta del archivo ZIP/TAR
+        name: Nombre de la entrada
+
+    Returns:
+        bytes: Contenido de la entrada
+
+    Raises:
+        KeyError: Si la entrada no existe en el índice
+    """
+    entry = load_index(archive_path)['entries'][name]
+
+    with open(archive_path, 'rb') as f:
+        f.seek(entry['offset'])
+        data = f.read(entry['compressed_size'])
+
+    if entry['compression'] == 'deflated':
+        # ZIP guarda deflate sin cabecera zlib
+        data = zlib.decompress(data, -15)
+    return data
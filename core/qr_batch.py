@@ -0,0 +1,290 @@
+"""
+Generación de códigos QR por lotes
+Reparte el trabajo entre procesos para aprovechar todos los núcleos
+"""
+
+import os
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+
+# Resultado de un elemento del lote
+# image: PIL.Image (o bytes si se pidió codificar), error: None si salió bien
+BatchResult = namedtuple('BatchResult', ['index', 'item', 'image', 'error'])
+
+# Parámetros de QRGenerator.generate que se pueden fijar por estilo o por elemento
+GENERATE_OPTIONS = (
+    'scale', 'dark_color', 'light_color', 'pattern_style',
+    'frame_style', 'antialias', 'caption_text'
+)
+
+# Formatos vectoriales y parámetros de generate() que admite cada uno
+VECTOR_OPTIONS = {
+    'SVG': ('scale', 'dark_color', 'light_color', 'pattern_style', 'frame_style', 'caption_text'),
+    'PDF': ('scale', 'dark_color', 'light_color', 'pattern_style', 'frame_style', 'caption_text')
+}
+
+# Generadores del proceso actual, uno por nivel de corrección
+_generators = {}
+
+# Exportador del proceso actual (salidas vectoriales)
+_exporter = None
+
+
+def init_worker():
+    """
+    Inicializador de los procesos del pool
+
+    Importa segno, Pillow y el generador antes de recibir trabajo, para que
+    el primer elemento de cada proceso no pague el coste de importación.
+    """
+    import segno  # noqa: F401
+    import numpy  # noqa: F401
+    from PIL import Image, ImageDraw, ImageFont  # noqa: F401
+
+    import core.qr_generator  # noqa: F401
+    import core.qr_pattern_renderer  # noqa: F401
+    import core.qr_frame_generator  # noqa: F401
+
+
+def _get_generator(error_correction):
+    """Generador reutilizado para un nivel de corrección"""
+    generator = _generators.get(error_correction)
+    if generator is None:
+        from core.qr_generator import QRGenerator
+        generator = QRGenerator(error_correction)
+        _generators[error_correction] = generator
+    return generator
+
+
+def parse_item(item, style=None):
+    """
+    Combina un elemento del lote con el estilo común
+
+    Args:
+        item: Contenido (str) o dict con 'content' (o 'type' y sus campos,
+              ver core.qr_content) y parámetros a sobrescribir; la clave 'id'
+              se conserva en el resultado y no afecta a la generación
+        style: Parámetros comunes de generate() (dict)
+
+    Returns:
+        tuple: (contenido, nivel de corrección, opciones de generate)
+
+    Raises:
+        ValueError: Si el elemento no tiene contenido o trae parámetros desconocidos
+    """
+    options = dict(style or {})
+    error_correction = options.pop('error_correction', 'Q')
+
+    if isinstance(item, str):
+        content = item
+    elif isinstance(item, dict):
+        overrides = dict(item)
+        overrides.pop('id', None)
+        content = overrides.pop('content', None)
+        qr_type = overrides.pop('type', None)
+
+        # Contenido descrito por tipo y campos (url, wifi, whatsapp)
+        if content is None and qr_type is not None:
+            from core.qr_content import CONTENT_FIELDS, build_content
+            fields = {
+                name: overrides.pop(name)
+                for name in CONTENT_FIELDS.get(qr_type, ())
+                if name in overrides
+            }
+            content = build_content(qr_type, fields)
+
+        error_correction = overrides.pop('error_correction', error_correction)
+        options.update(overrides)
+    else:
+        raise ValueError(f"Elemento no soportado: {type(item).__name__}")
+
+    if not content:
+        raise ValueError("El elemento no tiene contenido")
+
+    unknown = set(options) - set(GENERATE_OPTIONS)
+    if unknown:
+        raise ValueError(f"Parámetros desconocidos: {', '.join(sorted(unknown))}")
+
+    if 'antialias' in options:
+        # Mismo criterio en todas las entradas: "false" en JSON no es verdadero
+        from core.qr_content import parse_bool
+        options['antialias'] = parse_bool(options['antialias'])
+
+    return content, error_correction, options
+
+
+def render_item(item, style=None, encode=None):
+    """
+    Genera la imagen de un elemento del lote
+
+    Args:
+        item: Contenido (str) o dict (ver parse_item)
+        style: Parámetros comunes de generate()
+        encode: Formato de Pillow ('PNG', 'JPEG', ...) o 'SVG' / 'PDF' para
+                devolver bytes, o None para devolver la imagen
+
+    Returns:
+        PIL.Image o bytes
+    """
+    content, error_correction, options = parse_item(item, style)
+
+    if encode is not None and encode.upper() in VECTOR_OPTIONS:
+        return _render_vector(content, error_correction, options, encode.upper())
+
+    image = _get_generator(error_correction).generate(content, **options)
+
+    if encode is None:
+        return image
+
+    from io import BytesIO
+    if encode.upper() in ('JPEG', 'JPG'):
+        image = image.convert('RGB')
+    buffer = BytesIO()
+    image.save(buffer, format=encode)
+    return buffer.getvalue()
+
+
+def _render_vector(content, error_correction, options, vector_format):
+    """Escribe un SVG o PDF en memoria con el exportador (ignora opciones solo raster)"""
+    global _exporter
+    from io import BytesIO
+    if _exporter is None:
+        from core.qr_exporter import QRExporter
+        _exporter = QRExporter()
+
+    writer = _exporter.write_svg if vector_format == 'SVG' else _exporter.write_pdf
+    options = {name: value for name, value in options.items() if name in VECTOR_OPTIONS[vector_format]}
+
+    buffer = BytesIO()
+    writer(content, buffer, error_correction=error_correction, **options)
+    return buffer.getvalue()
+
+
+def render_chunk(chunk, style=None, encode=None):
+    """
+    Genera un grupo de elementos (unidad de trabajo enviada a cada proceso)
+
+    Los errores se capturan por elemento: un contenido inválido no
+    interrumpe el resto del grupo.
+
+    Args:
+        chunk: Lista de tuplas (índice, elemento)
+        style: Parámetros comunes de generate()
+        encode: Formato de salida opcional (ver render_item)
+
+    Returns:
+        list: BatchResult por elemento
+    """
+    results = []
+    for index, item in chunk:
+        try:
+            image = render_item(item, style, encode)
+            results.append(BatchResult(index, item, image, None))
+        except Exception as e:
+            results.append(BatchResult(index, item, None, f"{type(e).__name__}: {e}"))
+    return results
+
+
+def _chunks(items, chunk_size):
+    """Agrupa los elementos en listas de (índice, elemento) sin materializar la entrada"""
+    chunk = []
+    for index, item in enumerate(items):
+        chunk.append((index, item))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _failed_chunk(chunk, error):
+    """Resultados de error para un grupo cuyo proceso falló por completo"""
+    message = f"{type(error).__name__}: {error}"
+    return [BatchResult(index, item, None, message) for index, item in chunk]
+
+
+def generate_many(items, style=None, workers=None, ordered=True, encode=None, chunk_size=8):
+    """
+    Genera muchos códigos QR repartiendo el trabajo entre procesos
+
+    La entrada se consume de forma perezosa y solo hay un número acotado de
+    grupos en vuelo, así que la memoria no crece con la longitud del lote.
+    Si un proceso muere, los grupos que estaban en vuelo se reportan como
+    fallidos y el resto del lote continúa en un pool nuevo.
+
+    Args:
+        items: Iterable de contenidos (str) o dicts (ver parse_item)
+        style: Parámetros comunes de generate() (más 'error_correction')
+        workers: Número de procesos (None = todos los núcleos, 1 = sin pool)
+        ordered: True para obtener los resultados en orden de entrada,
+                 False para obtenerlos a medida que terminan
+        encode: Formato de Pillow, 'SVG' o 'PDF' para devolver bytes en lugar de imágenes
+        chunk_size: Elementos enviados juntos a cada proceso
+
+    Yields:
+        BatchResult: (índice, elemento, imagen o bytes, error)
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(items, chunk_size)
+
+    # Un solo proceso: generar en línea, sin coste de comunicación
+    if workers <= 1:
+        for chunk in chunks:
+            yield from render_chunk(chunk, style, encode)
+        return
+
+    max_in_flight = workers * 2
+    executor = None
+    pending = deque()
+
+    def restart_pool():
+        """Crear el pool (o reemplazarlo si se rompió porque murió un proceso)"""
+        nonlocal executor
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker)
+
+    def submit_next():
+        chunk = next(chunks, None)
+        if chunk is None:
+            return False
+        try:
+            future = executor.submit(render_chunk, chunk, style, encode)
+        except BrokenProcessPool:
+            # Un proceso murió desde el último resultado: el resto va a un pool nuevo
+            restart_pool()
+            future = executor.submit(render_chunk, chunk, style, encode)
+        pending.append((future, chunk, executor))
+        return True
+
+    restart_pool()
+    try:
+        while len(pending) < max_in_flight and submit_next():
+            pass
+
+        while pending:
+            if ordered:
+                # Esperar siempre al grupo más antiguo
+                done = [pending.popleft()]
+            else:
+                finished, _ = wait([future for future, _, _ in pending], return_when=FIRST_COMPLETED)
+                done = [entry for entry in pending if entry[0] in finished]
+                for entry in done:
+                    pending.remove(entry)
+
+            for future, chunk, owner in done:
+                try:
+                    results = future.result()
+                except BrokenProcessPool as e:
+                    # Fallan los grupos que estaban en el pool roto; el lote sigue en uno nuevo
+                    results = _failed_chunk(chunk, e)
+                    if owner is executor:
+                        restart_pool()
+                except Exception as e:
+                    results = _failed_chunk(chunk, e)
+                submit_next()
+                yield from results
+    finally:
+        executor.shutdown(cancel_futures=True)
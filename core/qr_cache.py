@@ -0,0 +1,230 @@
+"""
+Cachés en memoria para el generador de QR
+Caché LRU acotada y segura entre hilos, compartida por todo el proceso
+"""
+
+import threading
+from collections import OrderedDict
+
+import segno
+
+
+class LRUCache:
+    """
+    Caché con política LRU (se descarta el elemento usado hace más tiempo)
+    """
+
+    def __init__(self, max_entries=128, name='cache', max_bytes=None, sizeof=None):
+        """
+        Inicializar la caché
+
+        Args:
+            max_entries: Número máximo de elementos almacenados
+            name: Nombre descriptivo (para estadísticas)
+            max_bytes: Memoria máxima estimada en bytes (None = sin límite)
+            sizeof: Función que estima el tamaño en bytes de un valor
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self._sizeof = sizeof or (lambda value: 0)
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Obtener un elemento y marcarlo como usado recientemente
+
+        Args:
+            key: Clave del elemento
+            default: Valor a retornar si no existe
+
+        Returns:
+            El valor almacenado o default
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Guardar un elemento, descartando los más antiguos si se supera el límite
+
+        Args:
+            key: Clave del elemento
+            value: Valor a guardar
+        """
+        size = self._sizeof(value)
+
+        with self._lock:
+            if key in self._data:
+                self.current_bytes -= self._sizes[key]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = size
+            self.current_bytes += size
+
+            # Descartar los menos usados hasta respetar ambos límites
+            while len(self._data) > 1 and (
+                len(self._data) > self.max_entries
+                or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+            ):
+                old_key, _ = self._data.popitem(last=False)
+                self.current_bytes -= self._sizes.pop(old_key)
+                self.evictions += 1
+
+    def get_or_create(self, key, factory):
+        """
+        Obtener un elemento o crearlo con factory() si no existe
+
+        Args:
+            key: Clave del elemento
+            factory: Función sin argumentos que construye el valor
+
+        Returns:
+            El valor almacenado o recién creado
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = factory()
+            self.put(key, value)
+        return value
+
+    def discard(self, key):
+        """
+        Quitar un elemento si existe (invalidación)
+
+        Args:
+            key: Clave del elemento
+        """
+        with self._lock:
+            if key in self._data:
+                del self._data[key]
+                self.current_bytes -= self._sizes.pop(key)
+
+    def clear(self):
+        """Vaciar la caché y reiniciar estadísticas"""
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Obtener estadísticas de uso
+
+        Returns:
+            dict: Nombre, elementos, memoria, aciertos, fallos y descartes
+        """
+        with self._lock:
+            return {
+                'name': self.name,
+                'entries': len(self._data),
+                'bytes': self.current_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+
+def _symbol_size(qr):
+    """Estima la memoria de un símbolo de segno (matriz + objeto)"""
+    width, height = qr.symbol_size(border=0)
+    return width * height + 512
+
+
+# Símbolos ya codificados, compartidos por preview, información y exportación
+# Clave: (contenido, nivel de corrección, boost_error, micro)
+symbol_cache = LRUCache(
+    max_entries=1024,
+    name='symbols',
+    max_bytes=32 * 1024 * 1024,
+    sizeof=_symbol_size
+)
+
+
+def make_symbol(content, error='Q', boost_error=False, micro=None):
+    """
+    Codifica un contenido con segno, reutilizando el símbolo si ya existe
+
+    La codificación (y en especial la selección de máscara) se ejecuta una
+    sola vez por combinación distinta de contenido y opciones.
+
+    Args:
+        content: Contenido del QR
+        error: Nivel de corrección de errores (L, M, Q, H)
+        boost_error: Permitir que segno aumente el nivel de corrección
+        micro: Permitir Micro QR (None = automático, como segno)
+
+    Returns:
+        segno.QRCode: Símbolo codificado (no debe modificarse)
+    """
+    key = (content, error, boost_error, micro)
+    return symbol_cache.get_or_create(
+        key,
+        lambda: segno.make(content, error=error, boost_error=boost_error, micro=micro)
+    )
+
+
+def _image_size(image):
+    """Estima la memoria de una imagen de Pillow (1 byte/píxel en paleta, 4 en RGB)"""
+    bytes_per_pixel = 1 if image.mode in ('1', 'L', 'P') else 4
+    return image.width * image.height * bytes_per_pixel
+
+
+# Etapa "cuerpo": módulos renderizados (imagen de paleta, sin colores propios)
+# Clave: (clave del símbolo, escala, patrón, antialias)
+body_cache = LRUCache(
+    max_entries=64,
+    name='body',
+    max_bytes=128 * 1024 * 1024,
+    sizeof=_image_size
+)
+
+# Etapa "marco": imagen final con marco decorativo
+# Clave: (clave del cuerpo, color oscuro, color claro, estilo de marco, leyenda)
+frame_cache = LRUCache(
+    max_entries=64,
+    name='frame',
+    max_bytes=128 * 1024 * 1024,
+    sizeof=_image_size
+)
+
+
+def render_cache_stats():
+    """
+    Estadísticas de cada etapa del pipeline de render
+
+    Returns:
+        dict: {'encode': ..., 'body': ..., 'frame': ...}
+    """
+    return {
+        'encode': symbol_cache.stats(),
+        'body': body_cache.stats(),
+        'frame': frame_cache.stats()
+    }
+
+
+def clear_render_caches():
+    """Vaciar todas las etapas del pipeline de render"""
+    for cache in (symbol_cache, body_cache, frame_cache):
+        cache.clear()
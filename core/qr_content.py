@@ -0,0 +1,133 @@
+"""
+Constructores del contenido de los códigos QR
+Formatos de texto de cada tipo de QR, compartidos por la interfaz, el
+generador y la generación por lotes
+"""
+
+import urllib.parse
+
+
+# Campos que acepta cada tipo de contenido
+CONTENT_FIELDS = {
+    'url': ('url',),
+    'wifi': ('ssid', 'password', 'encryption', 'hidden'),
+    'whatsapp': ('phone', 'message')
+}
+
+# Textos que se interpretan como verdadero (CSV, JSON, parámetros HTTP)
+TRUE_VALUES = ('1', 'true', 'yes', 'si', 'sí', 'y')
+
+
+def parse_bool(value):
+    """
+    Interpreta un valor booleano que puede venir escrito como texto
+
+    Args:
+        value: bool, número o texto ('true', 'false', 'sí', '0'...)
+
+    Returns:
+        bool: True solo para True o los textos de TRUE_VALUES
+    """
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def build_url(url):
+    """
+    Contenido de un QR de URL
+
+    Args:
+        url: URL destino
+
+    Returns:
+        str: URL sin espacios alrededor
+
+    Raises:
+        ValueError: Si la URL está vacía
+    """
+    url = (url or '').strip()
+    if not url:
+        raise ValueError("La URL está vacía")
+    return url
+
+
+def build_wifi(ssid, password='', encryption='WPA', hidden=False):
+    """
+    Contenido de un QR de conexión WiFi
+
+    Args:
+        ssid: Nombre de la red
+        password: Contraseña (se ignora si encryption es 'nopass')
+        encryption: Tipo de cifrado (WPA, WEP, nopass)
+        hidden: Si la red está oculta
+
+    Returns:
+        str: Cadena en formato WIFI:T:...;S:...;P:...;H:...;;
+
+    Raises:
+        ValueError: Si falta el SSID
+    """
+    if not ssid:
+        raise ValueError("El SSID está vacío")
+
+    # Red sin contraseña: campo P vacío
+    if encryption == 'nopass':
+        password = ''
+
+    hidden_str = "true" if hidden else "false"
+    return f"WIFI:T:{encryption};S:{ssid};P:{password or ''};H:{hidden_str};;"
+
+
+def build_whatsapp(phone, message=''):
+    """
+    Contenido de un QR de WhatsApp
+
+    Args:
+        phone: Número de teléfono (con código de país, sin +)
+        message: Mensaje precargado (opcional)
+
+    Returns:
+        str: URL de wa.me
+
+    Raises:
+        ValueError: Si el teléfono no es numérico
+    """
+    phone = str(phone or '').strip().lstrip('+')
+    if not phone.isdigit():
+        raise ValueError(f"Teléfono inválido: {phone!r}")
+
+    if message:
+        # URL encode del mensaje
+        message_encoded = urllib.parse.quote(message)
+        return f"https://wa.me/{phone}?text={message_encoded}"
+    return f"https://wa.me/{phone}"
+
+
+def build_content(qr_type, fields):
+    """
+    Construye el contenido de un QR a partir de su tipo y sus campos
+
+    Args:
+        qr_type: Tipo de QR ('url', 'wifi', 'whatsapp')
+        fields: dict con los campos del tipo (ver CONTENT_FIELDS)
+
+    Returns:
+        str: Contenido listo para codificar
+
+    Raises:
+        ValueError: Si el tipo no está soportado o faltan campos
+    """
+    if qr_type == 'url':
+        return build_url(fields.get('url'))
+    elif qr_type == 'wifi':
+        return build_wifi(
+            fields.get('ssid'),
+            fields.get('password', ''),
+            fields.get('encryption') or 'WPA',
+            parse_bool(fields.get('hidden', False))
+        )
+    elif qr_type == 'whatsapp':
+        return build_whatsapp(fields.get('phone'), fields.get('message', ''))
+    else:
+        raise ValueError(f"Tipo de QR no soportado: {qr_type}")
@@ -0,0 +1,372 @@
+"""
+Caché en disco de salidas renderizadas (PNG, SVG, PDF...)
+Cada salida se guarda bajo el hash de todos los parámetros que la definen,
+de modo que una petición repetida se sirve sin volver a renderizar.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import config
+
+
+# Cambiar al modificar el renderizado: invalida todas las entradas anteriores
+CACHE_VERSION = 1
+
+# Valores por defecto de los parámetros que forman la clave
+KEY_DEFAULTS = {
+    'scale': 10,
+    'dark_color': '#000000',
+    'light_color': '#FFFFFF',
+    'pattern_style': 'squares',
+    'frame_style': 'none',
+    'antialias': False,
+    'caption_text': None
+}
+
+# Bibliotecas cuya versión puede cambiar los bytes de las salidas
+RENDER_LIBRARIES = ('segno', 'Pillow', 'numpy', 'reportlab')
+
+# Nombre del registro de accesos dentro del directorio de la caché
+ACCESS_LOG = 'access.log'
+
+# Caché compartida por el proceso (ver get_disk_cache)
+_shared_cache = None
+
+# Versiones de RENDER_LIBRARIES (se leen una vez por proceso)
+_library_versions = None
+
+
+def render_settings():
+    """
+    Ajustes que cambian las salidas sin ser parámetros de la petición
+
+    Forman parte de la clave: al cambiar la resolución de los PDF, el texto
+    por defecto de los marcos, su fuente o las bibliotecas de render, las
+    entradas anteriores dejan de coincidir en lugar de servirse obsoletas.
+
+    Returns:
+        dict: Ajustes de config, fuente de los marcos y versiones
+    """
+    global _library_versions
+    if _library_versions is None:
+        from importlib.metadata import PackageNotFoundError, version
+        _library_versions = {}
+        for name in RENDER_LIBRARIES:
+            try:
+                _library_versions[name] = version(name)
+            except PackageNotFoundError:
+                _library_versions[name] = None
+
+    from core.qr_frame_generator import font_registry
+    return {
+        'export_dpi': config.EXPORT_DPI,
+        'default_caption': config.DEFAULT_FRAME_CAPTION,
+        'frame_font': font_registry.source(),
+        'libraries': _library_versions
+    }
+
+
+def make_key(output_format, content, error_correction='Q', **options):
+    """
+    Clave de una salida: SHA-256 de todos los parámetros normalizados
+    y de los ajustes globales que afectan al render (ver render_settings)
+
+    Args:
+        output_format: Formato de la salida ('PNG', 'SVG', 'PDF', ...)
+        content: Contenido del QR
+        error_correction: Nivel de corrección
+        **options: Parámetros de generate() (scale, colores, patrón, marco...)
+
+    Returns:
+        str: Hash hexadecimal de 64 caracteres
+    """
+    params = dict(KEY_DEFAULTS)
+    params.update(options)
+    for name in ('dark_color', 'light_color'):
+        params[name] = '#' + str(params[name]).lstrip('#').upper()
+
+    payload = json.dumps(
+        [CACHE_VERSION, render_settings(), output_format.upper(), content, error_correction, params],
+        sort_keys=True,
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_disk_cache():
+    """Caché en disco compartida por el proceso (se abre con el primer uso)"""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = QRDiskCache()
+    return _shared_cache
+
+
+class QRDiskCache:
+    """
+    Caché en disco direccionada por contenido, con tamaño máximo y LRU
+
+    Los archivos se reparten en subdirectorios por prefijo del hash
+    ('ab/cd/abcd....png') y se escriben de forma atómica (archivo temporal y
+    os.replace), así que un lector nunca ve un archivo a medio escribir.
+
+    El orden LRU se guarda en un registro de accesos (una clave por línea)
+    que se reproduce al abrir la caché y se compacta cuando crece demasiado.
+    """
+
+    def __init__(self, root=None, max_bytes=None):
+        """
+        Abrir la caché
+
+        Args:
+            root: Directorio de la caché (None = config.CACHE_DIR)
+            max_bytes: Tamaño máximo en bytes (None = config.DISK_CACHE_MAX_BYTES)
+        """
+        self.root = Path(root or config.CACHE_DIR)
+        self.max_bytes = config.DISK_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # Clave -> (ruta, tamaño), de la menos a la más usada recientemente
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._log_path = self.root / ACCESS_LOG
+        self._log_lines = 0
+        self._load()
+        self._log = open(self._log_path, 'a', encoding='ascii')
+
+    def _path(self, key, extension):
+        """Ruta de una entrada: dos niveles de subdirectorios por prefijo"""
+        return self.root / key[:2] / key[2:4] / f"{key}{extension}"
+
+    def _load(self):
+        """Reconstruye el índice: archivos por fecha y luego el registro de accesos"""
+        files = []
+        for path in self.root.glob('??/??/*'):
+            if path.suffix == '.tmp':
+                # Escritura interrumpida: nunca llegó a publicarse
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime, path.stem, path, stat.st_size))
+
+        for _, key, path, size in sorted(files):
+            self._entries[key] = (path, size)
+            self.current_bytes += size
+
+        if self._log_path.exists():
+            with open(self._log_path, encoding='ascii', errors='ignore') as log:
+                for line in log:
+                    key = line.strip()
+                    if key in self._entries:
+                        self._entries.move_to_end(key)
+
+        self._compact_log()
+        self._evict()
+
+    def _compact_log(self):
+        """Reescribe el registro con una línea por entrada, en orden LRU"""
+        tmp_path = self._log_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='ascii') as log:
+            log.writelines(f"{key}\n" for key in self._entries)
+        os.replace(tmp_path, self._log_path)
+        self._log_lines = len(self._entries)
+
+    def _touch(self, key):
+        """Marca una entrada como usada (memoria y registro de accesos)"""
+        self._entries.move_to_end(key)
+        self._log.write(f"{key}\n")
+        self._log.flush()
+        self._log_lines += 1
+
+        if self._log_lines > 4 * len(self._entries) + 1024:
+            self._log.close()
+            self._compact_log()
+            self._log = open(self._log_path, 'a', encoding='ascii')
+
+    def _evict(self):
+        """Descarta las entradas menos usadas hasta respetar el tamaño máximo"""
+        while self._entries and self.current_bytes > self.max_bytes:
+            _, (path, size) = self._entries.popitem(last=False)
+            path.unlink(missing_ok=True)
+            self.current_bytes -= size
+            self.evictions += 1
+
+    def get(self, key, extension):
+        """
+        Leer una entrada
+
+        Args:
+            key: Clave (ver make_key)
+            extension: Extensión del archivo ('.png', '.svg', ...)
+
+        Returns:
+            bytes: Contenido, o None si no está en la caché
+        """
+        path = self._path(key, extension)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            self._miss(key)
+            return None
+
+        self._hit(key, path, len(data))
+        return data
+
+    def copy_to(self, key, extension, destination):
+        """
+        Copiar una entrada a un archivo sin cargarla entera en memoria
+
+        Args:
+            key: Clave (ver make_key)
+            extension: Extensión del archivo ('.png', '.svg', ...)
+            destination: Ruta del archivo de destino
+
+        Returns:
+            bool: True si la entrada estaba en la caché y se copió
+        """
+        path = self._path(key, extension)
+        try:
+            source = open(path, 'rb')
+        except FileNotFoundError:
+            self._miss(key)
+            return False
+
+        with source, open(destination, 'wb') as target:
+            shutil.copyfileobj(source, target)
+            size = target.tell()
+        self._hit(key, path, size)
+        return True
+
+    def _miss(self, key):
+        """Anota un fallo de lectura"""
+        with self._lock:
+            self.misses += 1
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                # Borrada por otro proceso que comparte el directorio
+                self.current_bytes -= entry[1]
+
+    def _hit(self, key, path, size):
+        """Anota un acierto de lectura"""
+        with self._lock:
+            self.hits += 1
+            if key not in self._entries:
+                # Escrita por otro proceso que comparte el directorio
+                self._entries[key] = (path, size)
+                self.current_bytes += size
+            self._touch(key)
+
+    def put(self, key, extension, data):
+        """
+        Guardar una entrada de forma atómica
+
+        Args:
+            key: Clave (ver make_key)
+            extension: Extensión del archivo ('.png', '.svg', ...)
+            data: Contenido (bytes)
+        """
+        self._store(key, extension, len(data), lambda f: f.write(data))
+
+    def put_file(self, key, extension, source):
+        """
+        Guardar una copia de un archivo ya escrito, de forma atómica
+
+        Args:
+            key: Clave (ver make_key)
+            extension: Extensión del archivo ('.png', '.svg', ...)
+            source: Ruta del archivo a copiar
+        """
+        def copy(f):
+            with open(source, 'rb') as data:
+                shutil.copyfileobj(data, f)
+
+        self._store(key, extension, os.path.getsize(source), copy)
+
+    def _store(self, key, extension, size, write):
+        """Escribe una entrada en un temporal, la publica con os.replace y la indexa"""
+        if size > self.max_bytes:
+            return
+
+        path = self._path(key, extension)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                write(f)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            previous = self._entries.get(key)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (path, size)
+            self.current_bytes += size
+            self._touch(key)
+            self._evict()
+
+    def get_or_create(self, key, extension, factory):
+        """
+        Leer una entrada o crearla con factory() si no existe
+
+        Args:
+            key: Clave (ver make_key)
+            extension: Extensión del archivo
+            factory: Función sin argumentos que retorna los bytes
+
+        Returns:
+            bytes: Contenido
+        """
+        data = self.get(key, extension)
+        if data is None:
+            data = factory()
+            self.put(key, extension, data)
+        return data
+
+    def clear(self):
+        """Borrar todas las entradas"""
+        with self._lock:
+            for path, _ in self._entries.values():
+                path.unlink(missing_ok=True)
+            self._entries.clear()
+            self.current_bytes = 0
+            self._log.close()
+            self._compact_log()
+            self._log = open(self._log_path, 'a', encoding='ascii')
+
+    def close(self):
+        """Cerrar el registro de accesos"""
+        with self._lock:
+            if not self._log.closed:
+                self._log.close()
+
+    def stats(self):
+        """
+        Estadísticas de uso
+
+        Returns:
+            dict: Entradas, bytes, límite, aciertos, fallos y descartes
+        """
+        with self._lock:
+            return {
+                'name': 'disk',
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -3,12 +3,12 @@ Exportador de Códigos QR
 Módulo para exportar QR en diferentes formatos (SVG, PNG, PDF)
 """
 
-import segno
-from io import BytesIO
+from io import BytesIO, TextIOWrapper
 from pathlib import Path
 from datetime import datetime
 
 import config
+from core.qr_cache import make_symbol
 
 
 class QRExporter:
@@ -16,12 +16,55 @@ class QRExporter:
     Clase para exportar códigos QR en diferentes formatos
     """
     
-    def __init__(self):
-        """Inicializar exportador"""
-        pass
+    def __init__(self, disk_cache=None):
+        """
+        Inicializar exportador
+        
+        Args:
+            disk_cache: Caché en disco de salidas (QRDiskCache, True = la compartida,
+                        None o False = sin caché)
+        """
+        self.disk_cache = disk_cache
+    
+    def _write_output(self, filepath, output_format, params, write):
+        """
+        Escribir una exportación en su archivo, pasando por la caché en disco si la hay
+        
+        La salida se escribe directamente en el archivo de destino, sin
+        construirla entera en memoria. Con caché, un acierto se copia desde
+        ella y un fallo se copia a ella después de escribir el destino.
+        
+        Args:
+            filepath: Ruta de destino (Path, con la extensión del formato)
+            output_format: Formato de salida ('PNG', 'SVG', 'PDF')
+            params: Contenido, nivel de corrección y parámetros de estilo (dict)
+            write: Función write(stream) que escribe la salida en un archivo binario abierto
+        """
+        cache = self.disk_cache
+        if cache is True:
+            from core.qr_disk_cache import get_disk_cache
+            cache = get_disk_cache()
+        
+        if cache:
+            from core.qr_disk_cache import make_key
+            key = make_key(output_format, **params)
+            if cache.copy_to(key, filepath.suffix, filepath):
+                return
+        
+        try:
+            with open(filepath, 'wb') as stream:
+                write(stream)
+        except BaseException:
+            # Sin archivos a medio escribir (p. ej. si el contenido no cabe en un QR)
+            filepath.unlink(missing_ok=True)
+            raise
+        
+        if cache:
+            cache.put_file(key, filepath.suffix, filepath)
     
     def export_svg(self, qr_content, filepath, scale=10, error_correction='Q', 
-               dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none'):
+               dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none',
+               caption_text=None):
         """
         Exportar QR como SVG (vectorial)
         
@@ -32,7 +75,9 @@ class QRExporter:
             error_correction: Nivel de corrección (L, M, Q, H)
             dark_color: Color de los módulos oscuros (hex)
             light_color: Color de fondo (hex)
-            pattern_style: Estilo del patrón (para patrones avanzados se exporta como PNG)
+            pattern_style: Estilo del patrón ('squares', 'rounded', 'circles', etc.)
+            frame_style: Estilo del marco decorativo
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
             
         Returns:
             bool: True si se exportó correctamente
@@ -43,60 +88,267 @@ class QRExporter:
             if filepath.suffix.lower() != '.svg':
                 filepath = filepath.with_suffix('.svg')
             
-            # Si es un patrón avanzado (circles, flowers, hearts, dots)
-            # Exportamos como PNG en lugar de SVG
-            if pattern_style not in ['squares', 'rounded']:
-                print(f"⚠️ Los patrones avanzados no soportan SVG. Exportando como PNG...")
-                
-                # Cambiar extensión a PNG
-                filepath = filepath.with_suffix('.png')
-                
-                # Usar QRGenerator para generar con patrón
-                from core.qr_generator import QRGenerator
-                generator = QRGenerator(error_correction)
-                
-                qr_image = generator.generate(
-                    qr_content,
-                    scale=scale,
-                    dark_color=dark_color,
-                    light_color=light_color,
-                    pattern_style=pattern_style,
-                    frame_style=frame_style  # ← AGREGAR
-                )
-                
-                # Guardar como PNG
-                qr_image.save(str(filepath), format='PNG')
-                print(f"✅ QR exportado como PNG: {filepath}")
-                return True
+            params = {
+                'content': qr_content, 'error_correction': error_correction, 'scale': scale,
+                'dark_color': dark_color, 'light_color': light_color, 'pattern_style': pattern_style,
+                'frame_style': frame_style, 'caption_text': caption_text
+            }
+            
+            # El SVG se escribe directamente en el archivo, sin pasar por memoria
+            def write(stream):
+                self.write_svg(qr_content, stream, scale, error_correction, dark_color, light_color,
+                               pattern_style, frame_style, caption_text)
+            
+            self._write_output(filepath, 'SVG', params, write)
+            
+            print(f"✅ QR exportado como SVG: {filepath}")
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error al exportar SVG: {e}")
+            return False
+    
+    def write_svg(self, qr_content, stream, scale=10, error_correction='Q',
+                  dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none',
+                  caption_text=None):
+        """
+        Escribir el SVG de un QR en un archivo binario abierto (o BytesIO)
+        
+        Con marco, el adorno se dibuja como vectores con la misma disposición
+        que el marco del PNG (y la misma zona de silencio).
+        
+        Args:
+            qr_content: Contenido del QR
+            stream: Archivo binario abierto para escritura
+            scale: Escala del QR
+            error_correction: Nivel de corrección (L, M, Q, H)
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo del patrón
+            frame_style: Estilo del marco decorativo
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
             
-            # Para patrones simples (squares, rounded), usar SVG nativo
+        Raises:
+            Exception: Si el contenido no se puede codificar
+        """
+        # Crear QR con segno (mismo símbolo que el preview y el PNG)
+        qr = make_symbol(qr_content, error=error_correction, boost_error=False)
+        
+        # Misma disposición que el marco raster, en píxeles
+        layout = None
+        if frame_style != 'none':
+            from core.qr_frame_generator import QRFrameGenerator
+            border = qr.default_border_size
+            body_px = (len(qr.matrix) + 2 * border) * scale
+            layout = QRFrameGenerator().get_layout(frame_style, (body_px, body_px), caption_text)
+        
+        if layout is not None:
+            self._write_pattern_svg(qr, stream, scale, dark_color, light_color, pattern_style, border, layout)
+            return
+        
+        # Si es un patrón avanzado (circles, flowers, hearts, dots)
+        # cada forma se define una vez como <symbol> y se reutiliza con <use>
+        if pattern_style not in ['squares', 'rounded']:
+            self._write_pattern_svg(qr, stream, scale, dark_color, light_color, pattern_style)
+            return
+        
+        # Para patrones simples (squares, rounded), usar SVG nativo
+        qr.save(
+            stream,
+            kind='svg',
+            scale=scale,
+            border=1,
+            dark='#' + dark_color.lstrip('#'),
+            light='#' + light_color.lstrip('#')
+        )
+        
+    def _write_pattern_svg(self, qr, stream, scale, dark_color, light_color, pattern_style, border=1,
+                           layout=None):
+        """
+        Escribir un SVG con patrón avanzado de forma incremental
+        
+        La forma del módulo se define una sola vez como <symbol> y cada tramo de
+        módulos oscuros es una referencia <use> de pocos bytes. El archivo se
+        escribe fila por fila, sin construir el documento completo en memoria.
+        
+        Args:
+            qr: Símbolo de segno
+            stream: Archivo binario abierto para escritura
+            scale: Tamaño de cada módulo en píxeles
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo del patrón
+            border: Zona de silencio en módulos
+            layout: FrameLayout del marco (None = sin marco)
+        """
+        from core.qr_pattern_renderer import QRPatternRenderer
+        
+        matrix = qr.matrix
+        modules = len(matrix) + 2 * border
+        dark_color = '#' + dark_color.lstrip('#')
+        light_color = '#' + light_color.lstrip('#')
+        
+        if layout is None:
+            # El viewBox en módulos escala el código a píxeles
+            width = height = modules * scale
+            view_box = f"0 0 {modules} {modules}"
+            transform = ''
+        else:
+            # El viewBox en píxeles del marco; el código se escala a módulos dentro
+            width, height = layout.size
+            view_box = f"0 0 {width} {height}"
+            transform = f' transform="translate({layout.offset[0]} {layout.offset[1]}) scale({scale})"'
+        
+        # Formas del módulo en unidades de módulo
+        shapes = []
+        for kind, x0, y0, x1, y1 in QRPatternRenderer().module_geometry(pattern_style):
+            if kind == 'ellipse':
+                shapes.append(
+                    f'<ellipse cx="{(x0 + x1) / 2:g}" cy="{(y0 + y1) / 2:g}" '
+                    f'rx="{(x1 - x0) / 2:g}" ry="{(y1 - y0) / 2:g}"/>'
+                )
             else:
-                # Crear QR con segno
-                qr = segno.make(qr_content, error=error_correction)
+                shapes.append(f'<rect x="{x0:g}" y="{y0:g}" width="{x1 - x0:g}" height="{y1 - y0:g}"/>')
+        
+        # Cada tramo horizontal de módulos oscuros es una sola referencia
+        # a un <symbol> que repite la forma del módulo tantas veces como su largo
+        run_lengths = sorted({length for row in matrix for _, length in self.row_runs(row)})
+        
+        f = TextIOWrapper(stream, encoding='utf-8', newline='\n')
+        try:
+            f.write('<?xml version="1.0" encoding="utf-8"?>\n')
+            f.write(
+                f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+                f'width="{width}" height="{height}" viewBox="{view_box}">\n'
+            )
+            
+            f.write(f'<defs>\n<symbol id="m" overflow="visible">{"".join(shapes)}</symbol>\n')
+            for length in run_lengths:
+                if length > 1:
+                    repeated = ''.join(f'<use xlink:href="#m" x="{x}"/>' for x in range(length))
+                    f.write(f'<symbol id="r{length}" overflow="visible">{repeated}</symbol>\n')
+            f.write('</defs>\n')
+            
+            if layout is not None:
+                self._write_svg_frame(f, layout, dark_color)
+            
+            f.write(f'<g{transform}>\n')
+            f.write(f'<rect width="{modules}" height="{modules}" fill="{light_color}"/>\n')
+            f.write(f'<g fill="{dark_color}">\n')
+            
+            for row_index, row in enumerate(matrix):
+                uses = [
+                    f'<use xlink:href="#{"m" if length == 1 else f"r{length}"}" x="{start + border}"/>'
+                    for start, length in self.row_runs(row)
+                ]
+                if uses:
+                    f.write(f'<g transform="translate(0 {row_index + border})">')
+                    f.write(''.join(uses))
+                    f.write('</g>\n')
+            
+            f.write('</g>\n</g>\n</svg>\n')
+        finally:
+            # Vaciar el texto pendiente sin cerrar el archivo del llamador
+            f.flush()
+            f.detach()
+    
+    def _write_svg_frame(self, f, layout, frame_color):
+        """
+        Escribir el adorno de un marco (sin el QR) como elementos SVG
+        
+        Recorre las mismas operaciones de la disposición que la plantilla
+        raster y PDFFrameDrawer, en píxeles con el origen arriba a la izquierda.
+        
+        Args:
+            f: Archivo de texto abierto para escritura
+            layout: FrameLayout de QRFrameGenerator.get_layout()
+            frame_color: Color del marco (hex)
+        """
+        from xml.sax.saxutils import quoteattr, escape
+        from PIL import ImageColor
+        from core.qr_frame_generator import FRAME_COLOR, font_registry
+        
+        def color(value):
+            """Color de una operación (FRAME_COLOR, nombre o tupla) en hex"""
+            if value == FRAME_COLOR:
+                value = frame_color
+            if isinstance(value, str):
+                value = ImageColor.getrgb(value)
+            return '#{:02x}{:02x}{:02x}'.format(*value[:3])
+        
+        width, height = layout.size
+        f.write(f'<rect width="{width}" height="{height}" fill="{color(layout.background)}"/>\n')
+        
+        for kind, geometry, options in layout.ops:
+            if kind == 'text':
+                text, size = options['text'], options['size']
+                font = font_registry.get_font(size)
                 
-                # Convertir colores hex a formato para SVG (sin #)
-                dark_hex = dark_color.lstrip('#')
-                light_hex = light_color.lstrip('#')
+                # Mismo centro horizontal que el texto raster; ImageDraw coloca el
+                # borde superior (ascendente) en la posición, la línea base va debajo
+                left, _, right, _ = font_registry.measure(text, size)
+                center_x = geometry[0] + (left + right) / 2
+                ascent = font.getmetrics()[0] if hasattr(font, 'getmetrics') else size
+                family, style = font.getname() if hasattr(font, 'getname') else ('sans-serif', '')
+                weight = ' font-weight="bold"' if 'Bold' in (style or '') else ''
                 
-                # Guardar como SVG con colores
-                qr.save(
-                    str(filepath),
-                    kind='svg',
-                    scale=scale,
-                    border=1,
-                    dark='#' + dark_hex,
-                    light='#' + light_hex
+                f.write(
+                    f'<text x="{center_x:g}" y="{geometry[1] + ascent:g}" text-anchor="middle" '
+                    f'font-family={quoteattr(f"{family}, sans-serif")} font-size="{size}"{weight} '
+                    f'fill="{color(options.get("fill", "black"))}">{escape(text)}</text>\n'
                 )
-                
-                print(f"✅ QR exportado como SVG: {filepath}")
-                return True
+                continue
             
-        except Exception as e:
-            print(f"❌ Error al exportar SVG: {e}")
-            return False
+            # ImageDraw incluye el último píxel: la caja vectorial mide un píxel más
+            if len(geometry) == 2:
+                (x0, y0), (x1, y1) = geometry
+            else:
+                x0, y0, x1, y1 = geometry
+            x1, y1 = x1 + 1, y1 + 1
+            
+            paint = f'fill="{color(options["fill"])}"' if 'fill' in options else 'fill="none"'
+            if 'outline' in options:
+                # ImageDraw dibuja el contorno hacia dentro de la caja
+                line_width = options.get('width', 1)
+                inset = line_width / 2
+                x0, y0, x1, y1 = x0 + inset, y0 + inset, x1 - inset, y1 - inset
+                paint += f' stroke="{color(options["outline"])}" stroke-width="{line_width}"'
+            
+            if kind == 'ellipse':
+                f.write(
+                    f'<ellipse cx="{(x0 + x1) / 2:g}" cy="{(y0 + y1) / 2:g}" '
+                    f'rx="{(x1 - x0) / 2:g}" ry="{(y1 - y0) / 2:g}" {paint}/>\n'
+                )
+            else:
+                radius = f' rx="{options["radius"]}"' if kind == 'rounded_rectangle' else ''
+                f.write(
+                    f'<rect x="{x0:g}" y="{y0:g}" width="{x1 - x0:g}" height="{y1 - y0:g}"{radius} {paint}/>\n'
+                )
+    
+    @staticmethod
+    def row_runs(row):
+        """
+        Recorrer los tramos consecutivos de módulos oscuros de una fila
         
+        Args:
+            row: Fila de la matriz (1 = oscuro)
+            
+        Yields:
+            tuple: (columna inicial, largo del tramo)
+        """
+        start = None
+        for col_index, value in enumerate(row):
+            if value and start is None:
+                start = col_index
+            elif not value and start is not None:
+                yield start, col_index - start
+                start = None
+        if start is not None:
+            yield start, len(row) - start
+    
     def export_png(self, qr_content, filepath, scale=10, error_correction='Q',
-               dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none'):
+               dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none',
+               caption_text=None):
         """
         Exportar QR como PNG (rasterizado)
         
@@ -108,6 +360,8 @@ class QRExporter:
             dark_color: Color de los módulos oscuros (hex)
             light_color: Color de fondo (hex)
             pattern_style: Estilo del patrón ('squares', 'rounded', 'circles', etc.)
+            frame_style: Estilo del marco decorativo
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
             
         Returns:
             bool: True si se exportó correctamente
@@ -118,22 +372,32 @@ class QRExporter:
             if filepath.suffix.lower() != '.png':
                 filepath = filepath.with_suffix('.png')
             
-            # Usar QRGenerator para tener soporte de patrones
-            from core.qr_generator import QRGenerator
-            generator = QRGenerator(error_correction)
+            params = {
+                'content': qr_content, 'error_correction': error_correction, 'scale': scale,
+                'dark_color': dark_color, 'light_color': light_color, 'pattern_style': pattern_style,
+                'frame_style': frame_style, 'caption_text': caption_text
+            }
             
-            # Generar QR con patrón y colores personalizados
-            qr_image = generator.generate(
-                qr_content,
-                scale=scale,
-                dark_color=dark_color,
-                light_color=light_color,
-                pattern_style=pattern_style,
-                frame_style=frame_style  # ← AGREGAR
-            )
+            def write(stream):
+                # Usar QRGenerator para tener soporte de patrones
+                from core.qr_generator import QRGenerator
+                generator = QRGenerator(error_correction)
+                
+                # Generar QR con patrón y colores personalizados
+                qr_image = generator.generate(
+                    qr_content,
+                    scale=scale,
+                    dark_color=dark_color,
+                    light_color=light_color,
+                    pattern_style=pattern_style,
+                    frame_style=frame_style,
+                    caption_text=caption_text
+                )
+                
+                qr_image.save(stream, format='PNG')
             
-            # Guardar la imagen
-            qr_image.save(str(filepath), format='PNG')
+            # Guardar la imagen (desde la caché en disco si ya se exportó antes)
+            self._write_output(filepath, 'PNG', params, write)
             
             print(f"✅ QR exportado como PNG: {filepath}")
             return True
@@ -142,6 +406,209 @@ class QRExporter:
             print(f"❌ Error al exportar PNG: {e}")
             return False
 
+    def export_pdf(self, qr_content, filepath, scale=10, error_correction='Q',
+               dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none',
+               caption_text=None):
+        """
+        Exportar QR como PDF vectorial a tamaño físico
+
+        La página mide lo mismo que el PNG de igual escala impreso a
+        config.EXPORT_DPI. Los módulos y el marco se dibujan como vectores;
+        en los patrones avanzados cada forma de tramo se define una sola vez.
+
+        Args:
+            qr_content: Contenido del QR
+            filepath: Ruta donde guardar
+            scale: Escala del QR (píxeles por módulo a EXPORT_DPI)
+            error_correction: Nivel de corrección
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo del patrón ('squares', 'rounded', 'circles', etc.)
+            frame_style: Estilo del marco decorativo
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
+
+        Returns:
+            bool: True si se exportó correctamente
+        """
+        try:
+            # Asegurar extensión .pdf
+            filepath = Path(filepath)
+            if filepath.suffix.lower() != '.pdf':
+                filepath = filepath.with_suffix('.pdf')
+
+            params = {
+                'content': qr_content, 'error_correction': error_correction, 'scale': scale,
+                'dark_color': dark_color, 'light_color': light_color, 'pattern_style': pattern_style,
+                'frame_style': frame_style, 'caption_text': caption_text
+            }
+
+            def write(stream):
+                self.write_pdf(qr_content, stream, scale, error_correction, dark_color, light_color,
+                               pattern_style, frame_style, caption_text)
+
+            self._write_output(filepath, 'PDF', params, write)
+
+            print(f"✅ QR exportado como PDF: {filepath}")
+            return True
+
+        except Exception as e:
+            print(f"❌ Error al exportar PDF: {e}")
+            return False
+
+    def write_pdf(self, qr_content, stream, scale=10, error_correction='Q',
+                  dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none',
+                  caption_text=None):
+        """
+        Escribir el PDF de un QR en un archivo binario abierto (o BytesIO)
+
+        Args:
+            qr_content: Contenido del QR
+            stream: Archivo binario abierto para escritura
+            scale: Escala del QR (píxeles por módulo a EXPORT_DPI)
+            error_correction: Nivel de corrección
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo del patrón
+            frame_style: Estilo del marco decorativo
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
+
+        Raises:
+            Exception: Si el contenido no se puede codificar
+        """
+        from reportlab.pdfgen import canvas as pdf_canvas
+        from core.qr_frame_generator import QRFrameGenerator
+        from core.qr_pdf import PDFFrameDrawer, PDFSymbolDrawer
+
+        qr = make_symbol(qr_content, error=error_correction, boost_error=False)
+        border = qr.default_border_size
+        body_px = (len(qr.matrix) + 2 * border) * scale
+
+        # Misma disposición que el marco raster, en píxeles
+        layout = None
+        if frame_style != 'none':
+            layout = QRFrameGenerator().get_layout(frame_style, (body_px, body_px), caption_text)
+        if layout is None:
+            page_px, offset = (body_px, body_px), (0, 0)
+        else:
+            page_px, offset = layout.size, layout.offset
+
+        # Píxeles a puntos (1/72 de pulgada) según la resolución de exportación
+        unit = 72 / config.EXPORT_DPI
+        width, height = page_px[0] * unit, page_px[1] * unit
+
+        canvas = pdf_canvas.Canvas(stream, pagesize=(width, height), pageCompression=1)
+        canvas.setTitle(config.APP_NAME)
+
+        if layout is not None:
+            PDFFrameDrawer(canvas).draw(layout, dark_color, height, unit)
+
+        PDFSymbolDrawer(canvas).draw(
+            qr,
+            offset[0] * unit,
+            height - (offset[1] + body_px) * unit,
+            body_px * unit,
+            dark_color,
+            light_color,
+            pattern_style,
+            border,
+            opaque=layout is not None
+        )
+
+        canvas.showPage()
+        canvas.save()
+
+    def export_archive(self, items, filepath, style=None, image_format='PNG',
+                       workers=None, archive_format=None):
+        """
+        Exportar muchos QR dentro de un único archivo ZIP o TAR
+        
+        Los códigos se generan en paralelo y se escriben en el archivo a medida
+        que llegan, sin archivos temporales. Junto al archivo se guarda un
+        índice ('<archivo>.index.json') para leer entradas con read_entry().
+        
+        Args:
+            items: Iterable de contenidos o dicts (ver core.qr_batch.parse_item);
+                   la clave 'id' se usa como nombre de la entrada
+            filepath: Ruta del archivo (.zip o .tar)
+            style: Parámetros comunes de generate() (dict)
+            image_format: Formato de salida ('PNG', 'JPEG', 'WEBP', 'SVG', 'PDF')
+            workers: Número de procesos (None = todos los núcleos)
+            archive_format: 'zip' o 'tar' (None = según la extensión)
+            
+        Returns:
+            dict: {'written': n, 'failed': n}
+        """
+        from core.qr_archive import QRArchiveWriter
+        from core.qr_batch import generate_many
+        
+        extension = '.jpg' if image_format.upper() in ('JPEG', 'JPG') else f".{image_format.lower()}"
+        written = failed = 0
+        
+        with QRArchiveWriter(filepath, archive_format) as archive:
+            for result in generate_many(items, style, workers=workers, encode=image_format):
+                if result.error:
+                    failed += 1
+                    print(f"❌ Error en el elemento {result.index}: {result.error}")
+                    continue
+                
+                item_id = result.item.get('id') if isinstance(result.item, dict) else None
+                archive.add(f"{item_id or f'qr_{result.index + 1:06d}'}{extension}", result.image)
+                written += 1
+        
+        print(f"✅ {written} QR exportados en: {filepath}")
+        return {'written': written, 'failed': failed}
+    
+    def export_label_sheet(self, items, filepath, style=None, sheet=None, show_labels=False, **layout):
+        """
+        Exportar muchos QR como hojas de etiquetas en PDF (N códigos por página)
+
+        Los códigos se dibujan como vectores y las páginas se cierran a medida
+        que se llenan; la entrada se consume de forma perezosa.
+
+        Args:
+            items: Iterable de contenidos o dicts (ver core.qr_batch.parse_item);
+                   la clave 'id' se usa como texto de la etiqueta
+            filepath: Ruta del PDF
+            style: Parámetros comunes (dark_color, light_color, pattern_style, error_correction)
+            sheet: Hoja predefinida de config.PDF_LABEL_SHEETS ('A4', 'avery_5160', ...)
+            show_labels: Escribir el identificador bajo cada código
+            **layout: page_size, columns, rows, margins_mm, gutter_mm o border
+
+        Returns:
+            dict: {'codes': n, 'pages': n, 'failed': n}
+        """
+        from core.qr_batch import parse_item
+        from core.qr_pdf import QRLabelSheetWriter
+
+        filepath = Path(filepath)
+        if filepath.suffix.lower() != '.pdf':
+            filepath = filepath.with_suffix('.pdf')
+
+        failed = 0
+        with QRLabelSheetWriter(filepath, sheet, show_labels=show_labels, **layout) as sheet_writer:
+            for index, item in enumerate(items):
+                try:
+                    content, error_correction, options = parse_item(item, style)
+                    qr = make_symbol(content, error=error_correction, boost_error=False)
+                except Exception as e:
+                    failed += 1
+                    print(f"❌ Error en el elemento {index}: {e}")
+                    continue
+
+                sheet_writer.add(
+                    qr,
+                    dark_color=options.get('dark_color', '#000000'),
+                    light_color=options.get('light_color', '#FFFFFF'),
+                    pattern_style=options.get('pattern_style', 'squares'),
+                    label=item.get('id') if isinstance(item, dict) else content
+                )
+
+            summary = {'codes': sheet_writer.codes, 'pages': 0, 'failed': failed}
+
+        summary['pages'] = sheet_writer.pages
+        print(f"✅ {summary['codes']} QR en {summary['pages']} páginas: {filepath}")
+        return summary
+
     def _hex_to_rgb(self, hex_color):
         """
         Convierte color hexadecimal a tupla RGB
@@ -173,6 +640,10 @@ class QRExporter:
         try:
             filepath = Path(filepath)
             
+            # Los cuerpos de QR son imágenes de paleta: convertir solo si el formato lo exige
+            if format.upper() in ('JPEG', 'JPG') and pil_image.mode not in ('RGB', 'L'):
+                pil_image = pil_image.convert('RGB')
+            
             # Guardar la imagen
             pil_image.save(str(filepath), format=format)
             
@@ -238,8 +709,17 @@ def test_exporter():
     print(f"   Resultado: {'✅ Éxito' if success else '❌ Falló'}")
     print(f"   Archivo: {png_path}\n")
     
-    # Test 3: Verificar que los archivos existen
-    print("✅ Test 3: Verificando archivos creados")
+    # Test 3: Exportar PDF vectorial con marco
+    print("✅ Test 3: Exportando como PDF")
+    pdf_filename = exporter.generate_filename('test', 'pdf')
+    pdf_path = exporter.get_default_export_path(pdf_filename)
+    success = exporter.export_pdf(test_content, pdf_path, scale=10,
+                                  pattern_style='circles', frame_style='scan_me_bottom')
+    print(f"   Resultado: {'✅ Éxito' if success else '❌ Falló'}")
+    print(f"   Archivo: {pdf_path}\n")
+    
+    # Test 4: Verificar que los archivos existen
+    print("✅ Test 4: Verificando archivos creados")
     if svg_path.exists():
         print(f"   ✅ SVG existe: {svg_path.stat().st_size} bytes")
     else:
@@ -250,6 +730,11 @@ def test_exporter():
     else:
         print(f"   ❌ PNG no existe")
     
+    if pdf_path.exists():
+        print(f"   ✅ PDF existe: {pdf_path.stat().st_size} bytes")
+    else:
+        print(f"   ❌ PDF no existe")
+    
     print("\n🎉 Tests completados!")
     print(f"\n📁 Los archivos se guardaron en: {config.EXPORTS_DIR}")
 
@@ -3,20 +3,175 @@ Generador de Marcos para Códigos QR
 Módulo para agregar marcos decorativos alrededor de los códigos QR
 """
 
+from collections import namedtuple
+
 from PIL import Image, ImageDraw, ImageFont
-import os
+
+import config
+from core.qr_cache import LRUCache
+
+
+class FontRegistry:
+    """
+    Registro de fuentes compartido por todos los marcos
+    
+    Resuelve la fuente una sola vez (primero las incluidas en resources/fonts,
+    después las del sistema) y guarda en caché las fuentes cargadas y las
+    medidas de cada texto, para no repetir E/S de fuentes ni maquetación.
+    """
+    
+    # Fuentes del sistema probadas tras las incluidas en resources/fonts
+    SYSTEM_FONTS = ["arial.ttf", "DejaVuSans.ttf"]
+    
+    def __init__(self, fonts_dir=None):
+        """
+        Inicializar el registro
+        
+        Args:
+            fonts_dir: Directorio con fuentes incluidas (.ttf / .otf)
+        """
+        self.fonts_dir = fonts_dir or config.FONTS_DIR
+        self._font_source = None
+        self._fonts = LRUCache(max_entries=32, name='fonts')
+        self._layouts = LRUCache(max_entries=512, name='text_layout')
+    
+    def _candidates(self):
+        """Rutas de fuentes en orden de preferencia"""
+        bundled = []
+        if self.fonts_dir.is_dir():
+            bundled = sorted(
+                str(path) for path in self.fonts_dir.iterdir()
+                if path.suffix.lower() in ('.ttf', '.otf')
+            )
+        return bundled + self.SYSTEM_FONTS
+    
+    def _resolve_source(self, size):
+        """Busca la primera fuente que se pueda cargar (solo una vez por proceso)"""
+        for candidate in self._candidates():
+            try:
+                font = ImageFont.truetype(candidate, size)
+            except OSError:
+                continue
+            self._font_source = candidate
+            return font
+        
+        # Ninguna fuente TrueType disponible: usar la fuente por defecto de Pillow
+        self._font_source = ''
+        return self._load_default(size)
+    
+    def _load_default(self, size):
+        """Fuente por defecto de Pillow (escalable desde Pillow 10.1)"""
+        try:
+            return ImageFont.load_default(size)
+        except TypeError:
+            return ImageFont.load_default()
+    
+    def get_font(self, size):
+        """
+        Obtener la fuente del tamaño indicado
+        
+        Args:
+            size: Tamaño de la fuente en píxeles
+            
+        Returns:
+            ImageFont: Fuente cargada (compartida, no modificar)
+        """
+        def load():
+            if self._font_source is None:
+                return self._resolve_source(size)
+            if self._font_source:
+                return ImageFont.truetype(self._font_source, size)
+            return self._load_default(size)
+        
+        return self._fonts.get_or_create(size, load)
+    
+    def source(self):
+        """
+        Fuente que usan los marcos (se resuelve si aún no se ha hecho)
+        
+        Returns:
+            str: Ruta o nombre de la fuente TrueType, '' si es la de Pillow
+        """
+        if self._font_source is None:
+            self._resolve_source(12)
+        return self._font_source
+    
+    def measure(self, text, size):
+        """
+        Medir un texto con la fuente del tamaño indicado
+        
+        Args:
+            text: Texto a medir
+            size: Tamaño de la fuente
+            
+        Returns:
+            tuple: Caja (left, top, right, bottom) como ImageDraw.textbbox
+        """
+        font = self.get_font(size)
+        return self._layouts.get_or_create(
+            (text, self._font_source, size),
+            lambda: font.getbbox(text)
+        )
+    
+    def stats(self):
+        """
+        Estadísticas de las cachés de fuentes y medidas
+        
+        Returns:
+            dict: {'fonts': ..., 'text_layout': ...}
+        """
+        return {
+            'fonts': self._fonts.stats(),
+            'text_layout': self._layouts.stats()
+        }
+
+
+# Registro compartido por todo el proceso
+font_registry = FontRegistry()
+
+
+# Marcador de color en las operaciones de dibujo (se sustituye por el color del marco)
+FRAME_COLOR = 'frame'
+
+# Disposición de un marco: tamaño del lienzo, fondo, posición del QR y
+# lista de operaciones de dibujo (tipo, geometría, opciones de ImageDraw)
+FrameLayout = namedtuple('FrameLayout', ['size', 'background', 'offset', 'ops'])
+
+# Plantillas de marco ya dibujadas (sin el QR), compartidas por todo el proceso
+# Clave: (estilo, tamaño del QR, color, leyenda) -> (FrameLayout, imagen RGB)
+frame_templates = LRUCache(
+    max_entries=64,
+    name='frame_templates',
+    max_bytes=64 * 1024 * 1024,
+    sizeof=lambda entry: entry[1].width * entry[1].height * 4
+)
 
 
 class QRFrameGenerator:
     """
     Clase para agregar marcos decorativos a códigos QR
+    
+    Cada marco se describe como una disposición (FrameLayout). El adorno del
+    marco se dibuja una sola vez por (estilo, tamaño, color, leyenda) en una
+    plantilla; cada QR se compone copiando la plantilla y pegando el cuerpo.
     """
     
+    # Estilos cuya disposición incluye la leyenda
+    CAPTION_STYLES = ('scan_me_top', 'scan_me_bottom', 'camera_icon', 'smartphone_icon')
+    
     def __init__(self):
         """Inicializar generador de marcos"""
-        pass
+        self._layouts = {
+            'scan_me_top': self._layout_scan_me_top,
+            'scan_me_bottom': self._layout_scan_me_bottom,
+            'simple_border': self._layout_simple_border,
+            'rounded_border': self._layout_rounded_border,
+            'camera_icon': self._layout_camera_icon,
+            'smartphone_icon': self._layout_smartphone_icon,
+            'elegant': self._layout_elegant_frame
+        }
     
-    def add_frame(self, qr_image, frame_style='none', primary_color='#000000'):
+    def add_frame(self, qr_image, frame_style='none', primary_color='#000000', caption_text=None):
         """
         Agregar marco decorativo a un código QR
         
@@ -24,266 +179,215 @@ class QRFrameGenerator:
             qr_image: PIL.Image del QR original
             frame_style: Estilo del marco ('none', 'scan_me_top', etc.)
             primary_color: Color principal del marco (hex)
+            caption_text: Texto de los marcos con leyenda (None = config.DEFAULT_FRAME_CAPTION)
             
         Returns:
             PIL.Image: Imagen del QR con marco
         """
-        if frame_style == 'none':
+        if frame_style not in self._layouts:
             return qr_image
         
         # Convertir color hex a RGB
         frame_color = self._hex_to_rgb(primary_color)
         
-        # Delegar a métodos específicos según el tipo de marco
-        if frame_style == 'scan_me_top':
-            return self._add_scan_me_top(qr_image, frame_color)
-        elif frame_style == 'scan_me_bottom':
-            return self._add_scan_me_bottom(qr_image, frame_color)
-        elif frame_style == 'simple_border':
-            return self._add_simple_border(qr_image, frame_color)
-        elif frame_style == 'rounded_border':
-            return self._add_rounded_border(qr_image, frame_color)
-        elif frame_style == 'camera_icon':
-            return self._add_camera_icon(qr_image, frame_color)
-        elif frame_style == 'smartphone_icon':
-            return self._add_smartphone_icon(qr_image, frame_color)
-        elif frame_style == 'elegant':
-            return self._add_elegant_frame(qr_image, frame_color)
-        else:
-            return qr_image
+        layout, template = self.get_template(frame_style, qr_image.size, frame_color, caption_text)
+        
+        # Una sola imagen nueva: copia de la plantilla con el QR pegado encima
+        new_image = template.copy()
+        new_image.paste(qr_image, layout.offset)
+        
+        return new_image
+    
+    def get_layout(self, frame_style, qr_size, caption_text=None):
+        """
+        Obtener la disposición de un marco para un QR de un tamaño dado
+        
+        Args:
+            frame_style: Estilo del marco
+            qr_size: Tamaño (ancho, alto) del QR en píxeles
+            caption_text: Texto de la leyenda (None = config.DEFAULT_FRAME_CAPTION)
+            
+        Returns:
+            FrameLayout: Disposición del marco, o None si el estilo no existe
+        """
+        if frame_style not in self._layouts:
+            return None
+        
+        if caption_text is None:
+            caption_text = config.DEFAULT_FRAME_CAPTION
+        
+        qr_width, qr_height = qr_size
+        if frame_style in self.CAPTION_STYLES:
+            return self._layouts[frame_style](qr_width, qr_height, caption_text)
+        return self._layouts[frame_style](qr_width, qr_height)
+    
+    def get_template(self, frame_style, qr_size, color, caption_text=None):
+        """
+        Obtener la plantilla del marco (adorno ya dibujado, sin el QR)
+        
+        Args:
+            frame_style: Estilo del marco
+            qr_size: Tamaño (ancho, alto) del QR en píxeles
+            color: Color del marco (tupla RGB)
+            caption_text: Texto de la leyenda (None = config.DEFAULT_FRAME_CAPTION)
+            
+        Returns:
+            tuple: (FrameLayout, PIL.Image) compartidos con la caché, no modificar
+        """
+        if caption_text is None or frame_style not in self.CAPTION_STYLES:
+            caption_text = config.DEFAULT_FRAME_CAPTION
+        
+        def build():
+            layout = self.get_layout(frame_style, qr_size, caption_text)
+            return layout, self._render_template(layout, color)
+        
+        key = (frame_style, tuple(qr_size), color, caption_text)
+        return frame_templates.get_or_create(key, build)
+    
+    def _render_template(self, layout, color):
+        """Dibuja el adorno de una disposición en un lienzo nuevo"""
+        background = color if layout.background == FRAME_COLOR else layout.background
+        template = Image.new('RGB', layout.size, background)
+        draw = ImageDraw.Draw(template)
+        
+        for kind, geometry, options in layout.ops:
+            options = {
+                name: (color if value == FRAME_COLOR else value)
+                for name, value in options.items()
+            }
+            if kind == 'text':
+                text = options.pop('text')
+                options['font'] = font_registry.get_font(options.pop('size'))
+                draw.text(geometry, text, **options)
+            else:
+                getattr(draw, kind)(geometry, **options)
+        
+        return template
     
     def _hex_to_rgb(self, hex_color):
         """Convierte color hexadecimal a tupla RGB"""
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
     
-    def _add_scan_me_top(self, qr_image, color):
-        """Marco con texto 'SCAN ME' en la parte superior"""
-        qr_width, qr_height = qr_image.size
-        
+    def _caption_op(self, text, size, canvas_width, y):
+        """Operación de texto centrado horizontalmente"""
+        bbox = font_registry.measure(text, size)
+        text_width = bbox[2] - bbox[0]
+        text_x = (canvas_width - text_width) // 2
+        return ('text', (text_x, y), {'text': text, 'size': size, 'fill': FRAME_COLOR})
+    
+    def _layout_scan_me_top(self, qr_width, qr_height, text):
+        """Marco con texto en la parte superior"""
         # Tamaño del marco superior
         top_margin = 80
         side_margin = 20
         
-        # Crear nueva imagen con espacio para el marco
         new_width = qr_width + (side_margin * 2)
         new_height = qr_height + top_margin + side_margin
         
-        new_image = Image.new('RGB', (new_width, new_height), 'white')
-        draw = ImageDraw.Draw(new_image)
+        ops = [self._caption_op(text, 36, new_width, 20)]
         
-        # Dibujar texto "SCAN ME"
-        text = "SCAN ME"
-        try:
-            # Intentar usar una fuente grande
-            font = ImageFont.truetype("arial.ttf", 36)
-        except:
-            font = ImageFont.load_default()
-        
-        # Calcular posición del texto (centrado)
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_x = (new_width - text_width) // 2
-        text_y = 20
-        
-        draw.text((text_x, text_y), text, fill=color, font=font)
-        
-        # Pegar el QR debajo del texto
-        new_image.paste(qr_image, (side_margin, top_margin))
-        
-        return new_image
+        # QR debajo del texto
+        return FrameLayout((new_width, new_height), 'white', (side_margin, top_margin), ops)
     
-    def _add_scan_me_bottom(self, qr_image, color):
-        """Marco con texto 'SCAN ME' en la parte inferior"""
-        qr_width, qr_height = qr_image.size
-        
-        # Tamaño del marco
+    def _layout_scan_me_bottom(self, qr_width, qr_height, text):
+        """Marco con texto en la parte inferior"""
         bottom_margin = 80
         side_margin = 20
         
-        # Crear nueva imagen
         new_width = qr_width + (side_margin * 2)
         new_height = qr_height + bottom_margin + side_margin
         
-        new_image = Image.new('RGB', (new_width, new_height), 'white')
-        draw = ImageDraw.Draw(new_image)
+        # Texto debajo del QR (no se solapan)
+        ops = [self._caption_op(text, 36, new_width, qr_height + side_margin + 20)]
         
-        # Pegar el QR primero
-        new_image.paste(qr_image, (side_margin, side_margin))
-        
-        # Dibujar texto "SCAN ME" abajo
-        text = "SCAN ME"
-        try:
-            font = ImageFont.truetype("arial.ttf", 36)
-        except:
-            font = ImageFont.load_default()
-        
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_x = (new_width - text_width) // 2
-        text_y = qr_height + side_margin + 20
-        
-        draw.text((text_x, text_y), text, fill=color, font=font)
-        
-        return new_image
+        return FrameLayout((new_width, new_height), 'white', (side_margin, side_margin), ops)
     
-    def _add_simple_border(self, qr_image, color):
+    def _layout_simple_border(self, qr_width, qr_height):
         """Marco con borde simple alrededor"""
-        qr_width, qr_height = qr_image.size
-        
-        border_width = 10  # ← CAMBIAR de 20 a 10
+        border_width = 10
         
-        # Crear nueva imagen con borde
+        # El fondo completo es del color del marco
         new_width = qr_width + (border_width * 2)
         new_height = qr_height + (border_width * 2)
         
-        new_image = Image.new('RGB', (new_width, new_height), color)
-        
-        # Pegar el QR en el centro
-        new_image.paste(qr_image, (border_width, border_width))
-        
-        return new_image
+        return FrameLayout((new_width, new_height), FRAME_COLOR, (border_width, border_width), [])
     
-    def _add_rounded_border(self, qr_image, color):
+    def _layout_rounded_border(self, qr_width, qr_height):
         """Marco con borde redondeado"""
-        qr_width, qr_height = qr_image.size
-        
-        border_width = 15  # ← CAMBIAR de 20 a 15
-        corner_radius = 20  # ← CAMBIAR de 30 a 20
+        border_width = 15
+        corner_radius = 20
         
-        # Crear nueva imagen
         new_width = qr_width + (border_width * 2)
         new_height = qr_height + (border_width * 2)
         
-        new_image = Image.new('RGB', (new_width, new_height), 'white')
-        draw = ImageDraw.Draw(new_image)
-        
-        # Dibujar rectángulo redondeado
-        draw.rounded_rectangle(
-            [(0, 0), (new_width, new_height)],
-            radius=corner_radius,
-            fill=color
-        )
-        
-        # Pegar el QR en el centro
-        new_image.paste(qr_image, (border_width, border_width))
+        ops = [
+            ('rounded_rectangle', [(0, 0), (new_width, new_height)],
+             {'radius': corner_radius, 'fill': FRAME_COLOR})
+        ]
         
-        return new_image
-
-    def _add_camera_icon(self, qr_image, color):
+        return FrameLayout((new_width, new_height), 'white', (border_width, border_width), ops)
+    
+    def _layout_camera_icon(self, qr_width, qr_height, text):
         """Marco con ícono de cámara"""
-        qr_width, qr_height = qr_image.size
-        
         top_margin = 100
         side_margin = 20
         
         new_width = qr_width + (side_margin * 2)
         new_height = qr_height + top_margin + side_margin
         
-        new_image = Image.new('RGB', (new_width, new_height), 'white')
-        draw = ImageDraw.Draw(new_image)
-        
-        # Dibujar ícono de cámara simple (círculo + rectángulo)
         center_x = new_width // 2
         camera_y = 30
         
-        # Lente de la cámara (círculo)
-        draw.ellipse(
-            [center_x - 25, camera_y, center_x + 25, camera_y + 50],
-            fill=color
-        )
-        
-        # Texto "SCAN ME"
-        text = "SCAN ME"
-        try:
-            font = ImageFont.truetype("arial.ttf", 28)
-        except:
-            font = ImageFont.load_default()
-        
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_x = (new_width - text_width) // 2
-        
-        draw.text((text_x, camera_y + 60), text, fill=color, font=font)
-        
-        # Pegar el QR
-        new_image.paste(qr_image, (side_margin, top_margin))
+        ops = [
+            # Lente de la cámara (círculo)
+            ('ellipse', [center_x - 25, camera_y, center_x + 25, camera_y + 50], {'fill': FRAME_COLOR}),
+            self._caption_op(text, 28, new_width, camera_y + 60)
+        ]
         
-        return new_image
+        return FrameLayout((new_width, new_height), 'white', (side_margin, top_margin), ops)
     
-    def _add_smartphone_icon(self, qr_image, color):
+    def _layout_smartphone_icon(self, qr_width, qr_height, text):
         """Marco con ícono de smartphone"""
-        qr_width, qr_height = qr_image.size
-        
         top_margin = 100
         side_margin = 20
         
         new_width = qr_width + (side_margin * 2)
         new_height = qr_height + top_margin + side_margin
         
-        new_image = Image.new('RGB', (new_width, new_height), 'white')
-        draw = ImageDraw.Draw(new_image)
-        
-        # Dibujar smartphone simple
         center_x = new_width // 2
         phone_y = 20
         phone_width = 40
         phone_height = 60
         
-        # Rectángulo del teléfono
-        draw.rounded_rectangle(
-            [center_x - phone_width//2, phone_y, 
-             center_x + phone_width//2, phone_y + phone_height],
-            radius=8,
-            outline=color,
-            width=3
-        )
-        
-        # Texto
-        text = "SCAN ME"
-        try:
-            font = ImageFont.truetype("arial.ttf", 28)
-        except:
-            font = ImageFont.load_default()
-        
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_x = (new_width - text_width) // 2
-        
-        draw.text((text_x, phone_y + phone_height + 10), text, fill=color, font=font)
-        
-        # Pegar el QR
-        new_image.paste(qr_image, (side_margin, top_margin))
+        ops = [
+            # Rectángulo del teléfono
+            ('rounded_rectangle',
+             [center_x - phone_width//2, phone_y,
+              center_x + phone_width//2, phone_y + phone_height],
+             {'radius': 8, 'outline': FRAME_COLOR, 'width': 3}),
+            self._caption_op(text, 28, new_width, phone_y + phone_height + 10)
+        ]
         
-        return new_image
+        return FrameLayout((new_width, new_height), 'white', (side_margin, top_margin), ops)
     
-    def _add_elegant_frame(self, qr_image, color):
+    def _layout_elegant_frame(self, qr_width, qr_height):
         """Marco elegante con decoraciones en las esquinas"""
-        qr_width, qr_height = qr_image.size
-        
         border_width = 30
         
         new_width = qr_width + (border_width * 2)
         new_height = qr_height + (border_width * 2)
         
-        new_image = Image.new('RGB', (new_width, new_height), 'white')
-        draw = ImageDraw.Draw(new_image)
-        
-        # Dibujar borde doble
-        # Borde exterior
-        draw.rectangle(
-            [(5, 5), (new_width - 5, new_height - 5)],
-            outline=color,
-            width=3
-        )
-        
-        # Borde interior
-        draw.rectangle(
-            [(border_width - 5, border_width - 5), 
-             (new_width - border_width + 5, new_height - border_width + 5)],
-            outline=color,
-            width=2
-        )
+        ops = [
+            # Borde exterior
+            ('rectangle', [(5, 5), (new_width - 5, new_height - 5)],
+             {'outline': FRAME_COLOR, 'width': 3}),
+            # Borde interior
+            ('rectangle',
+             [(border_width - 5, border_width - 5),
+              (new_width - border_width + 5, new_height - border_width + 5)],
+             {'outline': FRAME_COLOR, 'width': 2})
+        ]
         
         # Decoraciones en las esquinas
         corner_size = 15
@@ -295,12 +399,9 @@ class QRFrameGenerator:
         ]
         
         for x, y in corners:
-            draw.rectangle([x, y, x + corner_size, y + corner_size], fill=color)
+            ops.append(('rectangle', [x, y, x + corner_size, y + corner_size], {'fill': FRAME_COLOR}))
         
-        # Pegar el QR
-        new_image.paste(qr_image, (border_width, border_width))
-        
-        return new_image
+        return FrameLayout((new_width, new_height), 'white', (border_width, border_width), ops)
 
 
 def test_frame_generator():
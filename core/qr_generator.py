@@ -3,11 +3,8 @@ Generador de Códigos QR
 Módulo principal para la generación de códigos QR con segno
 """
 
-import segno
-from io import BytesIO
-from PIL import Image
-
 import config
+from core.qr_cache import make_symbol, body_cache, frame_cache, render_cache_stats
 
 
 class QRGenerator:
@@ -24,7 +21,7 @@ class QRGenerator:
         """
         self.error_correction = error_correction
         
-    def generate(self, content, scale=10, dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none'):
+    def generate(self, content, scale=10, dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', frame_style='none', antialias=False, caption_text=None):
         """
         Genera un código QR básico con personalización
         
@@ -35,49 +32,157 @@ class QRGenerator:
             light_color: Color de fondo/módulos claros (hex, ej: '#FFFFFF')
             pattern_style: Estilo de los módulos ('squares', 'rounded', 'circles', 'flowers', 'hearts', 'dots')
             frame_style: Estilo del marco decorativo ('none', 'scan_me_top', etc.)
+            antialias: Suavizar los bordes de los patrones avanzados
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
+            
+        Returns:
+            PIL.Image: Imagen del QR generado, propia del llamador (modo 'P' sin marco, RGB con marco)
+        
+        Cada etapa (codificación, cuerpo, marco) se memoiza por separado con
+        solo los parámetros de los que depende: cambiar el marco reutiliza el
+        cuerpo y cambiar el patrón reutiliza el símbolo codificado.
+        """
+        if frame_style == 'none':
+            return self.generate_body(content, scale, dark_color, light_color, pattern_style, antialias)
+        
+        # Etapa de marco: depende del cuerpo, de los colores y del estilo de marco
+        frame_key = (
+            self._body_key(content, scale, pattern_style, antialias),
+            self._hex_to_rgb(dark_color),
+            self._hex_to_rgb(light_color),
+            frame_style,
+            caption_text
+        )
+        
+        def build_framed():
+            qr_image = self.generate_body(content, scale, dark_color, light_color, pattern_style, antialias)
+            return self.apply_frame(qr_image, frame_style, dark_color, caption_text)
+        
+        # Copia propia, como en generate_body(): modificarla no altera la caché
+        return frame_cache.get_or_create(frame_key, build_framed).copy()
+    
+    def generate_body(self, content, scale=10, dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', antialias=False):
+        """
+        Genera solo el cuerpo del QR (módulos), sin marco
+        
+        El resultado es una imagen de paleta (modo 'P'): ocupa 1 byte por píxel
+        y sus colores se pueden cambiar con recolor() sin volver a renderizar.
+        
+        Args:
+            content: Contenido del QR
+            scale: Escala del QR
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo de los módulos
+            antialias: Suavizar los bordes de los patrones avanzados
+            
+        Returns:
+            PIL.Image: Imagen en modo 'P' (índice 0 = claro)
+        """
+        # Etapa de cuerpo: la geometría no depende de los colores (imagen de paleta)
+        body_key = self._body_key(content, scale, pattern_style, antialias)
+        template = body_cache.get_or_create(
+            body_key,
+            lambda: self._render_body(content, scale, pattern_style, antialias)
+        )
+        
+        # Copia propia con la paleta pedida (el llamador puede modificarla)
+        qr_image = template.copy()
+        return self.recolor(qr_image, dark_color, light_color)
+    
+    def _body_key(self, content, scale, pattern_style, antialias):
+        """Clave de la etapa de cuerpo: solo los parámetros que afectan a la geometría"""
+        if pattern_style in ['squares', 'rounded']:
+            # Ambos estilos se renderizan igual y no usan antialias
+            return (content, self.error_correction, scale, 'squares', False)
+        return (content, self.error_correction, scale, pattern_style, antialias)
+    
+    def _render_body(self, content, scale, pattern_style, antialias):
+        """
+        Renderiza el cuerpo del QR en blanco y negro (la paleta se sustituye después)
+        
+        Args:
+            content: Contenido del QR
+            scale: Escala del QR
+            pattern_style: Estilo de los módulos
+            antialias: Suavizar los bordes de los patrones avanzados
             
         Returns:
-            PIL.Image: Imagen del QR generado
+            PIL.Image: Imagen en modo 'P'
         """
-        # Crear QR con segno
-        qr = segno.make(
+        # Crear QR con segno (o reutilizarlo desde la caché de símbolos)
+        qr = make_symbol(
             content,
             error=self.error_correction,
             boost_error=False
         )
         
-        # Convertir colores hex a RGB
-        dark_rgb = self._hex_to_rgb(dark_color)
-        light_rgb = self._hex_to_rgb(light_color)
+        dark_rgb = (0, 0, 0)
+        light_rgb = (255, 255, 255)
         
         # Generar QR según el patrón
         if pattern_style in ['squares', 'rounded']:
-            buffer = BytesIO()
-            qr.save(
-                buffer, 
-                kind='png', 
-                scale=scale,
-                dark=dark_rgb,
-                light=light_rgb
+            # Imagen construida directamente desde la matriz (sin pasar por PNG)
+            from core.qr_pattern_renderer import QRPatternRenderer
+            renderer = QRPatternRenderer()
+            return renderer.render_squares(
+                qr.matrix,
+                scale,
+                dark_rgb,
+                light_rgb,
+                border=qr.default_border_size
             )
-            buffer.seek(0)
-            qr_image = Image.open(buffer)
-        else:
-            # Patrones avanzados
-            qr_image = self._generate_custom_pattern(qr, scale, dark_rgb, light_rgb, pattern_style)
-        
-        # Aplicar marco decorativo si es necesario
-        if frame_style != 'none':
-            from core.qr_frame_generator import QRFrameGenerator
-            frame_gen = QRFrameGenerator()
-            qr_image = frame_gen.add_frame(qr_image, frame_style, dark_color)
         
+        # Patrones avanzados
+        return self._generate_custom_pattern(qr, scale, dark_rgb, light_rgb, pattern_style, antialias)
+    
+    def apply_frame(self, qr_image, frame_style='none', color='#000000', caption_text=None):
+        """
+        Aplica un marco decorativo al cuerpo del QR
+        
+        Args:
+            qr_image: Imagen del QR (cuerpo)
+            frame_style: Estilo del marco ('none' devuelve la misma imagen)
+            color: Color principal del marco (hex)
+            caption_text: Texto de los marcos con leyenda (None = "SCAN ME")
+            
+        Returns:
+            PIL.Image: Imagen con marco
+        """
+        if frame_style == 'none':
+            return qr_image
+        
+        from core.qr_frame_generator import QRFrameGenerator
+        frame_gen = QRFrameGenerator()
+        return frame_gen.add_frame(qr_image, frame_style, color, caption_text)
+    
+    def recolor(self, qr_image, dark_color='#000000', light_color='#FFFFFF'):
+        """
+        Cambia los colores de un cuerpo de QR sustituyendo solo su paleta
+        
+        Cuesta O(paleta) en lugar de O(píxeles). Modifica la imagen recibida.
+        
+        Args:
+            qr_image: Imagen en modo 'P' retornada por generate_body()
+            dark_color: Nuevo color de los módulos oscuros (hex)
+            light_color: Nuevo color de fondo (hex)
+            
+        Returns:
+            PIL.Image: La misma imagen, con la nueva paleta
+        """
+        from core.qr_pattern_renderer import QRPatternRenderer
+        
+        # 2 entradas para colores planos, 256 para bordes suavizados
+        levels = len(qr_image.getpalette()) // 3
+        palette = QRPatternRenderer().blend_palette(
+            self._hex_to_rgb(dark_color),
+            self._hex_to_rgb(light_color),
+            levels
+        )
+        qr_image.putpalette(palette)
         return qr_image
     
-
-
-
-    def _generate_custom_pattern(self, qr, scale, dark_rgb, light_rgb, pattern_style):
+    def _generate_custom_pattern(self, qr, scale, dark_rgb, light_rgb, pattern_style, antialias=False):
         """
         Genera QR con patrones personalizados (círculos, flores, corazones, puntos)
         
@@ -87,79 +192,17 @@ class QRGenerator:
             dark_rgb: Color oscuro (tupla RGB)
             light_rgb: Color claro (tupla RGB)
             pattern_style: Estilo del patrón
+            antialias: Usar sprites con bordes suavizados
             
         Returns:
             PIL.Image: Imagen del QR con patrón personalizado
         """
-        from PIL import ImageDraw
-        
-        # Obtener matriz de módulos del QR
-        matrix = qr.matrix
-        size = len(matrix)
-        
-        # Calcular tamaño de la imagen
-        img_size = size * scale
-        
-        # Crear imagen con color de fondo
-        image = Image.new('RGB', (img_size, img_size), light_rgb)
-        draw = ImageDraw.Draw(image)
-        
-        # Dibujar cada módulo según el patrón
-        for row in range(size):
-            for col in range(size):
-                if matrix[row][col]:  # Si el módulo está "encendido"
-                    x = col * scale
-                    y = row * scale
-                    
-                    # Dibujar según el patrón seleccionado
-                    if pattern_style == 'circles':
-                        # Círculos
-                        margin = scale * 0.1
-                        draw.ellipse(
-                            [x + margin, y + margin, x + scale - margin, y + scale - margin],
-                            fill=dark_rgb
-                        )
-                        
-                    elif pattern_style == 'flowers':
-                        # Flores/cruces (4 círculos pequeños en las esquinas)
-                        quarter = scale / 4
-                        radius = scale / 6
-                        positions = [
-                            (x + quarter, y + quarter),
-                            (x + 3*quarter, y + quarter),
-                            (x + quarter, y + 3*quarter),
-                            (x + 3*quarter, y + 3*quarter)
-                        ]
-                        for px, py in positions:
-                            draw.ellipse(
-                                [px - radius, py - radius, px + radius, py + radius],
-                                fill=dark_rgb
-                            )
-                        
-                    elif pattern_style == 'hearts':
-                        # Corazones (aproximación con círculos y triángulo)
-                        # Versión simplificada: círculo
-                        margin = scale * 0.15
-                        draw.ellipse(
-                            [x + margin, y + margin, x + scale - margin, y + scale - margin],
-                            fill=dark_rgb
-                        )
-                        
-                    elif pattern_style == 'dots':
-                        # Puntos pequeños (círculos más pequeños)
-                        margin = scale * 0.3
-                        draw.ellipse(
-                            [x + margin, y + margin, x + scale - margin, y + scale - margin],
-                            fill=dark_rgb
-                        )
-                        
-                    else:  # Default: cuadrados
-                        draw.rectangle(
-                            [x, y, x + scale, y + scale],
-                            fill=dark_rgb
-                        )
-        
-        return image
+        from core.qr_pattern_renderer import QRPatternRenderer
+        
+        # Estampar los sprites del atlas (compartido por el proceso) sobre la matriz
+        renderer = QRPatternRenderer()
+        return renderer.render(qr.matrix, scale, dark_rgb, light_rgb, pattern_style, antialias)
+    
     def _hex_to_rgb(self, hex_color):
         """
         Convierte color hexadecimal a tupla RGB
@@ -204,12 +247,8 @@ class QRGenerator:
             PIL.Image: Imagen del QR
         """
         # Formato WiFi QR
-        hidden_str = "true" if hidden else "false"
-        
-        if encryption == "nopass":
-            wifi_string = f"WIFI:T:nopass;S:{ssid};P:;H:{hidden_str};;"
-        else:
-            wifi_string = f"WIFI:T:{encryption};S:{ssid};P:{password};H:{hidden_str};;"
+        from core.qr_content import build_wifi
+        wifi_string = build_wifi(ssid, password, encryption, hidden)
         
         return self.generate(wifi_string, scale)
     
@@ -226,13 +265,8 @@ class QRGenerator:
             PIL.Image: Imagen del QR
         """
         # Formato WhatsApp
-        if message:
-            # URL encode del mensaje
-            import urllib.parse
-            message_encoded = urllib.parse.quote(message)
-            whatsapp_url = f"https://wa.me/{phone}?text={message_encoded}"
-        else:
-            whatsapp_url = f"https://wa.me/{phone}"
+        from core.qr_content import build_whatsapp
+        whatsapp_url = build_whatsapp(phone, message)
         
         return self.generate(whatsapp_url, scale)
     
@@ -246,7 +280,8 @@ class QRGenerator:
         Returns:
             dict: Información del QR (versión, módulos, etc.)
         """
-        qr = segno.make(content, error=self.error_correction)
+        # Mismas opciones que generate() para describir el mismo símbolo
+        qr = make_symbol(content, error=self.error_correction, boost_error=False)
         
         return {
             'version': qr.version,
@@ -254,6 +289,77 @@ class QRGenerator:
             'mode': qr.mode,
             'modules': qr.symbol_size()[0]  # Tamaño en módulos (ancho = alto)
         }
+    
+    def fit_scale(self, content, max_size, pattern_style='squares', frame_style='none', caption_text=None):
+        """
+        Mayor escala entera con la que el QR (y su marco) cabe en un tamaño
+        
+        Sirve para renderizar el preview directamente al tamaño en pantalla
+        en lugar de generarlo grande y reducirlo.
+        
+        Args:
+            content: Contenido del QR
+            max_size: Tamaño disponible (ancho, alto) en píxeles
+            pattern_style: Estilo de los módulos
+            frame_style: Estilo del marco
+            caption_text: Texto de los marcos con leyenda
+            
+        Returns:
+            int: Escala (mínimo 1)
+        """
+        qr = make_symbol(content, error=self.error_correction, boost_error=False)
+        
+        # Lado del cuerpo en módulos: los patrones avanzados no dibujan zona de silencio
+        modules = len(qr.matrix)
+        if pattern_style in ['squares', 'rounded']:
+            modules += 2 * qr.default_border_size
+        
+        max_width, max_height = max_size
+        scale = max(1, min(max_width, max_height) // modules)
+        if frame_style == 'none':
+            return scale
+        
+        # El marco añade márgenes (y leyenda): bajar la escala hasta que quepa
+        from core.qr_frame_generator import QRFrameGenerator
+        frame_gen = QRFrameGenerator()
+        while scale > 1:
+            side = modules * scale
+            layout = frame_gen.get_layout(frame_style, (side, side), caption_text)
+            if layout is None or (layout.size[0] <= max_width and layout.size[1] <= max_height):
+                break
+            scale -= 1
+        return scale
+
+    
+    def get_cache_stats(self):
+        """
+        Obtiene las estadísticas de aciertos de cada etapa del render
+        
+        Returns:
+            dict: Estadísticas por etapa ('encode', 'body', 'frame')
+        """
+        return render_cache_stats()
+
+    def generate_many(self, items, style=None, workers=None, ordered=True, encode=None):
+        """
+        Genera muchos códigos QR en paralelo (un proceso por núcleo)
+
+        Args:
+            items: Iterable de contenidos (str) o dicts con 'content' y
+                   parámetros a sobrescribir (scale, pattern_style, error_correction...)
+            style: Parámetros comunes de generate() para todo el lote (dict)
+            workers: Número de procesos (None = todos los núcleos, 1 = sin pool)
+            ordered: True = resultados en orden de entrada, False = según terminan
+            encode: Formato de Pillow ('PNG', ...) para obtener bytes en lugar de imágenes
+
+        Yields:
+            BatchResult: (index, item, image, error); error es None si salió bien
+        """
+        from core.qr_batch import generate_many
+
+        style = dict(style or {})
+        style.setdefault('error_correction', self.error_correction)
+        return generate_many(items, style, workers=workers, ordered=ordered, encode=encode)
 
 
 def test_generator():
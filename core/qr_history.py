@@ -0,0 +1,246 @@
+"""
+Historial de códigos QR generados
+Base de datos SQLite de solo anexado: guardar una entrada es un INSERT y
+las consultas usan índices y paginación por cursor.
+"""
+
+import hashlib
+import json
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import config
+
+
+def content_hash(content):
+    """Hash SHA-256 (hex) del contenido, para buscar códigos repetidos"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _parse_timestamp(value):
+    """Marca de tiempo de una entrada del historial JSON anterior"""
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value).timestamp()
+        except ValueError:
+            pass
+    return time.time()
+
+
+class QRHistory:
+    """
+    Historial en SQLite (modo WAL)
+
+    Guardar una entrada cuesta un INSERT sin reescribir nada. Hay índices por
+    tipo, fecha y hash del contenido, y list() pagina por cursor (id), de modo
+    que las últimas 50 entradas se leen igual de rápido con un millón.
+    """
+
+    def __init__(self, db_path=None, legacy_file=None):
+        """
+        Abrir (o crear) el historial
+
+        Si existe el historial JSON anterior (config.HISTORY_FILE), sus
+        entradas se importan una sola vez y el archivo se renombra.
+
+        Args:
+            db_path: Ruta de la base de datos (None = config.HISTORY_DB)
+            legacy_file: Historial JSON a migrar (None = config.HISTORY_FILE)
+        """
+        self.db_path = Path(db_path or config.HISTORY_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_path))
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        with self._db:
+            self._db.execute('''
+                CREATE TABLE IF NOT EXISTS history (
+                    id INTEGER PRIMARY KEY,
+                    created_at REAL NOT NULL,
+                    qr_type TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    style TEXT
+                )
+            ''')
+            # (tipo, id) sirve para listar por tipo en orden sin ordenar en memoria
+            self._db.execute('CREATE INDEX IF NOT EXISTS history_type ON history (qr_type, id)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS history_created ON history (created_at)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS history_hash ON history (content_hash)')
+
+        self._migrate(legacy_file or config.HISTORY_FILE)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """Cerrar la base de datos"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _migrate(self, legacy_file):
+        """Importa el historial JSON anterior y lo renombra a '.migrated'"""
+        if not legacy_file.exists():
+            return
+
+        try:
+            with open(legacy_file, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ No se pudo leer el historial anterior: {e}")
+            return
+
+        entries = data.get('history', []) if isinstance(data, dict) else data
+        rows = []
+        for entry in entries:
+            if not isinstance(entry, dict) or not entry.get('content'):
+                continue
+            content = str(entry['content'])
+            style = entry.get('style') or entry.get('config')
+            rows.append((
+                _parse_timestamp(entry.get('created_at') or entry.get('timestamp')),
+                entry.get('type') or entry.get('qr_type') or 'url',
+                content,
+                content_hash(content),
+                json.dumps(style) if style else None
+            ))
+
+        rows.sort(key=lambda row: row[0])
+        with self._db:
+            self._db.executemany(
+                'INSERT INTO history (created_at, qr_type, content, content_hash, style) VALUES (?, ?, ?, ?, ?)',
+                rows
+            )
+        legacy_file.rename(legacy_file.with_name(legacy_file.name + '.migrated'))
+        print(f"✅ Historial migrado: {len(rows)} entradas desde {legacy_file.name}")
+
+    def _entry(self, row):
+        """Entrada pública a partir de una fila de la tabla"""
+        entry_id, created_at, qr_type, content, digest, style = row
+        return {
+            'id': entry_id,
+            'created_at': datetime.fromtimestamp(created_at).isoformat(timespec='seconds'),
+            'type': qr_type,
+            'content': content,
+            'content_hash': digest,
+            'style': json.loads(style) if style else None
+        }
+
+    def add(self, qr_type, content, style=None):
+        """
+        Guardar un código generado
+
+        Args:
+            qr_type: Tipo de QR ('url', 'wifi', ...)
+            content: Contenido codificado
+            style: Parámetros de personalización (dict serializable)
+
+        Returns:
+            int: Identificador de la entrada
+        """
+        with self._db:
+            cursor = self._db.execute(
+                'INSERT INTO history (created_at, qr_type, content, content_hash, style) VALUES (?, ?, ?, ?, ?)',
+                (time.time(), qr_type, content, content_hash(content), json.dumps(style) if style else None)
+            )
+        return cursor.lastrowid
+
+    def list(self, limit=50, before=None, qr_type=None, since=None, until=None):
+        """
+        Página de entradas, de la más reciente a la más antigua
+
+        Args:
+            limit: Entradas por página
+            before: Cursor: id de la última entrada de la página anterior
+            qr_type: Filtrar por tipo
+            since: Solo entradas desde esta fecha (datetime o timestamp)
+            until: Solo entradas anteriores a esta fecha (datetime o timestamp)
+
+        Returns:
+            dict: {'items': [...], 'next': cursor de la página siguiente o None}
+        """
+        try:
+            limit = max(1, min(int(limit), 1000))
+        except (TypeError, ValueError):
+            raise ValueError(f"Límite inválido: {limit}")
+
+        conditions, params = [], []
+        if before is not None:
+            conditions.append('id < ?')
+            params.append(int(before))
+        if qr_type is not None:
+            conditions.append('qr_type = ?')
+            params.append(qr_type)
+        if since is not None:
+            conditions.append('created_at >= ?')
+            params.append(since.timestamp() if isinstance(since, datetime) else float(since))
+        if until is not None:
+            conditions.append('created_at < ?')
+            params.append(until.timestamp() if isinstance(until, datetime) else float(until))
+
+        query = 'SELECT id, created_at, qr_type, content, content_hash, style FROM history'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id DESC LIMIT ?'
+        params.append(limit)
+
+        items = [self._entry(row) for row in self._db.execute(query, params)]
+        next_cursor = items[-1]['id'] if len(items) == limit else None
+        return {'items': items, 'next': next_cursor}
+
+    def find_content(self, content, limit=50):
+        """
+        Entradas con exactamente este contenido (por hash, con índice)
+
+        Args:
+            content: Contenido a buscar
+            limit: Máximo de entradas
+
+        Returns:
+            list: Entradas, de la más reciente a la más antigua
+        """
+        rows = self._db.execute(
+            'SELECT id, created_at, qr_type, content, content_hash, style FROM history '
+            'WHERE content_hash = ? AND content = ? ORDER BY id DESC LIMIT ?',
+            (content_hash(content), content, limit)
+        )
+        return [self._entry(row) for row in rows]
+
+    def get(self, entry_id):
+        """Entrada por id, o None si no existe"""
+        row = self._db.execute(
+            'SELECT id, created_at, qr_type, content, content_hash, style FROM history WHERE id = ?',
+            (entry_id,)
+        ).fetchone()
+        return self._entry(row) if row else None
+
+    def delete(self, entry_id):
+        """
+        Borrar una entrada
+
+        Returns:
+            bool: True si existía
+        """
+        with self._db:
+            cursor = self._db.execute('DELETE FROM history WHERE id = ?', (entry_id,))
+        return cursor.rowcount > 0
+
+    def clear(self):
+        """Borrar todo el historial"""
+        with self._db:
+            self._db.execute('DELETE FROM history')
+
+    def count(self, qr_type=None):
+        """Número de entradas (de un tipo, si se indica)"""
+        if qr_type is None:
+            return self._db.execute('SELECT COUNT(*) FROM history').fetchone()[0]
+        return self._db.execute('SELECT COUNT(*) FROM history WHERE qr_type = ?', (qr_type,)).fetchone()[0]
@@ -0,0 +1,356 @@
+"""
+Renderizador de Patrones de Módulos
+Compone la imagen completa del QR con operaciones de NumPy en lugar de dibujar módulo a módulo
+"""
+
+from collections import namedtuple
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from core.qr_cache import LRUCache
+
+
+# Factor de sobremuestreo para los bordes suavizados (antialiasing)
+ANTIALIAS_SUPERSAMPLE = 4
+
+# Sprite de un módulo: baldosa de índices de color + paleta RGB que la colorea
+ModuleSprite = namedtuple('ModuleSprite', ['tile', 'palette'])
+
+# Atlas de sprites compartido por todo el proceso
+# Clave: (patrón, escala, color oscuro, color claro, antialias, variante)
+sprite_atlas = LRUCache(max_entries=256, name='sprites')
+
+
+class QRPatternRenderer:
+    """
+    Clase para rasterizar la matriz de módulos de un QR con patrones personalizados
+
+    Cada forma se dibuja una sola vez en un sprite (guardado en el atlas) y se
+    estampa sobre todos los módulos oscuros mediante operaciones vectorizadas.
+    Sin antialias produce exactamente los mismos píxeles que dibujar cada módulo
+    con ImageDraw.
+    """
+
+    def __init__(self):
+        """Inicializar renderizador"""
+        pass
+
+    def render(self, matrix, scale, dark_rgb, light_rgb, pattern_style, antialias=False):
+        """
+        Renderiza la matriz de módulos con el patrón indicado
+
+        Args:
+            matrix: Matriz de módulos (secuencia de filas, 1 = oscuro)
+            scale: Escala del QR (tamaño de cada módulo en píxeles, entero)
+            dark_rgb: Color oscuro (tupla RGB)
+            light_rgb: Color claro (tupla RGB)
+            pattern_style: Estilo del patrón ('circles', 'flowers', 'hearts', 'dots')
+            antialias: Si True, suaviza los bordes de las formas
+
+        Returns:
+            PIL.Image: Imagen en modo 'P' (índice 0 = claro; el resto, hacia el oscuro)
+        """
+        indices, palette = self.compose(matrix, scale, dark_rgb, light_rgb, pattern_style, antialias)
+        height, width = indices.shape
+
+        # Imagen indexada sobre el mismo buffer (sin copias ni conversión a RGB)
+        image = Image.frombuffer('P', (width, height), indices, 'raw', 'P', 0, 1)
+        image.putpalette(palette)
+        return image
+
+    def compose(self, matrix, scale, dark_rgb, light_rgb, pattern_style, antialias=False):
+        """
+        Estampa los sprites del atlas sobre los módulos oscuros
+
+        Args:
+            matrix: Matriz de módulos (secuencia de filas, 1 = oscuro)
+            scale: Escala del QR
+            dark_rgb: Color oscuro (tupla RGB)
+            light_rgb: Color claro (tupla RGB)
+            pattern_style: Estilo del patrón
+            antialias: Si True, usa sprites con bordes suavizados
+
+        Returns:
+            tuple: (arreglo uint8 contiguo de índices (alto, ancho), paleta RGB plana)
+        """
+        modules = self._matrix_to_array(matrix)
+        size = modules.shape[0]
+        img_size = size * scale
+
+        if antialias:
+            # Geometría continua: un único sprite válido para todas las posiciones
+            row_keys, col_keys = [None], [None]
+            row_groups = col_groups = None
+        else:
+            # Las coordenadas de cada forma se truncan a enteros al dibujar, por lo que
+            # módulos en posiciones distintas podrían resultar en baldosas distintas.
+            # Se agrupan filas y columnas por sus límites relativos para ser exactos.
+            row_keys, row_groups = self._axis_variants(pattern_style, scale, size)
+            col_keys, col_groups = row_keys, row_groups
+
+        sprites = {}
+        for row_key in row_keys:
+            for col_key in col_keys:
+                sprites[row_key, col_key] = self.get_sprite(
+                    pattern_style, scale, dark_rgb, light_rgb, antialias, (row_key, col_key)
+                )
+        palette = next(iter(sprites.values())).palette
+
+        # Caso habitual: un solo sprite que cabe dentro del módulo
+        if len(sprites) == 1:
+            tile = next(iter(sprites.values())).tile
+            if not tile[scale:, :].any() and not tile[:, scale:].any():
+                indices = np.empty((size, scale, size, scale), dtype=np.uint8)
+                np.multiply(modules[:, None, :, None], tile[None, :scale, None, :scale], out=indices)
+                return indices.reshape(img_size, img_size), palette
+
+        # Espacio para formas que sobresalen del módulo (p. ej. rectángulos inclusivos)
+        canvas = np.zeros((size + 1, scale, size + 1, scale), dtype=np.uint8)
+
+        for row_index, row_key in enumerate(row_keys):
+            for col_index, col_key in enumerate(col_keys):
+                selected = (modules
+                            & (row_groups == row_index)[:, None]
+                            & (col_groups == col_index)[None, :])
+                tile = sprites[row_key, col_key].tile
+
+                # El sprite mide 2x2 módulos: se reparte en cuadrantes desplazados
+                for quad_y in (0, 1):
+                    for quad_x in (0, 1):
+                        quadrant = tile[quad_y * scale:(quad_y + 1) * scale,
+                                        quad_x * scale:(quad_x + 1) * scale]
+                        if not quadrant.any():
+                            continue
+                        target = canvas[quad_y:quad_y + size, :, quad_x:quad_x + size, :]
+                        np.maximum(target, selected[:, None, :, None] * quadrant[None, :, None, :],
+                                   out=target)
+
+        full = canvas.reshape((size + 1) * scale, (size + 1) * scale)
+        return np.ascontiguousarray(full[:img_size, :img_size]), palette
+
+    def render_squares(self, matrix, scale, dark_rgb, light_rgb, border=4):
+        """
+        Renderiza módulos cuadrados directamente desde la matriz
+
+        Construye la imagen en memoria (sin codificar ni decodificar PNG) como
+        imagen de paleta de 1 píxel por módulo, ampliada por vecino más cercano.
+
+        Args:
+            matrix: Matriz de módulos (secuencia de filas, 1 = oscuro)
+            scale: Escala del QR (tamaño de cada módulo en píxeles, entero)
+            dark_rgb: Color oscuro (tupla RGB)
+            light_rgb: Color claro (tupla RGB)
+            border: Zona de silencio en módulos
+
+        Returns:
+            PIL.Image: Imagen en modo 'P' (índice 0 = claro, 1 = oscuro)
+        """
+        modules = np.pad(self._matrix_to_array(matrix), border)
+        size = modules.shape[0]
+
+        image = Image.frombuffer('P', (size, size), np.ascontiguousarray(modules), 'raw', 'P', 0, 1)
+        image.putpalette(self.blend_palette(dark_rgb, light_rgb, 2))
+
+        # Factor entero: cada módulo se replica exactamente scale x scale píxeles
+        return image.resize((size * scale, size * scale), Image.NEAREST)
+
+    def module_geometry(self, pattern_style, size=1.0):
+        """
+        Describe las formas de un módulo en coordenadas continuas (para salida vectorial)
+
+        Args:
+            pattern_style: Estilo del patrón
+            size: Lado del módulo en las unidades de destino
+
+        Returns:
+            list: Formas [(tipo, x0, y0, x1, y1), ...] relativas al origen del módulo
+        """
+        kind, intervals = self._axis_intervals(pattern_style, size, 0)
+        return [(kind, x0, y0, x1, y1)
+                for y0, y1 in intervals
+                for x0, x1 in intervals]
+
+    def get_sprite(self, pattern_style, scale, dark_rgb, light_rgb, antialias=False, variant=(None, None)):
+        """
+        Obtener el sprite de un módulo desde el atlas, renderizándolo si no existe
+
+        Args:
+            pattern_style: Estilo del patrón
+            scale: Escala del QR
+            dark_rgb: Color oscuro (tupla RGB)
+            light_rgb: Color claro (tupla RGB)
+            antialias: Si True, el sprite tiene bordes suavizados
+            variant: Límites relativos (filas, columnas) para la versión sin antialias
+
+        Returns:
+            ModuleSprite: Baldosa de índices y paleta
+        """
+        key = (pattern_style, scale, tuple(dark_rgb), tuple(light_rgb), antialias, variant)
+
+        def build():
+            if antialias:
+                tile = self._render_antialiased_tile(pattern_style, scale)
+                palette = self.blend_palette(dark_rgb, light_rgb, 256)
+            else:
+                row_key, col_key = variant
+                tile = self._render_tile(pattern_style, row_key, col_key, scale)
+                palette = self.blend_palette(dark_rgb, light_rgb, 2)
+            tile.setflags(write=False)
+            return ModuleSprite(tile, palette)
+
+        return sprite_atlas.get_or_create(key, build)
+
+    def _matrix_to_array(self, matrix):
+        """
+        Convierte la matriz de segno (filas de bytearray) en un arreglo de 0 y 1
+
+        Args:
+            matrix: Matriz de módulos
+
+        Returns:
+            numpy.ndarray: Arreglo uint8 (n, n)
+        """
+        size = len(matrix)
+        data = np.frombuffer(b''.join(bytes(row) for row in matrix), dtype=np.uint8)
+        return (data.reshape(size, size) != 0).view(np.uint8)
+
+    def _axis_intervals(self, pattern_style, scale, coords):
+        """
+        Calcula los intervalos de cada forma sobre un eje
+
+        Usa exactamente las mismas expresiones que el dibujo módulo a módulo
+        para que el truncamiento de coordenadas sea idéntico.
+
+        Args:
+            pattern_style: Estilo del patrón
+            scale: Escala del QR
+            coords: Coordenadas del origen de cada módulo
+
+        Returns:
+            tuple: (tipo de forma, lista de pares (inicio, fin) en coordenadas absolutas)
+        """
+        x = coords
+
+        if pattern_style == 'circles':
+            margin = scale * 0.1
+            return 'ellipse', [(x + margin, x + scale - margin)]
+
+        elif pattern_style == 'flowers':
+            # 4 círculos pequeños: producto de 2 centros por eje
+            quarter = scale / 4
+            radius = scale / 6
+            centers = [x + quarter, x + 3*quarter]
+            return 'ellipse', [(c - radius, c + radius) for c in centers]
+
+        elif pattern_style == 'hearts':
+            # Versión simplificada: círculo
+            margin = scale * 0.15
+            return 'ellipse', [(x + margin, x + scale - margin)]
+
+        elif pattern_style == 'dots':
+            margin = scale * 0.3
+            return 'ellipse', [(x + margin, x + scale - margin)]
+
+        else:  # Default: cuadrados
+            return 'rectangle', [(x, x + scale)]
+
+    def _axis_variants(self, pattern_style, scale, size):
+        """
+        Agrupa las posiciones de un eje según sus límites relativos al módulo
+
+        Args:
+            pattern_style: Estilo del patrón
+            scale: Escala del QR
+            size: Número de módulos por lado
+
+        Returns:
+            tuple: (lista de variantes, índice de variante por posición)
+        """
+        coords = np.arange(size, dtype=np.int64) * scale
+        _, intervals = self._axis_intervals(pattern_style, scale, coords)
+
+        # Truncar como lo hace ImageDraw y expresar relativo al origen del módulo
+        columns = []
+        for start, end in intervals:
+            columns.append(np.trunc(start).astype(np.int64) - coords)
+            columns.append(np.trunc(end).astype(np.int64) - coords)
+        relative = np.stack(columns, axis=1)
+
+        variants, groups = np.unique(relative, axis=0, return_inverse=True)
+        keys = [tuple(int(v) for v in variant) for variant in variants]
+        return keys, groups.reshape(-1)
+
+    def _render_tile(self, pattern_style, row_key, col_key, scale):
+        """
+        Dibuja la baldosa exacta (sin antialias) de un módulo en el origen
+
+        Args:
+            pattern_style: Estilo del patrón
+            row_key: Límites verticales relativos (inicio, fin, inicio, fin, ...)
+            col_key: Límites horizontales relativos
+            scale: Escala del QR
+
+        Returns:
+            numpy.ndarray: Arreglo uint8 de (2 * scale, 2 * scale) con 1 donde hay forma
+        """
+        kind, _ = self._axis_intervals(pattern_style, scale, 0)
+        tile = Image.new('L', (2 * scale, 2 * scale), 0)
+        draw = ImageDraw.Draw(tile)
+
+        for y0, y1 in zip(row_key[0::2], row_key[1::2]):
+            for x0, x1 in zip(col_key[0::2], col_key[1::2]):
+                if kind == 'ellipse':
+                    draw.ellipse([x0, y0, x1, y1], fill=255)
+                else:
+                    draw.rectangle([x0, y0, x1, y1], fill=255)
+
+        return (np.asarray(tile) > 0).view(np.uint8)
+
+    def _render_antialiased_tile(self, pattern_style, scale):
+        """
+        Dibuja la baldosa suavizada de un módulo con sobremuestreo
+
+        Args:
+            pattern_style: Estilo del patrón
+            scale: Escala del QR
+
+        Returns:
+            numpy.ndarray: Arreglo uint8 de (scale, scale) con la cobertura (0-255)
+        """
+        factor = ANTIALIAS_SUPERSAMPLE
+        kind, intervals = self._axis_intervals(pattern_style, scale, 0)
+
+        tile = Image.new('L', (scale * factor, scale * factor), 0)
+        draw = ImageDraw.Draw(tile)
+
+        # Geometría continua [inicio, fin) sin truncar, escalada al sobremuestreo
+        bounds = [(round(start * factor), round(end * factor) - 1) for start, end in intervals]
+        for y0, y1 in bounds:
+            for x0, x1 in bounds:
+                if kind == 'ellipse':
+                    draw.ellipse([x0, y0, x1, y1], fill=255)
+                else:
+                    draw.rectangle([x0, y0, x1, y1], fill=255)
+
+        # Promedio por bloques: cobertura de cada píxel final
+        return np.array(tile.reduce(factor), dtype=np.uint8)
+
+    def blend_palette(self, dark_rgb, light_rgb, levels):
+        """
+        Construye una paleta que interpola del color claro (índice 0) al oscuro
+
+        Args:
+            dark_rgb: Color oscuro (tupla RGB)
+            light_rgb: Color claro (tupla RGB)
+            levels: Número de entradas (2 para colores planos, 256 para antialias)
+
+        Returns:
+            list: Paleta RGB plana [r0, g0, b0, r1, ...]
+        """
+        palette = []
+        for level in range(levels):
+            weight = level / (levels - 1)
+            for light, dark in zip(light_rgb, dark_rgb):
+                palette.append(round(light + (dark - light) * weight))
+        return palette
@@ -0,0 +1,386 @@
+"""
+Exportación de códigos QR a PDF con reportlab
+Dibuja los módulos como vectores: cada forma de tramo se define una sola vez
+como form XObject y se reutiliza en todos los códigos del documento
+"""
+
+from PIL import ImageColor
+from reportlab.lib.pagesizes import A4, LETTER
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas as pdf_canvas
+
+import config
+from core.qr_exporter import QRExporter
+from core.qr_pattern_renderer import QRPatternRenderer
+
+
+# Tamaños de página por nombre (en puntos)
+PAGE_SIZES = {
+    'A4': A4,
+    'Letter': LETTER
+}
+
+
+def hex_to_pdf_color(hex_color):
+    """Convierte '#RRGGBB' en una tupla RGB de 0 a 1 para reportlab"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) / 255 for i in (0, 2, 4))
+
+
+class PDFSymbolDrawer:
+    """
+    Dibuja símbolos QR en un canvas de reportlab
+
+    Los módulos cuadrados se dibujan como un rectángulo por tramo horizontal.
+    Para los patrones avanzados, cada tramo de N módulos es un form XObject
+    (definido una sola vez por patrón y largo) que se coloca con una
+    transformación; los forms no fijan color y heredan el color de relleno.
+    """
+
+    def __init__(self, canvas):
+        """
+        Inicializar el dibujante
+
+        Args:
+            canvas: reportlab.pdfgen.canvas.Canvas
+        """
+        self.canvas = canvas
+        self._forms = set()
+        self._geometry = {}
+
+    def _form_name(self, pattern_style, length):
+        """Define (si hace falta) y retorna el form de un tramo de módulos"""
+        name = f"qr_{pattern_style}_{length}"
+        if name in self._forms:
+            return name
+
+        geometry = self._geometry.get(pattern_style)
+        if geometry is None:
+            geometry = QRPatternRenderer().module_geometry(pattern_style)
+            self._geometry[pattern_style] = geometry
+
+        canvas = self.canvas
+        canvas.beginForm(name, lowerx=0, lowery=0, upperx=length, uppery=1)
+        for offset in range(length):
+            for kind, x0, y0, x1, y1 in geometry:
+                if kind == 'ellipse':
+                    canvas.ellipse(x0 + offset, y0, x1 + offset, y1, stroke=0, fill=1)
+                else:
+                    canvas.rect(x0 + offset, y0, x1 - x0, y1 - y0, stroke=0, fill=1)
+        canvas.endForm()
+
+        self._forms.add(name)
+        return name
+
+    def draw(self, qr, x, y, size, dark_color='#000000', light_color='#FFFFFF',
+             pattern_style='squares', border=None, opaque=False):
+        """
+        Dibujar un símbolo en el canvas
+
+        Args:
+            qr: Símbolo de segno
+            x: Coordenada x de la esquina inferior izquierda (puntos)
+            y: Coordenada y de la esquina inferior izquierda (puntos)
+            size: Lado del código, incluida la zona de silencio (puntos)
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo de los módulos
+            border: Zona de silencio en módulos (None = la de segno)
+            opaque: Pintar el fondo aunque sea blanco (si hay un marco debajo)
+        """
+        canvas = self.canvas
+        matrix = qr.matrix
+        if border is None:
+            border = qr.default_border_size
+        modules = len(matrix) + 2 * border
+        module_size = size / modules
+        squares = pattern_style in ['squares', 'rounded']
+
+        # Definir los forms que falten antes de dibujar (fuera del estado del código)
+        rows = [list(QRExporter.row_runs(row)) for row in matrix]
+        if not squares:
+            for length in sorted({length for runs in rows for _, length in runs}):
+                self._form_name(pattern_style, length)
+
+        canvas.saveState()
+
+        # Fondo (se omite si es blanco y no hay nada debajo: el papel ya lo es)
+        if opaque or light_color.upper().lstrip('#') != 'FFFFFF':
+            canvas.setFillColorRGB(*hex_to_pdf_color(light_color))
+            canvas.rect(x, y, size, size, stroke=0, fill=1)
+
+        # Sistema de coordenadas en módulos, con el origen arriba a la izquierda
+        canvas.translate(x, y + size)
+        canvas.scale(module_size, -module_size)
+        canvas.translate(border, border)
+        canvas.setFillColorRGB(*hex_to_pdf_color(dark_color))
+
+        # En el espacio de módulos todas las coordenadas son enteras: los operadores
+        # se escriben directamente (sin el formateo de floats de reportlab)
+        if squares:
+            # Un rectángulo por tramo y un único relleno para todo el código
+            canvas.addLiteral('\n'.join(
+                f"{start} {row_index} {length} 1 re"
+                for row_index, runs in enumerate(rows)
+                for start, length in runs
+            ) + '\nf')
+        else:
+            # Desplazamientos relativos entre tramos: "cm" + "Do" por tramo
+            current_x = current_y = 0
+            for row_index, runs in enumerate(rows):
+                for start, length in runs:
+                    canvas.addLiteral(f"1 0 0 1 {start - current_x} {row_index - current_y} cm")
+                    canvas.doForm(self._form_name(pattern_style, length))
+                    current_x, current_y = start, row_index
+
+        canvas.restoreState()
+
+
+class PDFFrameDrawer:
+    """
+    Dibuja marcos de QRFrameGenerator como vectores
+
+    Recorre las mismas operaciones de la disposición (FrameLayout) que se usan
+    para la plantilla raster, en un sistema de coordenadas en píxeles con el
+    origen arriba a la izquierda. El texto usa la misma fuente TrueType que el
+    marco raster (incrustada) o Helvetica si no hay ninguna disponible.
+    """
+
+    # Fuente de reserva si la fuente de los marcos no es TrueType
+    FALLBACK_FONT = 'Helvetica-Bold'
+
+    def __init__(self, canvas):
+        """
+        Inicializar el dibujante
+
+        Args:
+            canvas: reportlab.pdfgen.canvas.Canvas
+        """
+        self.canvas = canvas
+        self._font_name = None
+
+    def _resolve_font(self, size):
+        """Registra en reportlab la fuente de los marcos (una sola vez)"""
+        if self._font_name is not None:
+            return self._font_name
+
+        from core.qr_frame_generator import font_registry
+        font_path = getattr(font_registry.get_font(size), 'path', None)
+        self._font_name = self.FALLBACK_FONT
+        if font_path:
+            try:
+                pdfmetrics.registerFont(TTFont('QRFrameFont', font_path))
+                self._font_name = 'QRFrameFont'
+            except Exception:
+                pass
+        return self._font_name
+
+    def _color(self, value, frame_color):
+        """Color de una operación (FRAME_COLOR, nombre o tupla) como RGB de 0 a 1"""
+        from core.qr_frame_generator import FRAME_COLOR
+        if value == FRAME_COLOR:
+            return hex_to_pdf_color(frame_color)
+        if isinstance(value, str):
+            value = ImageColor.getrgb(value)
+        return tuple(channel / 255 for channel in value[:3])
+
+    def _box(self, geometry):
+        """Caja [x0, y0, x1, y1] a partir de la geometría de ImageDraw"""
+        if len(geometry) == 2:
+            (x0, y0), (x1, y1) = geometry
+        else:
+            x0, y0, x1, y1 = geometry
+        # ImageDraw incluye el último píxel: la caja vectorial mide un píxel más
+        return x0, y0, x1 + 1, y1 + 1
+
+    def draw(self, layout, frame_color, height, unit):
+        """
+        Dibujar el adorno de un marco (sin el QR)
+
+        Args:
+            layout: FrameLayout de QRFrameGenerator.get_layout()
+            frame_color: Color del marco (hex)
+            height: Alto de la página (puntos)
+            unit: Puntos por píxel de la disposición
+        """
+        canvas = self.canvas
+        width_px, height_px = layout.size
+
+        canvas.saveState()
+        canvas.translate(0, height)
+        canvas.scale(unit, -unit)
+
+        background = self._color(layout.background, frame_color)
+        if background != (1, 1, 1):
+            canvas.setFillColorRGB(*background)
+            canvas.rect(0, 0, width_px, height_px, stroke=0, fill=1)
+
+        for kind, geometry, options in layout.ops:
+            if kind == 'text':
+                self._draw_text(geometry, options, frame_color)
+                continue
+
+            x0, y0, x1, y1 = self._box(geometry)
+            fill = 'fill' in options
+            stroke = 'outline' in options
+            if fill:
+                canvas.setFillColorRGB(*self._color(options['fill'], frame_color))
+            if stroke:
+                # ImageDraw dibuja el contorno hacia dentro de la caja
+                line_width = options.get('width', 1)
+                canvas.setStrokeColorRGB(*self._color(options['outline'], frame_color))
+                canvas.setLineWidth(line_width)
+                inset = line_width / 2
+                x0, y0, x1, y1 = x0 + inset, y0 + inset, x1 - inset, y1 - inset
+
+            if kind == 'rectangle':
+                canvas.rect(x0, y0, x1 - x0, y1 - y0, stroke=int(stroke), fill=int(fill))
+            elif kind == 'rounded_rectangle':
+                radius = options.get('radius', 0)
+                canvas.roundRect(x0, y0, x1 - x0, y1 - y0, radius, stroke=int(stroke), fill=int(fill))
+            elif kind == 'ellipse':
+                canvas.ellipse(x0, y0, x1, y1, stroke=int(stroke), fill=int(fill))
+
+        canvas.restoreState()
+
+    def _draw_text(self, position, options, frame_color):
+        """Texto de una operación, centrado en el mismo punto que en el marco raster"""
+        from core.qr_frame_generator import font_registry
+
+        canvas = self.canvas
+        text = options['text']
+        size = options['size']
+        font_name = self._resolve_font(size)
+
+        # Mismo centro horizontal que el texto raster; ImageDraw coloca el
+        # borde superior (ascendente) en la posición, la línea base va debajo
+        left, _, right, _ = font_registry.measure(text, size)
+        center_x = position[0] + (left + right) / 2
+        text_width = pdfmetrics.stringWidth(text, font_name, size)
+        pil_font = font_registry.get_font(size)
+        if hasattr(pil_font, 'getmetrics'):
+            ascent = pil_font.getmetrics()[0]
+        else:
+            ascent = pdfmetrics.getAscent(font_name, size)
+        baseline = position[1] + ascent
+
+        canvas.saveState()
+        canvas.setFillColorRGB(*self._color(options.get('fill', 'black'), frame_color))
+        canvas.translate(center_x - text_width / 2, baseline)
+        canvas.scale(1, -1)
+        canvas.setFont(font_name, size)
+        canvas.drawString(0, 0, text)
+        canvas.restoreState()
+
+
+class QRLabelSheetWriter:
+    """
+    Hojas de etiquetas en PDF: N códigos por página en una cuadrícula
+
+    Cada página se cierra (showPage) en cuanto se llena y su contenido se
+    comprime, de modo que solo la página en curso está sin comprimir.
+    """
+
+    def __init__(self, filepath, sheet=None, page_size=None, columns=None, rows=None,
+                 margins_mm=None, gutter_mm=None, border=2, show_labels=False):
+        """
+        Abrir el documento
+
+        Args:
+            filepath: Ruta del PDF
+            sheet: Nombre de la hoja predefinida (config.PDF_LABEL_SHEETS)
+            page_size: 'A4', 'Letter' o tupla (ancho, alto) en puntos
+            columns: Columnas de etiquetas por página
+            rows: Filas de etiquetas por página
+            margins_mm: Márgenes (superior, derecho, inferior, izquierdo) en mm
+            gutter_mm: Separación (horizontal, vertical) entre etiquetas en mm
+            border: Zona de silencio en módulos
+            show_labels: Escribir el identificador de cada código bajo el mismo
+        """
+        preset = config.PDF_LABEL_SHEETS[sheet or config.DEFAULT_PDF_LABEL_SHEET]
+        page_size = page_size or preset['page_size']
+        if isinstance(page_size, str):
+            page_size = PAGE_SIZES[page_size]
+
+        self.page_width, self.page_height = page_size
+        self.columns = columns or preset['columns']
+        self.rows = rows or preset['rows']
+        top, right, bottom, left = [value * mm for value in (margins_mm or preset['margins_mm'])]
+        gutter_x, gutter_y = [value * mm for value in (gutter_mm or preset['gutter_mm'])]
+
+        self.left = left
+        self.top = top
+        self.gutter_x = gutter_x
+        self.gutter_y = gutter_y
+        self.cell_width = (self.page_width - left - right - gutter_x * (self.columns - 1)) / self.columns
+        self.cell_height = (self.page_height - top - bottom - gutter_y * (self.rows - 1)) / self.rows
+        if self.cell_width <= 0 or self.cell_height <= 0:
+            raise ValueError("Los márgenes y la cuadrícula no caben en la página")
+
+        self.border = border
+        self.show_labels = show_labels
+        self.label_height = 10 if show_labels else 0
+
+        self.canvas = pdf_canvas.Canvas(str(filepath), pagesize=page_size, pageCompression=1)
+        self.canvas.setTitle(config.APP_NAME)
+        self.drawer = PDFSymbolDrawer(self.canvas)
+        self.slot = 0
+        self.pages = 0
+        self.codes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def add(self, qr, dark_color='#000000', light_color='#FFFFFF', pattern_style='squares', label=None):
+        """
+        Colocar un código en la siguiente etiqueta libre
+
+        Args:
+            qr: Símbolo de segno
+            dark_color: Color de los módulos oscuros (hex)
+            light_color: Color de fondo (hex)
+            pattern_style: Estilo de los módulos
+            label: Texto bajo el código (solo si show_labels)
+        """
+        per_page = self.columns * self.rows
+        column = self.slot % self.columns
+        row = self.slot // self.columns
+
+        cell_x = self.left + column * (self.cell_width + self.gutter_x)
+        cell_top = self.page_height - self.top - row * (self.cell_height + self.gutter_y)
+
+        # Código cuadrado centrado en la celda (dejando sitio para el texto)
+        size = min(self.cell_width, self.cell_height - self.label_height)
+        x = cell_x + (self.cell_width - size) / 2
+        y = cell_top - (self.cell_height - self.label_height + size) / 2
+
+        self.drawer.draw(qr, x, y, size, dark_color, light_color, pattern_style, self.border)
+
+        if self.show_labels and label:
+            self.canvas.setFont('Helvetica', 7)
+            self.canvas.setFillColorRGB(0, 0, 0)
+            self.canvas.drawCentredString(cell_x + self.cell_width / 2, cell_top - self.cell_height + 2, str(label))
+
+        self.codes += 1
+        self.slot += 1
+        if self.slot == per_page:
+            # Página completa: se cierra y se comprime
+            self.canvas.showPage()
+            self.pages += 1
+            self.slot = 0
+
+    def close(self):
+        """Cerrar la última página y guardar el documento"""
+        if self.canvas is None:
+            return
+        if self.slot:
+            self.canvas.showPage()
+            self.pages += 1
+        self.canvas.save()
+        self.canvas = None
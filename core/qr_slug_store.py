@@ -0,0 +1,347 @@
+"""
+Almacén de QR dinámicos (slug -> destino)
+Cada QR dinámico imprime una URL corta fija ('/r/<slug>'); el destino se
+puede cambiar después sin reimprimir el código.
+"""
+
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+import config
+from core.qr_cache import LRUCache
+
+
+# Alfabeto base62 de los slugs
+SLUG_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+
+# Los identificadores se permutan dentro de 2^40 (~1,1 billones de códigos):
+# 7 caracteres base62 bastan para cualquier identificador
+ID_BITS = 40
+ID_MASK = (1 << ID_BITS) - 1
+SLUG_LENGTH = 7
+
+# Constantes impares de la permutación (multiplicación módulo 2^40 y xorshift)
+_MULTIPLIER_A = 0x9E3779B97
+_MULTIPLIER_B = 0x5DEECE66D
+_INVERSE_A = pow(_MULTIPLIER_A, -1, 1 << ID_BITS)
+_INVERSE_B = pow(_MULTIPLIER_B, -1, 1 << ID_BITS)
+_SHIFT = ID_BITS // 2
+
+# Longitud máxima del destino de una redirección
+MAX_TARGET_LENGTH = 2048
+
+
+def encode_slug(qr_id):
+    """
+    Slug de un identificador
+
+    La permutación es biyectiva: dos identificadores distintos nunca
+    comparten slug. Los identificadores consecutivos quedan desordenados,
+    pero no son secretos: las constantes son públicas y decode_slug()
+    invierte la permutación, así que con el código fuente se pueden
+    enumerar todos los slugs en orden.
+
+    Args:
+        qr_id: Identificador entero (0 <= id < 2^40)
+
+    Returns:
+        str: Slug base62 de 7 caracteres
+    """
+    if not 0 <= qr_id <= ID_MASK:
+        raise ValueError(f"Identificador fuera de rango: {qr_id}")
+
+    value = (qr_id * _MULTIPLIER_A) & ID_MASK
+    value ^= value >> _SHIFT
+    value = (value * _MULTIPLIER_B) & ID_MASK
+
+    chars = []
+    for _ in range(SLUG_LENGTH):
+        value, digit = divmod(value, 62)
+        chars.append(SLUG_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def decode_slug(slug):
+    """
+    Identificador de un slug (inversa de encode_slug)
+
+    Args:
+        slug: Slug base62
+
+    Returns:
+        int: Identificador, o None si el slug no es válido
+    """
+    if not isinstance(slug, str) or len(slug) != SLUG_LENGTH:
+        return None
+
+    value = 0
+    for char in slug:
+        digit = SLUG_ALPHABET.find(char)
+        if digit < 0:
+            return None
+        value = value * 62 + digit
+    if value > ID_MASK:
+        return None
+
+    value = (value * _INVERSE_B) & ID_MASK
+    value ^= value >> _SHIFT
+    return (value * _INVERSE_A) & ID_MASK
+
+
+def redirect_url(slug):
+    """URL que se codifica en el QR dinámico"""
+    path = config.API_ENDPOINTS['redirect_qr'].format(slug=slug)
+    return config.REDIRECT_BASE_URL.rstrip('/') + path
+
+
+class QRSlugStore:
+    """
+    Almacén SQLite (modo WAL) de QR dinámicos
+
+    El slug se deriva del identificador (clave primaria), así que resolverlo
+    es una búsqueda por clave primaria sin índice adicional; los registros
+    más usados se sirven desde una caché LRU en memoria. Los identificadores
+    no se reutilizan tras borrar, para que un código impreso nunca apunte a
+    un destino ajeno.
+    """
+
+    def __init__(self, db_path=None, cache_entries=100000):
+        """
+        Abrir (o crear) el almacén
+
+        Args:
+            db_path: Ruta de la base de datos (None = config.SLUG_DB)
+            cache_entries: Registros mantenidos en memoria
+        """
+        self.db_path = Path(db_path or config.SLUG_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self.db_path))
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        self._db.execute('''
+            CREATE TABLE IF NOT EXISTS dynamic_qr (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                qr_type TEXT NOT NULL,
+                target TEXT NOT NULL,
+                title TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        ''')
+        self._db.commit()
+        self._cache = LRUCache(max_entries=cache_entries, name='slugs')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        """Cerrar la base de datos"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _validate(self, qr_type, target):
+        """Comprueba el tipo y el destino de un QR dinámico"""
+        if qr_type not in config.QR_TYPES:
+            raise ValueError(f"Tipo de QR desconocido: {qr_type}")
+        if not isinstance(target, str) or not target.strip():
+            raise ValueError("El destino no puede estar vacío")
+        if len(target) > MAX_TARGET_LENGTH:
+            raise ValueError(f"El destino supera {MAX_TARGET_LENGTH} caracteres")
+
+    def _record(self, row):
+        """Registro público a partir de una fila de la tabla"""
+        qr_id, qr_type, target, title, created_at, updated_at = row
+        slug = encode_slug(qr_id)
+        return {
+            'slug': slug,
+            'type': qr_type,
+            'target': target,
+            'title': title,
+            'url': redirect_url(slug),
+            'created_at': datetime.fromtimestamp(created_at).isoformat(timespec='seconds'),
+            'updated_at': datetime.fromtimestamp(updated_at).isoformat(timespec='seconds')
+        }
+
+    def create(self, target, qr_type='url', title=None):
+        """
+        Crear un QR dinámico
+
+        Args:
+            target: Destino de la redirección
+            qr_type: Tipo de QR (clave de config.QR_TYPES)
+            title: Nombre descriptivo opcional
+
+        Returns:
+            dict: Registro con 'slug' y 'url' (lo que se codifica en el QR)
+
+        Raises:
+            ValueError: Si el tipo o el destino no son válidos
+        """
+        self._validate(qr_type, target)
+        now = time.time()
+        with self._db:
+            cursor = self._db.execute(
+                'INSERT INTO dynamic_qr (qr_type, target, title, created_at, updated_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (qr_type, target, title, now, now)
+            )
+        record = self._record((cursor.lastrowid, qr_type, target, title, now, now))
+        self._cache.put(record['slug'], record)
+        return record
+
+    def create_many(self, targets, qr_type='url'):
+        """
+        Crear muchos QR dinámicos en una sola transacción (importaciones)
+
+        Args:
+            targets: Iterable de destinos
+            qr_type: Tipo de QR común
+
+        Returns:
+            int: Número de códigos creados
+        """
+        now = time.time()
+
+        def rows():
+            for target in targets:
+                self._validate(qr_type, target)
+                yield (qr_type, target, now, now)
+
+        with self._db:
+            cursor = self._db.executemany(
+                'INSERT INTO dynamic_qr (qr_type, target, created_at, updated_at) VALUES (?, ?, ?, ?)',
+                rows()
+            )
+        return cursor.rowcount
+
+    def get(self, slug):
+        """
+        Obtener el registro de un slug
+
+        Args:
+            slug: Slug del QR
+
+        Returns:
+            dict: Registro, o None si no existe
+        """
+        record = self._cache.get(slug)
+        if record is not None:
+            return record
+
+        qr_id = decode_slug(slug)
+        if qr_id is None:
+            return None
+        row = self._db.execute(
+            'SELECT id, qr_type, target, title, created_at, updated_at FROM dynamic_qr WHERE id = ?',
+            (qr_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        record = self._record(row)
+        self._cache.put(slug, record)
+        return record
+
+    def resolve(self, slug):
+        """
+        Destino de la redirección de un slug
+
+        Returns:
+            str: Destino, o None si el slug no existe
+        """
+        record = self.get(slug)
+        return record['target'] if record else None
+
+    def update(self, slug, target=None, title=None):
+        """
+        Cambiar el destino (o el nombre) de un QR dinámico
+
+        Args:
+            slug: Slug del QR
+            target: Nuevo destino (None = sin cambios)
+            title: Nuevo nombre (None = sin cambios)
+
+        Returns:
+            dict: Registro actualizado, o None si no existe
+
+        Raises:
+            ValueError: Si el nuevo destino no es válido
+        """
+        record = self.get(slug)
+        if record is None:
+            return None
+        if target is not None:
+            self._validate(record['type'], target)
+
+        qr_id = decode_slug(slug)
+        with self._db:
+            self._db.execute(
+                'UPDATE dynamic_qr SET target = COALESCE(?, target), title = COALESCE(?, title), '
+                'updated_at = ? WHERE id = ?',
+                (target, title, time.time(), qr_id)
+            )
+        # Releer la fila: la caché nunca guarda un destino antiguo
+        self._cache.discard(slug)
+        return self.get(slug)
+
+    def delete(self, slug):
+        """
+        Borrar un QR dinámico (su slug no se vuelve a asignar)
+
+        Returns:
+            bool: True si existía
+        """
+        qr_id = decode_slug(slug)
+        if qr_id is None:
+            return False
+        with self._db:
+            cursor = self._db.execute('DELETE FROM dynamic_qr WHERE id = ?', (qr_id,))
+        self._cache.discard(slug)
+        return cursor.rowcount > 0
+
+    def list(self, limit=50, after=None):
+        """
+        Listar QR dinámicos, del más reciente al más antiguo
+
+        La paginación es por cursor (slug del último elemento de la página
+        anterior): cada página cuesta lo mismo sin importar su posición.
+
+        Args:
+            limit: Elementos por página
+            after: Slug del último elemento de la página anterior (None = primera)
+
+        Returns:
+            dict: {'items': [...], 'next': slug del cursor siguiente o None}
+        """
+        try:
+            limit = max(1, min(int(limit), 1000))
+        except (TypeError, ValueError):
+            raise ValueError(f"Límite inválido: {limit}")
+        query = 'SELECT id, qr_type, target, title, created_at, updated_at FROM dynamic_qr'
+        params = ()
+        if after is not None:
+            after_id = decode_slug(after)
+            if after_id is None:
+                raise ValueError(f"Cursor inválido: {after}")
+            query += ' WHERE id < ?'
+            params = (after_id,)
+        query += ' ORDER BY id DESC LIMIT ?'
+
+        items = [self._record(row) for row in self._db.execute(query, params + (limit,))]
+        next_cursor = items[-1]['slug'] if len(items) == limit else None
+        return {'items': items, 'next': next_cursor}
+
+    def count(self):
+        """Número de QR dinámicos almacenados"""
+        return self._db.execute('SELECT COUNT(*) FROM dynamic_qr').fetchone()[0]
+
+    def cache_stats(self):
+        """Estadísticas de la caché en memoria"""
+        return self._cache.stats()
@@ -8,8 +8,8 @@ Versión: 1.0.0
 
 import sys
 import signal
-from PyQt6.QtWidgets import QApplication
-from PyQt6.QtCore import Qt, QTimer
+import argparse
+import importlib
 
 # Importar configuración
 import config
@@ -17,20 +17,89 @@ import config
 
 def signal_handler(sig, frame):
     """Maneja la señal de interrupción (Ctrl+C)"""
+    from PyQt6.QtWidgets import QApplication
+    
     print("\n\n👋 Aplicación cerrada por el usuario")
     QApplication.quit()
     sys.exit(0)
 
 
-def main():
+# Subcomandos: nombre -> (módulo, función que registra sus opciones, función que lo ejecuta, ayuda)
+COMMANDS = {
+    'batch': ('utils.batch_cli', 'add_batch_arguments', 'run_batch',
+              'Generar códigos QR desde un archivo CSV o JSONL (sin interfaz)'),
+    'serve': ('api.server', 'add_serve_arguments', 'run_server',
+              'Iniciar el servicio HTTP local de generación'),
+}
+
+
+def build_parser(command=None):
     """
-    Función principal que inicia la aplicación
+    Construye el parser de la línea de comandos
+    
+    Sin subcomando se abre la interfaz gráfica; los subcomandos se
+    ejecutan sin importar Qt.
+    
+    Solo se importa el módulo del subcomando pedido, para registrar sus
+    opciones: la interfaz arranca sin cargar asyncio, multiprocessing ni
+    el resto de dependencias del servidor y del modo por lotes.
+    
+    Args:
+        command: Subcomando cuyas opciones se registran (None = ninguno)
+    """
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description=f"{config.APP_NAME} v{config.APP_VERSION}"
+    )
+    parser.add_argument(
+        '--profile-startup', nargs='?', const='gui', metavar='MODO',
+        help="Medir el arranque en frío (gui, batch o serve) y guardar un informe en storage/profiles"
+    )
+    subparsers = parser.add_subparsers(dest='command')
+    
+    for name, (module, add_arguments, _, help_text) in COMMANDS.items():
+        # Sin sus opciones, '-h' del subcomando mostraría una ayuda vacía
+        subparser = subparsers.add_parser(name, help=help_text, add_help=name == command)
+        if name == command:
+            getattr(importlib.import_module(module), add_arguments)(subparser)
+    
+    return parser
+
+
+def main(argv=None):
     """
+    Función principal: despacha el subcomando o inicia la interfaz
+    
+    Args:
+        argv: Argumentos de la línea de comandos (None = sys.argv)
+    """
+    # Primera pasada sin opciones de subcomandos: solo averigua cuál se pidió
+    command = build_parser().parse_known_args(argv)[0].command
+    args = build_parser(command).parse_args(argv)
+    
+    if args.profile_startup:
+        from utils.startup_profiler import profile_startup
+        return profile_startup(args.profile_startup)
+    
+    if args.command is not None:
+        module, _, run, _ = COMMANDS[args.command]
+        return getattr(importlib.import_module(module), run)(args)
+    
+    return run_gui()
+
+
+def run_gui():
+    """
+    Inicia la aplicación gráfica
+    """
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import Qt, QTimer
+    
     # Configurar manejo de Ctrl+C
     signal.signal(signal.SIGINT, signal_handler)
     
-    # Crear la aplicación Qt
-    app = QApplication(sys.argv)
+    # Crear la aplicación Qt (sin los argumentos de subcomandos)
+    app = QApplication(sys.argv[:1])
     
     # Configurar propiedades de la aplicación
     app.setApplicationName(config.APP_NAME)
@@ -0,0 +1,65 @@
+"""
+Conversión de imágenes de Pillow a QImage en PreviewWidget
+Comprueba que pil_to_qimage conserva los píxeles de imágenes reservadas de
+cualquier forma, incluidas las que comparten un búfer externo (frombuffer,
+fromarray), como las que devuelve QRPatternRenderer.render.
+
+Uso:
+    python -m pytest tests/test_preview_widget.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Sin pantalla: plataforma Qt sin ventanas
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+pytest.importorskip('PyQt6.QtWidgets')
+
+import numpy as np
+import segno
+from PIL import Image
+from PyQt6.QtWidgets import QApplication
+
+from core.qr_pattern_renderer import QRPatternRenderer
+from ui.preview_widget import PreviewWidget
+
+
+@pytest.fixture(scope='module')
+def widget():
+    """Widget de preview (con la QApplication que necesita)"""
+    app = QApplication.instance() or QApplication([])
+    yield PreviewWidget()
+    del app
+
+
+def images():
+    """Imágenes de cada modo admitido, varias sobre búferes de numpy"""
+    qr = segno.make("https://www.example.com", error='Q')
+    rgb = np.zeros((30, 31, 3), dtype=np.uint8)
+    rgb[..., 0], rgb[..., 1], rgb[..., 2] = 10, 20, 30
+    return [
+        QRPatternRenderer().render(qr.matrix, 7, (18, 52, 86), (250, 240, 230), 'circles'),
+        Image.fromarray(rgb),
+        Image.fromarray(np.arange(45, dtype=np.uint8).reshape(5, 9)),
+        Image.new('1', (13, 5), 1),
+        Image.new('RGBA', (3, 3), (1, 2, 3, 4))
+    ]
+
+
+@pytest.mark.parametrize('index', range(len(images())))
+def test_pil_to_qimage_keeps_pixels(widget, index):
+    pil_image = images()[index]
+    qimage = widget.pil_to_qimage(pil_image)
+    del pil_image  # El QImage no debe depender de la imagen original
+
+    expected = images()[index].convert('RGBA')
+    assert (qimage.width(), qimage.height()) == expected.size
+    for x, y in [(0, 0), (1, 1), (expected.width - 1, expected.height - 1), (expected.width // 2, 2)]:
+        assert qimage.pixelColor(x, y).getRgb() == expected.getpixel((x, y))
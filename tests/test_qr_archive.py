@@ -0,0 +1,51 @@
+"""
+Archivos ZIP/TAR de exportación (core.qr_archive)
+Comprueba que las entradas conservan los subdirectorios pedidos, que los
+nombres repetidos reciben un sufijo en su mismo directorio y que el
+índice permite leer cada entrada.
+
+Uso:
+    python -m pytest tests/test_qr_archive.py
+"""
+
+import sys
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.qr_archive import QRArchiveWriter, load_index, read_entry
+
+
+def archive_names(filepath):
+    """Nombres de las entradas según el propio ZIP/TAR"""
+    if filepath.suffix == '.zip':
+        with zipfile.ZipFile(filepath) as archive:
+            return archive.namelist()
+    with tarfile.open(filepath) as archive:
+        return archive.getnames()
+
+
+@pytest.mark.parametrize('extension', ['.zip', '.tar'])
+def test_entry_names_keep_directories(tmp_path, extension):
+    filepath = tmp_path / f"salida{extension}"
+    requested = ['a/x.png', 'b/x.png', 'a/x.png', 'x.svg', '/abs/../y.png', 'c\\z.png']
+
+    with QRArchiveWriter(filepath) as archive:
+        names = [archive.add(name, name.encode('utf-8') * 10) for name in requested]
+
+    assert names == ['a/x.png', 'b/x.png', 'a/x_2.png', 'x.svg', 'abs/y.png', 'c/z.png']
+    assert archive_names(filepath) == names
+    assert list(load_index(filepath)['entries']) == names
+    for name, original in zip(names, requested):
+        assert read_entry(filepath, name) == original.encode('utf-8') * 10
+
+
+def test_empty_entry_name_is_rejected(tmp_path):
+    with QRArchiveWriter(tmp_path / 'salida.zip') as archive:
+        with pytest.raises(ValueError):
+            archive.add('../', b'datos')
@@ -0,0 +1,89 @@
+"""
+Generación por lotes (core.qr_batch.generate_many)
+Comprueba que los errores se reportan por elemento y que un proceso que
+muere a mitad del lote no interrumpe el resto: sus grupos se reportan
+como fallidos y los demás se generan.
+
+Uso:
+    python -m pytest tests/test_qr_batch.py
+"""
+
+import multiprocessing
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core import qr_batch
+from core.qr_batch import generate_many
+
+
+# Elemento que termina el proceso que lo genera
+CRASH = "crash"
+
+
+@pytest.fixture
+def crashing_worker(monkeypatch):
+    """render_item que mata el proceso con CRASH (heredado por los procesos con fork)"""
+    if multiprocessing.get_start_method() != 'fork':
+        pytest.skip("Los procesos solo heredan el parche con el método 'fork'")
+
+    render_item = qr_batch.render_item
+
+    def crash_on_marker(item, style=None, encode=None):
+        if item == CRASH:
+            os._exit(1)
+        return render_item(item, style, encode)
+
+    monkeypatch.setattr(qr_batch, 'render_item', crash_on_marker)
+
+
+@pytest.mark.parametrize('ordered', [True, False])
+def test_worker_death_fails_only_in_flight_chunks(crashing_worker, ordered):
+    items = [f"https://www.example.com/{index}" for index in range(40)]
+    items[10] = CRASH
+    chunk_size = 2
+
+    results = list(generate_many(items, workers=2, ordered=ordered, encode='PNG', chunk_size=chunk_size))
+
+    # Todos los elementos tienen resultado, aunque el pool se rompiera
+    assert sorted(result.index for result in results) == list(range(len(items)))
+    if ordered:
+        assert [result.index for result in results] == list(range(len(items)))
+
+    by_index = {result.index: result for result in results}
+    assert by_index[10].image is None
+    assert by_index[10].error.startswith('BrokenProcessPool')
+
+    # Los grupos enviados después de la caída se generan en un pool nuevo
+    in_flight = 2 * 2 * chunk_size
+    for index in range(10 + in_flight, len(items)):
+        assert by_index[index].error is None
+        assert by_index[index].image.startswith(b'\x89PNG')
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_invalid_items_are_reported_per_item(workers):
+    items = [
+        "https://www.example.com/a",
+        {'content': ""},
+        {'content': "https://www.example.com/b", 'size': 3},
+        "x" * 5000,
+        {'content': "https://www.example.com/c", 'pattern_style': 'circles'}
+    ]
+
+    results = list(generate_many(items, workers=workers, encode='PNG', chunk_size=2))
+
+    assert [result.index for result in results] == list(range(len(items)))
+    assert [result.item for result in results] == items
+    errors = [result.error for result in results]
+    assert errors[0] is None and errors[4] is None
+    assert errors[1] == "ValueError: El elemento no tiene contenido"
+    assert errors[2] == "ValueError: Parámetros desconocidos: size"
+    assert errors[3].startswith('DataOverflowError')
+    assert all(result.image is None for result in results if result.error)
+    assert all(result.image.startswith(b'\x89PNG') for result in results if not result.error)
@@ -0,0 +1,83 @@
+"""
+Caché en disco de salidas (core.qr_disk_cache)
+Comprueba que la clave incluye los ajustes globales que cambian la salida
+(resolución de los PDF, fuente y texto de los marcos) y que el exportador
+no sirve una salida obsoleta al cambiarlos.
+
+Uso:
+    python -m pytest tests/test_qr_disk_cache.py
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from core.qr_disk_cache import QRDiskCache, make_key
+from core.qr_exporter import QRExporter
+from core.qr_frame_generator import font_registry
+
+
+CONTENT = "https://www.example.com"
+
+
+def media_box(filepath):
+    """Tamaño de la página (/MediaBox) de un PDF de una página"""
+    match = re.search(rb'/MediaBox \[\s*([\d.\s]+)\]', filepath.read_bytes())
+    return [float(value) for value in match.group(1).split()]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Caché vacía en un directorio temporal"""
+    disk_cache = QRDiskCache(tmp_path / 'cache')
+    yield disk_cache
+    disk_cache.close()
+
+
+def test_key_depends_on_render_settings(monkeypatch):
+    key = make_key('PDF', CONTENT, 'Q', frame_style='scan_me_top')
+    assert make_key('PDF', CONTENT, 'Q', frame_style='scan_me_top') == key
+
+    monkeypatch.setattr(config, 'EXPORT_DPI', config.EXPORT_DPI * 2)
+    dpi_key = make_key('PDF', CONTENT, 'Q', frame_style='scan_me_top')
+    assert dpi_key != key
+
+    monkeypatch.setattr(config, 'DEFAULT_FRAME_CAPTION', "ESCANEAR")
+    caption_key = make_key('PDF', CONTENT, 'Q', frame_style='scan_me_top')
+    assert caption_key != dpi_key
+
+    monkeypatch.setattr(font_registry, 'source', lambda: '/otra/fuente.ttf')
+    assert make_key('PDF', CONTENT, 'Q', frame_style='scan_me_top') != caption_key
+
+
+def test_round_trip(cache, tmp_path):
+    key = make_key('PNG', CONTENT)
+    assert cache.get(key, '.png') is None
+
+    cache.put(key, '.png', b'datos')
+    assert cache.get(key, '.png') == b'datos'
+    assert cache.copy_to(key, '.png', tmp_path / 'copia.png')
+    assert (tmp_path / 'copia.png').read_bytes() == b'datos'
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_exporter_rerenders_after_dpi_change(cache, tmp_path, monkeypatch):
+    exporter = QRExporter(disk_cache=cache)
+    first = tmp_path / 'first.pdf'
+    assert exporter.export_pdf(CONTENT, first)
+    assert exporter.export_pdf(CONTENT, tmp_path / 'again.pdf')
+    assert cache.hits == 1
+
+    monkeypatch.setattr(config, 'EXPORT_DPI', config.EXPORT_DPI * 2)
+    second = tmp_path / 'second.pdf'
+    assert exporter.export_pdf(CONTENT, second)
+    assert cache.hits == 1
+
+    # Página de la mitad de tamaño: el PDF nuevo no es el de la caché
+    assert media_box(second) == [value / 2 for value in media_box(first)]
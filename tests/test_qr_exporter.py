@@ -0,0 +1,69 @@
+"""
+Exportaciones de QRExporter
+Comprueba que el SVG con marco incluye el adorno del marco (rectángulos,
+elipses y leyenda) con la misma disposición que el PNG.
+
+Uso:
+    python -m pytest tests/test_qr_exporter.py
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.qr_exporter import QRExporter
+from core.qr_generator import QRGenerator
+
+
+CONTENT = "https://www.example.com"
+FRAME_COLOR = '#123456'
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def export_svg(tmp_path, pattern_style, frame_style, caption_text=None):
+    """Exportar un SVG sin caché y retornar su elemento raíz"""
+    filepath = tmp_path / 'qr.svg'
+    assert QRExporter().export_svg(CONTENT, filepath, scale=10, dark_color=FRAME_COLOR,
+                                   pattern_style=pattern_style, frame_style=frame_style,
+                                   caption_text=caption_text)
+    return ET.parse(filepath).getroot()
+
+
+def frame_elements(root):
+    """Elementos dibujados fuera del cuerpo del QR (hijos directos del documento)"""
+    return [element for element in root if element.tag != f'{SVG}defs' and element.tag != f'{SVG}g']
+
+
+@pytest.mark.parametrize('pattern_style', ['squares', 'circles'])
+@pytest.mark.parametrize('frame_style', ['scan_me_bottom', 'camera_icon', 'elegant'])
+def test_framed_svg_contains_frame(tmp_path, pattern_style, frame_style):
+    root = export_svg(tmp_path, pattern_style, frame_style, caption_text="HOLA")
+    elements = frame_elements(root)
+
+    # Fondo del marco más al menos un adorno del color del marco
+    assert len(elements) >= 2
+    colored = [element for element in elements[1:]
+               if FRAME_COLOR in (element.get('fill'), element.get('stroke'))]
+    assert colored, "El SVG no contiene el adorno del marco"
+
+    texts = [element.text for element in elements if element.tag == f'{SVG}text']
+    if frame_style == 'elegant':
+        assert texts == []
+    else:
+        assert texts == ["HOLA"]
+
+
+def test_framed_svg_matches_png_size(tmp_path):
+    root = export_svg(tmp_path, 'squares', 'scan_me_top')
+    png = QRGenerator('Q').generate(CONTENT, scale=10, dark_color=FRAME_COLOR, frame_style='scan_me_top')
+    assert (int(root.get('width')), int(root.get('height'))) == png.size
+
+
+def test_unframed_svg_has_no_frame(tmp_path):
+    root = export_svg(tmp_path, 'circles', 'none')
+    assert frame_elements(root) == []
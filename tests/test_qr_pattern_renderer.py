@@ -0,0 +1,68 @@
+"""
+Rasterizador de patrones (core.qr_pattern_renderer.QRPatternRenderer)
+Comprueba que produce exactamente los mismos píxeles que el dibujo
+original de cada estilo de patrón: módulo a módulo con ImageDraw para los
+patrones avanzados y el PNG de segno para los cuadrados.
+
+Uso:
+    python -m pytest tests/test_qr_pattern_renderer.py
+"""
+
+import sys
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+import segno
+from PIL import Image
+
+from benchmarks.bench_custom_pattern import legacy_custom_pattern
+from core.qr_generator import QRGenerator
+from core.qr_pattern_renderer import QRPatternRenderer
+
+
+DARK = (18, 52, 86)
+LIGHT = (250, 240, 230)
+
+# Escalas pequeñas (truncamiento de coordenadas) y las de exportación
+SCALES = list(range(1, 13)) + [15, 20, 25, 30]
+
+
+# Contenido de una versión baja y otra alta
+CONTENTS = ["https://www.example.com", "https://www.example.com/" + "x" * 200]
+
+
+def legacy_squares(qr, scale, dark_rgb, light_rgb):
+    """Dibujo original de 'squares' y 'rounded': PNG de segno decodificado"""
+    buffer = BytesIO()
+    qr.save(buffer, kind='png', scale=scale, dark=dark_rgb, light=light_rgb)
+    buffer.seek(0)
+    return Image.open(buffer)
+
+
+@pytest.mark.parametrize('content', CONTENTS)
+@pytest.mark.parametrize('pattern_style', ['circles', 'flowers', 'hearts', 'dots'])
+def test_pattern_matches_legacy_drawing(pattern_style, content):
+    qr = segno.make(content, error='Q', boost_error=False)
+    renderer = QRPatternRenderer()
+    for scale in SCALES:
+        expected = np.asarray(legacy_custom_pattern(qr, scale, DARK, LIGHT, pattern_style))
+        actual = np.asarray(renderer.render(qr.matrix, scale, DARK, LIGHT, pattern_style).convert('RGB'))
+        assert np.array_equal(expected, actual), f"Diferencia con escala {scale}"
+
+
+@pytest.mark.parametrize('content', CONTENTS)
+@pytest.mark.parametrize('pattern_style', ['squares', 'rounded'])
+def test_squares_match_segno_png(pattern_style, content):
+    qr = segno.make(content, error='Q', boost_error=False)
+    generator = QRGenerator('Q')
+    for scale in SCALES:
+        expected = np.asarray(legacy_squares(qr, scale, DARK, LIGHT).convert('RGB'))
+        image = generator.generate(content, scale=scale, dark_color='#123456', light_color='#FAF0E6',
+                                   pattern_style=pattern_style)
+        assert np.array_equal(expected, np.asarray(image.convert('RGB'))), f"Diferencia con escala {scale}"
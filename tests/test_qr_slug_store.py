@@ -0,0 +1,81 @@
+"""
+Almacén de QR dinámicos (core.qr_slug_store.QRSlugStore)
+Comprueba crear, resolver, actualizar y borrar slugs sobre una base de
+datos temporal, incluida la caché en memoria.
+
+Uso:
+    python -m pytest tests/test_qr_slug_store.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.qr_slug_store import QRSlugStore, decode_slug, encode_slug, redirect_url
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Almacén vacío en un directorio temporal"""
+    with QRSlugStore(tmp_path / 'slugs.db') as slug_store:
+        yield slug_store
+
+
+def test_slug_round_trip():
+    for qr_id in [1, 2, 61, 62, 1000, 10 ** 9]:
+        assert decode_slug(encode_slug(qr_id)) == qr_id
+
+
+def test_create_and_resolve(store):
+    record = store.create("https://www.example.com", title="Ejemplo")
+
+    assert record['url'] == redirect_url(record['slug'])
+    assert record['type'] == 'url'
+    assert record['title'] == "Ejemplo"
+    assert store.resolve(record['slug']) == "https://www.example.com"
+    assert store.count() == 1
+
+
+def test_resolve_after_reopening(tmp_path):
+    with QRSlugStore(tmp_path / 'slugs.db') as store:
+        slug = store.create("https://www.example.com")['slug']
+    with QRSlugStore(tmp_path / 'slugs.db') as store:
+        assert store.resolve(slug) == "https://www.example.com"
+
+
+def test_update_changes_target(store):
+    slug = store.create("https://www.example.com/old")['slug']
+    assert store.resolve(slug) == "https://www.example.com/old"  # En la caché
+
+    record = store.update(slug, target="https://www.example.com/new")
+
+    assert record['target'] == "https://www.example.com/new"
+    assert store.resolve(slug) == "https://www.example.com/new"
+    assert store.update(slug, title="Nuevo")['target'] == "https://www.example.com/new"
+    with pytest.raises(ValueError):
+        store.update(slug, target="   ")
+
+
+def test_delete_does_not_reuse_slug(store):
+    slug = store.create("https://www.example.com/a")['slug']
+    assert store.resolve(slug) is not None
+
+    assert store.delete(slug) is True
+    assert store.resolve(slug) is None
+    assert store.update(slug, target="https://www.example.com/b") is None
+    assert store.delete(slug) is False
+
+    # El siguiente código recibe un slug nuevo
+    assert store.create("https://www.example.com/c")['slug'] != slug
+
+
+def test_invalid_records(store):
+    with pytest.raises(ValueError):
+        store.create("")
+    with pytest.raises(ValueError):
+        store.create("https://www.example.com", qr_type='desconocido')
+    assert store.resolve("no-existe") is None
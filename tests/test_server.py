@@ -0,0 +1,54 @@
+"""
+Servicio HTTP local (api.server.QRServer)
+Envía peticiones a create_qr a través de dispatch(), con el pool de
+procesos y bases de datos temporales, sin cliente HTTP.
+
+Uso:
+    python -m pytest tests/test_server.py
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import config
+from api.server import QRServer, Request
+
+
+def create_qr(tmp_path, body):
+    """Respuesta de create_qr y número de QR dinámicos creados"""
+    async def run():
+        server = QRServer('127.0.0.1', 0, workers=1,
+                          slug_db=tmp_path / 'slugs.db', history_db=tmp_path / 'history.db')
+        await server.start()
+        try:
+            request = Request('POST', config.API_ENDPOINTS['create_qr'], {}, {},
+                              json.dumps(body).encode('utf-8'))
+            response = await server.dispatch(request)
+            return response, await server.store_call(server.slugs.count)
+        finally:
+            await server.close()
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize('dynamic', ["false", "0", False])
+def test_dynamic_false_creates_static_qr(tmp_path, dynamic):
+    response, slugs = create_qr(tmp_path, {"dynamic": dynamic, "content": "https://www.example.com"})
+    assert response.status == 200
+    assert response.content_type == 'image/png'
+    assert slugs == 0
+
+
+@pytest.mark.parametrize('dynamic', ["true", True])
+def test_dynamic_true_creates_slug(tmp_path, dynamic):
+    response, slugs = create_qr(tmp_path, {"dynamic": dynamic, "target": "https://www.example.com"})
+    assert response.status == 201
+    assert json.loads(response.body)['target'] == "https://www.example.com"
+    assert slugs == 1
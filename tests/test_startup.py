@@ -0,0 +1,44 @@
+"""
+Presupuesto de arranque de la interfaz gráfica
+Arranca la aplicación con main.main([]) en procesos nuevos (plataforma Qt
+'offscreen') y comprueba el tiempo hasta el primer pintado y que los
+módulos diferidos no se cargan antes (ver benchmarks/bench_startup.py).
+
+Uso:
+    python -m pytest tests/test_startup.py
+"""
+
+import statistics
+import sys
+from pathlib import Path
+
+import pytest
+
+# Permitir ejecutar las pruebas desde cualquier directorio
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+pytest.importorskip('PyQt6.QtWidgets')
+
+from benchmarks.bench_startup import DEFAULT_BUDGET_MS, collect_samples
+
+
+# Procesos medidos (se compara la mediana con el presupuesto)
+RUNS = 3
+
+
+@pytest.fixture(scope='module')
+def samples():
+    """Medidas de varios arranques en frío"""
+    return collect_samples(RUNS)
+
+
+def test_first_paint_within_budget(samples):
+    first_paint = statistics.median(sample['first_paint_ms'] for sample in samples)
+    assert first_paint <= DEFAULT_BUDGET_MS, (
+        f"Primer pintado en {first_paint:.0f} ms (presupuesto {DEFAULT_BUDGET_MS} ms)"
+    )
+
+
+def test_deferred_modules_not_loaded_before_first_paint(samples):
+    loaded = sorted({module for sample in samples for module in sample['loaded']})
+    assert loaded == [], f"Módulos cargados antes del primer pintado: {', '.join(loaded)}"
@@ -14,6 +14,19 @@ class CustomizationPanel(QWidget):
     # Señal emitida cuando cambia alguna configuración
     customization_changed = pyqtSignal(dict)
     
+    # Opciones de los combos, en el mismo orden que sus elementos
+    PATTERN_STYLES = ['squares', 'rounded', 'circles', 'flowers', 'hearts', 'dots']
+    FRAME_STYLES = [
+        'none', 
+        'scan_me_top', 
+        'scan_me_bottom', 
+        'simple_border', 
+        'rounded_border',
+        'camera_icon',
+        'smartphone_icon',
+        'elegant'
+    ]
+    
     def __init__(self):
         super().__init__()
         self.config = {
@@ -21,6 +34,7 @@ class CustomizationPanel(QWidget):
             'background_color': '#FFFFFF',  # Blanco por defecto
             'pattern_style': 'squares',  # Estilo por defecto
             'frame_style': 'none',  # Sin marco por defecto
+            'caption_text': 'SCAN ME',  # Texto de los marcos con leyenda
         }
         self.setup_ui()
         
@@ -238,6 +252,18 @@ class CustomizationPanel(QWidget):
         self.frame_combo.currentIndexChanged.connect(self.on_frame_changed)
         layout.addWidget(self.frame_combo)
         
+        # Texto de la leyenda (marcos 'Scan Me' y con ícono)
+        from PyQt6.QtWidgets import QLineEdit
+        
+        caption_label = QLabel("Texto del marco:")
+        layout.addWidget(caption_label)
+        
+        self.caption_input = QLineEdit(self.config['caption_text'])
+        self.caption_input.setMaxLength(30)
+        self.caption_input.setMinimumHeight(35)
+        self.caption_input.editingFinished.connect(self.on_caption_changed)
+        layout.addWidget(self.caption_input)
+        
         # Nota informativa
         note = QLabel("💡 Los marcos se agregan alrededor del código QR sin afectar su funcionalidad.")
         note.setWordWrap(True)
@@ -272,8 +298,7 @@ class CustomizationPanel(QWidget):
         pattern_index = self.pattern_combo.currentIndex()
         
         # Mapear índice a nombre de patrón
-        patterns = ['squares', 'rounded', 'circles', 'flowers', 'hearts', 'dots']
-        self.config['pattern_style'] = patterns[pattern_index]
+        self.config['pattern_style'] = self.PATTERN_STYLES[pattern_index]
         
         self.emit_changes() 
           
@@ -282,18 +307,17 @@ class CustomizationPanel(QWidget):
         frame_index = self.frame_combo.currentIndex()
         
         # Mapear índice a nombre de marco
-        frames = [
-            'none', 
-            'scan_me_top', 
-            'scan_me_bottom', 
-            'simple_border', 
-            'rounded_border',
-            'camera_icon',
-            'smartphone_icon',
-            'elegant'
-        ]
-        self.config['frame_style'] = frames[frame_index]
+        self.config['frame_style'] = self.FRAME_STYLES[frame_index]
+        
+        self.emit_changes()
+    
+    def on_caption_changed(self):
+        """Manejar cambio del texto del marco"""
+        caption_text = self.caption_input.text().strip() or 'SCAN ME'
+        if caption_text == self.config['caption_text']:
+            return
         
+        self.config['caption_text'] = caption_text
         self.emit_changes()
 
     def reset_to_defaults(self):
@@ -303,6 +327,7 @@ class CustomizationPanel(QWidget):
             'background_color': '#FFFFFF',
             'pattern_style': 'squares',
             'frame_style': 'none',
+            'caption_text': 'SCAN ME',
         }
         
         # Actualizar previews
@@ -312,9 +337,34 @@ class CustomizationPanel(QWidget):
         # Resetear combos
         self.pattern_combo.setCurrentIndex(0)
         self.frame_combo.setCurrentIndex(0)  # ← AGREGAR ESTA LÍNEA
+        self.caption_input.setText('SCAN ME')
         
         self.emit_changes()
         
+    def neighbour_configs(self):
+        """
+        Configuraciones a un paso de la actual en los combos de patrón y marco
+        
+        Son las que el usuario elegirá probablemente a continuación; primero
+        las siguientes de cada combo y después las anteriores.
+        
+        Returns:
+            list: Diccionarios de configuración
+        """
+        selectors = [
+            (self.pattern_combo, 'pattern_style', self.PATTERN_STYLES),
+            (self.frame_combo, 'frame_style', self.FRAME_STYLES)
+        ]
+        configs = []
+        for step in (1, -1):
+            for combo, key, options in selectors:
+                index = combo.currentIndex() + step
+                if 0 <= index < len(options):
+                    neighbour = self.config.copy()
+                    neighbour[key] = options[index]
+                    configs.append(neighbour)
+        return configs
+    
     def emit_changes(self):
         """Emitir señal con la configuración actual"""
         self.customization_changed.emit(self.config.copy())
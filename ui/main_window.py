@@ -7,7 +7,7 @@ from PyQt6.QtWidgets import (
     QLabel, QPushButton, QMenuBar, QMenu, QStatusBar,
     QSplitter
 )
-from PyQt6.QtCore import Qt, QSize
+from PyQt6.QtCore import Qt, QSize, QTimer
 from PyQt6.QtGui import QAction, QIcon
 
 import config
@@ -18,11 +18,33 @@ class MainWindow(QMainWindow):
     Ventana principal de la aplicación
     """
     
+    # Pestañas de tipos de QR: (atributo, módulo, clase, título, tipo de QR).
+    # Cada una se construye la primera vez que se activa.
+    QR_TABS = [
+        ('url_tab', 'ui.tabs.url_tab', 'URLTab', "🌐 URL", 'url'),
+        ('whatsapp_tab', 'ui.tabs.whatsapp_tab', 'WhatsAppTab', "💬 WhatsApp", 'whatsapp'),
+        ('wifi_tab', 'ui.tabs.wifi_tab', 'WiFiTab', "📶 WiFi", 'wifi'),
+    ]
+    
     def __init__(self):
         super().__init__()
         # Variables para almacenar el QR actual
         self.current_qr_content = None
         self.current_qr_type = None
+        # El preview se renderiza en segundo plano (ver ui.render_worker)
+        from ui.render_worker import PreviewRenderer
+        self.preview_renderer = PreviewRenderer(self)
+        self.preview_renderer.rendered.connect(self.on_preview_rendered)
+        self.preview_renderer.failed.connect(self.on_preview_failed)
+        # Tras un rato sin actividad, pre-renderizar las opciones vecinas
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(config.PREVIEW_PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self.prefetch_previews)
+        # Historial de códigos generados (se abre con el primer código)
+        self.history = None
+        # Petición de render del último clic en "Generar" (se guarda en el historial al terminar)
+        self.generate_request = None
         self.init_ui()
         
     def init_ui(self):
@@ -149,30 +171,47 @@ class MainWindow(QMainWindow):
             }
         """)
         
-        # Importar y agregar formularios
-        from ui.tabs.url_tab import URLTab
-        from ui.tabs.whatsapp_tab import WhatsAppTab
-        from ui.tabs.wifi_tab import WiFiTab
+        # Pestañas vacías: el formulario se construye al activarse (ver ensure_tab)
+        for attribute, _, _, tab_title, _ in self.QR_TABS:
+            setattr(self, attribute, None)
+            self.qr_tabs.addTab(QWidget(), tab_title)
+        self.qr_tabs.currentChanged.connect(self.ensure_tab)
+        self.ensure_tab(self.qr_tabs.currentIndex())
         
+        layout.addWidget(self.qr_tabs)
         
-        # Pestaña URL
-        self.url_tab = URLTab()
-        self.url_tab.generate_qr_requested.connect(self.generate_qr_from_url)
-        self.qr_tabs.addTab(self.url_tab, "🌐 URL")
+        return panel
         
-        # Pestaña WhatsApp
-        self.whatsapp_tab = WhatsAppTab()
-        self.whatsapp_tab.generate_qr_requested.connect(self.generate_qr_from_whatsapp)
-        self.qr_tabs.addTab(self.whatsapp_tab, "💬 WhatsApp")
-
-        # Pestaña WiFi
-        self.wifi_tab = WiFiTab()
-        self.wifi_tab.generate_qr_requested.connect(self.generate_qr_from_wifi)
-        self.qr_tabs.addTab(self.wifi_tab, "📶 WiFi")
+    def ensure_tab(self, index):
+        """
+        Construir el formulario de una pestaña la primera vez que se activa
         
-        layout.addWidget(self.qr_tabs)
+        Args:
+            index: Índice de la pestaña en self.qr_tabs
+        """
+        if not 0 <= index < len(self.QR_TABS):
+            return
+        attribute, module_name, class_name, tab_title, qr_type = self.QR_TABS[index]
+        if getattr(self, attribute) is not None:
+            return
         
-        return panel
+        import importlib
+        tab_class = getattr(importlib.import_module(module_name), class_name)
+        tab = tab_class()
+        setattr(self, attribute, tab)
+        
+        tab.generate_qr_requested.connect(getattr(self, f"generate_qr_from_{qr_type}"))
+        if hasattr(tab, 'content_changed'):
+            tab.content_changed.connect(lambda content: self.preview_qr(content, qr_type))
+        
+        # Sustituir la pestaña vacía sin volver a emitir currentChanged
+        self.qr_tabs.blockSignals(True)
+        placeholder = self.qr_tabs.widget(index)
+        self.qr_tabs.removeTab(index)
+        self.qr_tabs.insertTab(index, tab, tab_title)
+        self.qr_tabs.setCurrentIndex(index)
+        self.qr_tabs.blockSignals(False)
+        placeholder.deleteLater()
         
     def create_center_panel(self):
         """Crear panel central - Preview"""
@@ -187,6 +226,7 @@ class MainWindow(QMainWindow):
         # Widget de preview (importar aquí)
         from ui.preview_widget import PreviewWidget
         self.preview_widget = PreviewWidget()
+        self.preview_widget.display_size_changed.connect(self.on_preview_resized)
         layout.addWidget(self.preview_widget, stretch=1)
         
         # Botón de prueba
@@ -277,20 +317,8 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage("🎨 Generando QR de prueba...", 3000)
         print("🎨 Generando QR de prueba...")
         
-        # Importar el generador
-        from core.qr_generator import QRGenerator
-        
-        # Crear generador
-        generator = QRGenerator()
-        
-        # Generar QR de ejemplo
-        qr_image = generator.generate_url("https://www.example.com", scale=10)
-        
-        # Mostrar en el preview
-        self.preview_widget.update_qr(qr_image)
-        
-        self.statusBar().showMessage("✅ QR generado correctamente", 3000)
-        print("✅ QR generado y mostrado en preview")
+        # Renderizar el QR de ejemplo en segundo plano, al tamaño del preview
+        self.preview_qr("https://www.example.com", 'url')
         
     def export_qr(self):
         """Exportar QR"""
@@ -314,6 +342,7 @@ class MainWindow(QMainWindow):
         
         svg_button = format_dialog.addButton("📐 SVG (Vectorial)", QMessageBox.ButtonRole.AcceptRole)
         png_button = format_dialog.addButton("🖼️ PNG (Imagen)", QMessageBox.ButtonRole.AcceptRole)
+        pdf_button = format_dialog.addButton("📄 PDF (Impresión)", QMessageBox.ButtonRole.AcceptRole)
         cancel_button = format_dialog.addButton("Cancelar", QMessageBox.ButtonRole.RejectRole)
         
         format_dialog.exec()
@@ -328,6 +357,10 @@ class MainWindow(QMainWindow):
             file_format = "SVG"
             file_extension = "svg"
             file_filter = "Archivos SVG (*.svg)"
+        elif clicked_button == pdf_button:
+            file_format = "PDF"
+            file_extension = "pdf"
+            file_filter = "Archivos PDF (*.pdf)"
         else:  # PNG
             file_format = "PNG"
             file_extension = "png"
@@ -379,7 +412,19 @@ class MainWindow(QMainWindow):
                 dark_color=dark_color,
                 light_color=light_color,
                 pattern_style=pattern_style,
-                frame_style=frame_style  # ← AGREGAR
+                frame_style=frame_style,  # ← AGREGAR
+                caption_text=customization_config.get('caption_text')
+            )
+        elif file_format == "PDF":
+            success = exporter.export_pdf(
+                test_content,
+                filepath,
+                scale=10,
+                dark_color=dark_color,
+                light_color=light_color,
+                pattern_style=pattern_style,
+                frame_style=frame_style,
+                caption_text=customization_config.get('caption_text')
             )
         else:  # PNG
             success = exporter.export_png(
@@ -389,7 +434,8 @@ class MainWindow(QMainWindow):
                 dark_color=dark_color,
                 light_color=light_color,
                 pattern_style=pattern_style,
-                frame_style=frame_style  # ← AGREGAR
+                frame_style=frame_style,  # ← AGREGAR
+                caption_text=customization_config.get('caption_text')
             )
         
         if success:
@@ -416,34 +462,9 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(f"🎨 Generando QR para: {url}", 3000)
         print(f"🎨 Generando QR para: {url}")
         
-        try:
-            # Importar el generador
-            from core.qr_generator import QRGenerator
-            
-            # Crear generador
-            generator = QRGenerator()
-            
-            # Generar QR
-            qr_image = generator.generate_url(url, scale=10)
-            
-            # Mostrar en el preview
-            self.preview_widget.update_qr(qr_image)
-            
-            # Guardar el contenido actual para exportación
-            self.current_qr_content = url
-            self.current_qr_type = 'url'
-            
-            self.statusBar().showMessage("✅ QR generado correctamente", 3000)
-            print("✅ QR generado y mostrado en preview")
-            
-        except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"❌ Error al generar QR:\n{str(e)}"
-            )
-            print(f"❌ Error: {e}")
+        # Renderizar en segundo plano; se guarda en el historial si se genera bien
+        self.generate_request = self.preview_qr(url, 'url')
+    
     def generate_qr_from_whatsapp(self, phone, message):
         """
         Generar QR desde el formulario WhatsApp
@@ -456,32 +477,12 @@ class MainWindow(QMainWindow):
         print(f"🎨 Generando QR para WhatsApp: +{phone}")
         
         try:
-            # Importar el generador
-            from core.qr_generator import QRGenerator
-            
-            # Crear generador
-            generator = QRGenerator()
-            
-            # Generar QR
-            qr_image = generator.generate_whatsapp(phone, message, scale=10)
-            
-            # Mostrar en el preview
-            self.preview_widget.update_qr(qr_image)
-            
-            # Guardar el contenido para exportación
             # Construir la URL de WhatsApp
-            import urllib.parse
-            if message:
-                message_encoded = urllib.parse.quote(message)
-                whatsapp_url = f"https://wa.me/{phone}?text={message_encoded}"
-            else:
-                whatsapp_url = f"https://wa.me/{phone}"
+            from core.qr_content import build_whatsapp
+            whatsapp_url = build_whatsapp(phone, message)
             
-            self.current_qr_content = whatsapp_url
-            self.current_qr_type = 'whatsapp'
-            
-            self.statusBar().showMessage("✅ QR de WhatsApp generado correctamente", 3000)
-            print("✅ QR generado y mostrado en preview")
+            # Renderizar en segundo plano; se guarda en el historial si se genera bien
+            self.generate_request = self.preview_qr(whatsapp_url, 'whatsapp')
             
         except Exception as e:
             from PyQt6.QtWidgets import QMessageBox
@@ -497,34 +498,25 @@ class MainWindow(QMainWindow):
         self.statusBar().showMessage(f"🎨 Generando QR para WiFi", 3000)
         print(f"🎨 Generando QR para WiFi: {wifi_string[:50]}...")
         
+        # Renderizar en segundo plano; se guarda en el historial si se genera bien
+        self.generate_request = self.preview_qr(wifi_string, 'wifi')
+
+    def record_history(self, qr_type, content, config):
+        """
+        Guardar un código generado en el historial (un INSERT, sin reescribir nada)
+        
+        Args:
+            qr_type: Tipo de QR
+            content: Contenido con que se generó
+            config: Personalización con que se generó
+        """
         try:
-            # Importar el generador
-            from core.qr_generator import QRGenerator
-            
-            # Crear generador
-            generator = QRGenerator()
-            
-            # Generar QR
-            qr_image = generator.generate(wifi_string, scale=10)
-            
-            # Mostrar en el preview
-            self.preview_widget.update_qr(qr_image)
-            
-            # Guardar el contenido para exportación
-            self.current_qr_content = wifi_string
-            self.current_qr_type = 'wifi'
-            
-            self.statusBar().showMessage("✅ QR de WiFi generado correctamente", 3000)
-            print("✅ QR generado y mostrado en preview")
-            
+            if self.history is None:
+                from core.qr_history import QRHistory
+                self.history = QRHistory()
+            self.history.add(qr_type, content, config)
         except Exception as e:
-            from PyQt6.QtWidgets import QMessageBox
-            QMessageBox.critical(
-                self,
-                "Error",
-                f"❌ Error al generar QR de WiFi:\n{str(e)}"
-            )
-            print(f"❌ Error: {e}")
+            print(f"⚠️ No se pudo guardar en el historial: {e}")
 
     def on_customization_changed(self, config):
         """
@@ -542,30 +534,103 @@ class MainWindow(QMainWindow):
         """
         Regenerar el QR actual con la personalización aplicada
         
+        Retorna inmediatamente: el render se hace en segundo plano y los
+        cambios seguidos (colores, combos) se fusionan en uno solo.
+        
         Args:
             config: Configuración de personalización
-        """
-        try:
-            from core.qr_generator import QRGenerator
             
-            # Crear generador con colores personalizados
-            generator = QRGenerator()
+        Returns:
+            int: Número de la petición de render
+        """
+        self.prefetch_timer.stop()
+        generation = self.preview_renderer.request(
+            self.current_qr_content,
+            config,
+            self.preview_widget.display_size()
+        )
+        if self.generate_request is not None:
+            # Mismo contenido con otra personalización o tamaño: este render
+            # sustituye al pedido por "Generar"
+            self.generate_request = generation
+        return generation
+    
+    def preview_qr(self, content, qr_type):
+        """
+        Mostrar un contenido en el preview (también mientras se escribe)
+        
+        Args:
+            content: Contenido del QR
+            qr_type: Tipo de QR ('url', 'whatsapp', 'wifi')
             
-            # Generar QR con colores
-            qr_image = generator.generate(
+        Returns:
+            int: Número de la petición de render
+        """
+        if content != self.current_qr_content:
+            # Otro contenido: el código pedido por "Generar" ya no se mostrará
+            self.generate_request = None
+        # Guardar el contenido actual para exportación
+        self.current_qr_content = content
+        self.current_qr_type = qr_type
+        return self.regenerate_qr_with_customization(self.customization_panel.get_config())
+    
+    def on_preview_rendered(self, qr_image, content, config):
+        """
+        Mostrar un QR renderizado en segundo plano
+        
+        Args:
+            qr_image: Imagen PIL del QR
+            content: Contenido con que se generó
+            config: Personalización con que se generó
+        """
+        self.preview_widget.update_qr(qr_image)
+        self.statusBar().showMessage("✅ QR actualizado", 2000)
+        self.prefetch_timer.start()
+        
+        # Solo se emite para la petición más reciente: si es la de "Generar", se guarda
+        if self.generate_request == self.preview_renderer.generation():
+            self.generate_request = None
+            self.record_history(self.current_qr_type, content, config)
+    
+    def prefetch_previews(self):
+        """Pre-renderizar en segundo plano los patrones y marcos vecinos del actual"""
+        if self.current_qr_content:
+            self.preview_renderer.prefetch(
                 self.current_qr_content,
-                scale=10,
-                dark_color=config['pattern_color'],
-                light_color=config['background_color'],
-                pattern_style=config['pattern_style'],  # ← AGREGAR ESTA LÍNEA
-                frame_style=config['frame_style']  # ← AGREGAR ESTA LÍNEA
+                self.customization_panel.neighbour_configs(),
+                self.preview_widget.display_size()
             )
-            
-            # Actualizar preview
-            self.preview_widget.update_qr(qr_image)
-            
-            self.statusBar().showMessage("✅ QR actualizado con personalización", 2000)
-            print("✅ QR regenerado con personalización")
-            
-        except Exception as e:
-            print(f"⚠️ Error al regenerar QR: {e}")
\ No newline at end of file
+    
+    def on_preview_resized(self, width, height):
+        """Volver a renderizar el QR actual al nuevo tamaño del preview"""
+        if self.current_qr_content:
+            self.regenerate_qr_with_customization(self.customization_panel.get_config())
+    
+    def on_preview_failed(self, message):
+        """
+        Mostrar el error del último render (p. ej. contenido demasiado largo)
+        
+        Si lo pidió el botón "Generar" se avisa con un diálogo; los errores del
+        preview mientras se escribe solo se muestran en la barra de estado.
+        """
+        self.statusBar().showMessage(f"❌ Error al generar QR: {message}", 5000)
+        if self.generate_request != self.preview_renderer.generation():
+            print(f"⚠️ Error al regenerar QR: {message}")
+            return
+        
+        # El código pedido por "Generar" no se pudo generar: no va al historial
+        self.generate_request = None
+        from PyQt6.QtWidgets import QMessageBox
+        labels = {'whatsapp': "QR de WhatsApp", 'wifi': "QR de WiFi"}
+        QMessageBox.critical(
+            self,
+            "Error",
+            f"❌ Error al generar {labels.get(self.current_qr_type, 'QR')}:\n{message}"
+        )
+        print(f"❌ Error: {message}")
+    
+    def closeEvent(self, event):
+        """Esperar al hilo de render antes de cerrar"""
+        self.prefetch_timer.stop()
+        self.preview_renderer.shutdown()
+        super().closeEvent(event)
@@ -4,19 +4,38 @@ Muestra el código QR generado en tiempo real
 """
 
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QSize, pyqtSignal
 from PyQt6.QtGui import QPixmap, QImage
-from PIL import Image
+
+
+# Modos de Pillow que se muestran sin convertir a RGBA: formato de QImage,
+# modo raw de tobytes() y bytes por píxel
+NATIVE_FORMATS = {
+    '1': (QImage.Format.Format_Grayscale8, 'L', 1),
+    'L': (QImage.Format.Format_Grayscale8, 'L', 1),
+    'P': (QImage.Format.Format_Indexed8, 'P', 1),
+    'RGB': (QImage.Format.Format_RGB888, 'RGB', 3),
+    'RGBA': (QImage.Format.Format_RGBA8888, 'RGBA', 4)
+}
 
 
 class PreviewWidget(QWidget):
     """
     Widget para mostrar el preview del código QR
+    
+    El QR se renderiza al tamaño del área en pantalla (ver display_size);
+    se guarda un pixmap por tamaño del widget, y al redimensionar se reajusta
+    y se avisa con display_size_changed para volver a renderizarlo.
     """
     
+    # Nuevo tamaño del área del QR en píxeles físicos (ancho, alto)
+    display_size_changed = pyqtSignal(int, int)
+    
     def __init__(self):
         super().__init__()
         self.current_qr_image = None
+        # Pixmaps de la imagen actual por tamaño del área (se crea con el primer QR)
+        self._pixmaps = None
         self.init_ui()
         
     def init_ui(self):
@@ -67,19 +86,12 @@ class PreviewWidget(QWidget):
             return
             
         self.current_qr_image = pil_image
-        
-        # Convertir PIL Image a QPixmap
-        qimage = self.pil_to_qimage(pil_image)
-        pixmap = QPixmap.fromImage(qimage)
-        
-        # Escalar para que quepa en el widget manteniendo aspecto
-        scaled_pixmap = pixmap.scaled(
-            self.qr_label.size(),
-            Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        
-        self.qr_label.setPixmap(scaled_pixmap)
+        if self._pixmaps is None:
+            # Pocos: los de un redimensionado
+            from core.qr_cache import LRUCache
+            self._pixmaps = LRUCache(max_entries=4, name='preview_pixmaps')
+        self._pixmaps.clear()
+        self.show_current()
         self.qr_label.setStyleSheet("""
             QLabel {
                 background-color: white;
@@ -89,9 +101,49 @@ class PreviewWidget(QWidget):
             }
         """)
         
+    def display_size(self):
+        """
+        Tamaño del área del QR en píxeles físicos
+        
+        Returns:
+            tuple: (ancho, alto)
+        """
+        rect = self.qr_label.contentsRect()
+        ratio = self.qr_label.devicePixelRatioF()
+        return (max(1, int(rect.width() * ratio)), max(1, int(rect.height() * ratio)))
+    
+    def show_current(self):
+        """Mostrar la imagen actual con el pixmap del tamaño actual del área"""
+        size = self.display_size()
+        pixmap = self._pixmaps.get(size)
+        if pixmap is None:
+            pixmap = QPixmap.fromImage(self.pil_to_qimage(self.current_qr_image))
+            if pixmap.width() > size[0] or pixmap.height() > size[1]:
+                # Imagen de otro tamaño (hasta que llegue el render nuevo): reducir
+                pixmap = pixmap.scaled(
+                    QSize(*size),
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation
+                )
+            pixmap.setDevicePixelRatio(self.qr_label.devicePixelRatioF())
+            self._pixmaps.put(size, pixmap)
+        self.qr_label.setPixmap(pixmap)
+    
+    def resizeEvent(self, event):
+        """Reajustar el QR al nuevo tamaño y pedir un render a esa resolución"""
+        super().resizeEvent(event)
+        if self.current_qr_image is not None:
+            self.show_current()
+            self.display_size_changed.emit(*self.display_size())
+    
     def pil_to_qimage(self, pil_image):
         """
-        Convertir imagen PIL a QImage
+        Convertir imagen PIL a QImage en su formato nativo
+        
+        Los modos 1, L, P, RGB y RGBA se copian una sola vez con tobytes(),
+        sin convertir a RGBA. El QImage apunta a esa copia y la guarda
+        consigo, así que nunca apunta a memoria liberada, sea cual sea la
+        forma en que Pillow reservó la imagen.
         
         Args:
             pil_image: Imagen PIL
@@ -99,18 +151,22 @@ class PreviewWidget(QWidget):
         Returns:
             QImage
         """
-        # Convertir a RGBA si es necesario
-        if pil_image.mode != "RGBA":
+        if pil_image.mode not in NATIVE_FORMATS or 'transparency' in pil_image.info:
             pil_image = pil_image.convert("RGBA")
+        width, height = pil_image.size
+        
+        image_format, rawmode, bytes_per_pixel = NATIVE_FORMATS[pil_image.mode]
+        data = pil_image.tobytes("raw", rawmode)
         
-        data = pil_image.tobytes("raw", "RGBA")
+        qimage = QImage(data, width, height, width * bytes_per_pixel, image_format)
+        qimage._pixel_owner = data
         
-        qimage = QImage(
-            data,
-            pil_image.width,
-            pil_image.height,
-            QImage.Format.Format_RGBA8888
-        )
+        if pil_image.mode == 'P':
+            palette = pil_image.getpalette()
+            qimage.setColorTable([
+                0xFF000000 | (palette[i] << 16) | (palette[i + 1] << 8) | palette[i + 2]
+                for i in range(0, len(palette), 3)
+            ])
         
         return qimage
     
@@ -126,4 +182,7 @@ class PreviewWidget(QWidget):
     def clear(self):
         """Limpiar el preview"""
         self.current_qr_image = None
+        if self._pixmaps is not None:
+            self._pixmaps.clear()
+        self.qr_label.clear()
         self.show_placeholder()
\ No newline at end of file
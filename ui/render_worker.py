@@ -0,0 +1,309 @@
+"""
+Renderizado del preview en segundo plano
+El hilo de la interfaz solo encola peticiones: el QR se genera en un
+QThreadPool y la imagen vuelve a la ventana por señal.
+"""
+
+import threading
+
+from PyQt6.QtCore import QObject, QRunnable, QThread, QThreadPool, pyqtSignal
+
+import config
+
+
+# Escala del QR del preview cuando no se conoce el tamaño en pantalla
+PREVIEW_SCALE = 10
+
+
+class RenderCancelled(Exception):
+    """El render quedó obsoleto: llegó una petición más reciente"""
+
+
+class _RenderJob(QRunnable):
+    """Tarea del pool: renderiza peticiones mientras queden pendientes"""
+
+    def __init__(self, renderer):
+        super().__init__()
+        self.renderer = renderer
+
+    def run(self):
+        self.renderer._drain()
+
+
+class _PrefetchJob(QRunnable):
+    """Tarea del pool: pre-renderiza configuraciones y luego atiende las peticiones reales"""
+
+    def __init__(self, renderer, generation, content, configs, display_size):
+        super().__init__()
+        self.renderer = renderer
+        self.args = (generation, content, configs, display_size)
+
+    def run(self):
+        thread = QThread.currentThread()
+        thread.setPriority(QThread.Priority.LowestPriority)
+        try:
+            self.renderer._prefetch(*self.args)
+        finally:
+            thread.setPriority(QThread.Priority.NormalPriority)
+        # Una petición real que llegó mientras tanto quedó pendiente para este hilo
+        self.renderer._drain()
+
+
+class PreviewRenderer(QObject):
+    """
+    Renderizador del preview fuera del hilo de la interfaz
+
+    Hay como máximo un render en curso. Las peticiones que llegan mientras
+    tanto se fusionan: solo se renderiza la más reciente. Un render que queda
+    obsoleto se abandona en cuanto termina su etapa actual (cuerpo o marco)
+    y su resultado nunca llega al preview.
+
+    El último cuerpo renderizado se conserva: si solo cambian los colores o
+    el marco, se cambia su paleta sin volver a renderizar los módulos.
+
+    Con un tamaño en pantalla, la escala se elige para que el QR quepa en
+    él (ver QRGenerator.fit_scale): no se generan imágenes de varios
+    megapíxeles para mostrarlas a 400 px.
+
+    Los previews terminados se guardan en una caché acotada; prefetch()
+    la llena en los ratos libres con las opciones que probablemente se
+    elijan después, y se abandona en cuanto llega una petición real.
+    """
+
+    # Imagen renderizada (PIL), contenido y configuración con que se generó
+    rendered = pyqtSignal(object, str, dict)
+    # Mensaje de error del último render
+    failed = pyqtSignal(str)
+
+    # Resultados del hilo del pool (se entregan en el hilo de la interfaz)
+    _finished = pyqtSignal(int, object, str, dict)
+    _error = pyqtSignal(int, str)
+
+    def __init__(self, parent=None):
+        """
+        Inicializar el renderizador
+
+        Args:
+            parent: QObject padre
+        """
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._pending = None
+        self._running = False
+
+        # Cuerpo del QR (imagen de paleta) y los parámetros con que se generó
+        self._body = None
+        self._body_key = None
+        self._generator = None
+
+        # Previews terminados: (contenido, tamaño, configuración) -> imagen (no modificar)
+        self._previews = None
+
+        self._finished.connect(self._on_finished)
+        self._error.connect(self._on_error)
+
+    def request(self, content, options, display_size=None):
+        """
+        Pedir un render (retorna inmediatamente)
+
+        Args:
+            content: Contenido del QR
+            options: Configuración de personalización (dict del panel)
+            display_size: Tamaño en pantalla (ancho, alto) en píxeles físicos
+                          (None = escala PREVIEW_SCALE)
+        
+        Returns:
+            int: Número de la petición (ver generation())
+        """
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending = (generation, content, dict(options), display_size)
+            if self._running:
+                # El render en curso recogerá esta petición al terminar
+                return generation
+            self._running = True
+        self._pool.start(_RenderJob(self))
+        return generation
+
+    def prefetch(self, content, configs, display_size=None):
+        """
+        Pre-renderizar configuraciones probables mientras no hay actividad
+
+        No hace nada si hay un render en curso. Cualquier request() posterior
+        detiene el pre-renderizado en la etapa actual y se atiende enseguida.
+
+        Args:
+            content: Contenido del QR
+            configs: Configuraciones a pre-renderizar, por orden de prioridad
+            display_size: Tamaño en pantalla (ancho, alto) en píxeles físicos
+        """
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+            generation = self._generation
+        self._pool.start(_PrefetchJob(self, generation, content, list(configs), display_size))
+
+    def cache_stats(self):
+        """Estadísticas de la caché de previews (None antes del primer render)"""
+        return self._previews.stats() if self._previews is not None else None
+
+    def generation(self):
+        """
+        Número de la petición más reciente
+        
+        rendered y failed solo se emiten para ella: dentro de sus handlers,
+        indica a qué request() corresponde el resultado.
+        """
+        with self._lock:
+            return self._generation
+
+    def cancel(self):
+        """Descartar la petición pendiente y el render en curso"""
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+
+    def shutdown(self):
+        """Cancelar y esperar a que termine el hilo de render"""
+        self.cancel()
+        self._pool.waitForDone()
+
+    def is_busy(self):
+        """True si hay un render en curso o pendiente"""
+        with self._lock:
+            return self._running
+
+    def _is_current(self, generation):
+        with self._lock:
+            return generation == self._generation
+
+    def _check(self, generation):
+        """Abandona el render si ya hay una petición más reciente"""
+        if not self._is_current(generation):
+            raise RenderCancelled()
+
+    def _preview_key(self, content, options, display_size):
+        """Clave de un preview terminado"""
+        return (content, display_size, tuple(sorted(options.items())))
+
+    def _prefetch(self, generation, content, configs, display_size):
+        """Renderiza las configuraciones que falten en la caché (hilo del pool)"""
+        for options in configs:
+            if not self._is_current(generation):
+                return
+            try:
+                self._render(generation, content, options, display_size)
+            except RenderCancelled:
+                return
+            except Exception:
+                # Un vecino que no se puede generar no interesa aquí
+                continue
+
+    def _drain(self):
+        """Renderiza la petición más reciente hasta que no quede ninguna (hilo del pool)"""
+        while True:
+            with self._lock:
+                job = self._pending
+                self._pending = None
+                if job is None:
+                    self._running = False
+                    return
+
+            generation, content, options, display_size = job
+            try:
+                image = self._render(generation, content, options, display_size)
+            except RenderCancelled:
+                continue
+            except Exception as e:
+                self._error.emit(generation, str(e))
+                continue
+            self._finished.emit(generation, image, content, options)
+
+    def _get_generator(self):
+        """Generador y caché de previews (los módulos de render se importan con el primer QR)"""
+        if self._generator is None:
+            from core.qr_cache import LRUCache
+            from core.qr_generator import QRGenerator
+            self._previews = LRUCache(
+                max_entries=32,
+                name='previews',
+                max_bytes=config.PREVIEW_CACHE_MAX_BYTES,
+                sizeof=lambda image: image.width * image.height * len(image.getbands())
+            )
+            self._generator = QRGenerator()
+        return self._generator
+
+    def _render(self, generation, content, options, display_size=None):
+        """
+        Renderiza el QR con la personalización (hilo del pool)
+
+        Raises:
+            RenderCancelled: Si llega una petición más reciente entre etapas
+        """
+        generator = self._get_generator()
+
+        preview_key = self._preview_key(content, options, display_size)
+        image = self._previews.get(preview_key)
+        if image is not None:
+            return image
+
+        if display_size is None:
+            scale = PREVIEW_SCALE
+        else:
+            scale = generator.fit_scale(
+                content,
+                display_size,
+                options['pattern_style'],
+                options['frame_style'],
+                options.get('caption_text')
+            )
+
+        # Parámetros que afectan a la forma del cuerpo (no a sus colores)
+        body_key = (content, scale, options['pattern_style'])
+
+        if self._body is not None and body_key == self._body_key:
+            # Solo cambiaron colores o marco: cambiar la paleta, sin re-renderizar
+            generator.recolor(
+                self._body,
+                dark_color=options['pattern_color'],
+                light_color=options['background_color']
+            )
+        else:
+            self._body = generator.generate_body(
+                content,
+                scale=scale,
+                dark_color=options['pattern_color'],
+                light_color=options['background_color'],
+                pattern_style=options['pattern_style']
+            )
+            self._body_key = body_key
+            self._check(generation)
+
+        # El marco se dibuja sobre una copia, el cuerpo se conserva
+        image = generator.apply_frame(
+            self._body,
+            options['frame_style'],
+            options['pattern_color'],
+            options.get('caption_text')
+        )
+        if image is self._body:
+            # Sin marco: el preview no puede compartir la imagen que se recolorea aquí
+            image = image.copy()
+        self._previews.put(preview_key, image)
+        self._check(generation)
+        return image
+
+    def _on_finished(self, generation, image, content, options):
+        # Una petición pudo llegar mientras la señal cruzaba de hilo
+        if self._is_current(generation):
+            self.rendered.emit(image, content, options)
+
+    def _on_error(self, generation, message):
+        if self._is_current(generation):
+            self.failed.emit(message)
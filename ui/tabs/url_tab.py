@@ -17,6 +17,8 @@ class URLTab(QWidget):
     
     # Señal que se emite cuando el usuario quiere generar el QR
     generate_qr_requested = pyqtSignal(str)  # Emite la URL
+    # Señal que se emite mientras se escribe una URL válida (preview en vivo)
+    content_changed = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
@@ -151,6 +153,7 @@ class URLTab(QWidget):
             self.validation_label.setText("✅ URL válida")
             self.validation_label.setStyleSheet("color: green; padding: 5px;")
             self.generate_button.setEnabled(True)
+            self.content_changed.emit(text.strip())
         else:
             self.validation_label.setText("⚠️ URL inválida - Debe incluir http:// o https://")
             self.validation_label.setStyleSheet("color: orange; padding: 5px;")
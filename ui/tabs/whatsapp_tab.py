@@ -17,6 +17,8 @@ class WhatsAppTab(QWidget):
     
     # Señal que se emite cuando el usuario quiere generar el QR
     generate_qr_requested = pyqtSignal(str, str)  # Emite (phone, message)
+    # Señal que se emite mientras se escribe un número válido (URL, preview en vivo)
+    content_changed = pyqtSignal(str)
     
     def __init__(self):
         super().__init__()
@@ -85,6 +87,7 @@ class WhatsAppTab(QWidget):
             }
         """)
         country_layout.addWidget(self.country_code_combo)
+        self.country_code_combo.currentIndexChanged.connect(self.on_input_changed)
         
         layout.addLayout(country_layout)
         
@@ -213,11 +216,21 @@ class WhatsAppTab(QWidget):
             self.validation_label.setText("✅ Número válido")
             self.validation_label.setStyleSheet("color: green; padding: 5px;")
             self.generate_button.setEnabled(True)
+            self.emit_content()
         else:
             self.validation_label.setText("⚠️ Solo números, sin espacios ni caracteres especiales")
             self.validation_label.setStyleSheet("color: orange; padding: 5px;")
             self.generate_button.setEnabled(False)
     
+    def emit_content(self):
+        """Emitir la URL de WhatsApp del formulario para el preview en vivo"""
+        from core.qr_content import build_whatsapp
+        data = self.get_qr_data()
+        try:
+            self.content_changed.emit(build_whatsapp(data['phone'], data['message']))
+        except ValueError:
+            pass
+    
     def validate_phone(self, phone):
         """
         Validar número de teléfono
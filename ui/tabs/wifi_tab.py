@@ -203,15 +203,10 @@ class WiFiTab(QWidget):
         }
         encryption = encryption_map[encryption_type]
         
-        # Si es red sin contraseña, vaciar password
-        if encryption == "nopass":
-            password = ""
-        
         # Construir formato WiFi QR
         # Formato: WIFI:T:{encryption};S:{ssid};P:{password};H:{hidden};;
-        hidden_str = "true" if is_hidden else "false"
-        
-        wifi_string = f"WIFI:T:{encryption};S:{ssid};P:{password};H:{hidden_str};;"
+        from core.qr_content import build_wifi
+        wifi_string = build_wifi(ssid, password, encryption, is_hidden)
         
         # Emitir señal para generar QR
         self.generate_qr_requested.emit(wifi_string, "wifi")
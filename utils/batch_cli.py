@@ -0,0 +1,289 @@
+"""
+Generación por lotes desde la línea de comandos (sin interfaz gráfica)
+
+Uso:
+    python main.py batch filas.csv --output salida/ --pattern circles
+    python main.py batch filas.jsonl --workers 4 --frame scan_me_top
+    python main.py batch filas.csv --archive salida.zip
+
+Cada fila describe un QR de tipo url, wifi o whatsapp con sus campos y,
+opcionalmente, parámetros de estilo propios:
+
+    type,url,pattern_style,name
+    url,https://www.example.com,dots,ejemplo
+
+    {"type": "wifi", "ssid": "MiRed", "password": "secreto", "frame_style": "elegant"}
+
+Este módulo no importa Qt.
+"""
+
+import csv
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+import config
+from core.qr_content import parse_bool
+
+
+# Nombres alternativos aceptados en las columnas de entrada
+COLUMN_ALIASES = {
+    'name': 'id',
+    'pattern': 'pattern_style',
+    'frame': 'frame_style',
+    'dark': 'dark_color',
+    'light': 'light_color',
+    'caption': 'caption_text',
+    'error': 'error_correction'
+}
+
+# Columnas con tipo distinto de texto
+INT_COLUMNS = ('scale',)
+BOOL_COLUMNS = ('antialias', 'hidden')
+
+# Extensión de archivo por formato de salida
+FORMAT_EXTENSIONS = {'PNG': '.png', 'JPEG': '.jpg', 'WEBP': '.webp', 'SVG': '.svg', 'PDF': '.pdf'}
+
+# Cada cuántas filas se informa del progreso
+PROGRESS_EVERY = 500
+
+
+def add_batch_arguments(parser):
+    """
+    Registrar las opciones del subcomando 'batch' de main.py
+
+    Args:
+        parser: Parser del subcomando
+    """
+    parser.add_argument('input', help="Archivo CSV o JSONL ('-' = entrada estándar)")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'],
+                        help='Formato de la entrada (por defecto según la extensión)')
+    parser.add_argument('-o', '--output', default=str(config.EXPORTS_DIR / 'batch'),
+                        help='Directorio de salida')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Procesos en paralelo (por defecto, todos los núcleos)')
+    parser.add_argument('--image-format', choices=sorted(FORMAT_EXTENSIONS), default='PNG',
+                        help='Formato de las imágenes generadas')
+    parser.add_argument('--unordered', action='store_true',
+                        help='Escribir los resultados a medida que terminan')
+    parser.add_argument('--archive',
+                        help='Escribir todo en un archivo .zip o .tar (con índice) en lugar de archivos sueltos')
+
+    # Estilo común (cada fila puede sobrescribirlo)
+    parser.add_argument('--scale', type=int, default=config.DEFAULT_EXPORT_SCALE)
+    parser.add_argument('--pattern', dest='pattern_style', default='squares')
+    parser.add_argument('--frame', dest='frame_style', default='none')
+    parser.add_argument('--dark', dest='dark_color', default=config.DEFAULT_QR_COLOR)
+    parser.add_argument('--light', dest='light_color', default=config.DEFAULT_BG_COLOR)
+    parser.add_argument('--caption', dest='caption_text', default=None)
+    parser.add_argument('--antialias', action='store_true')
+    parser.add_argument('--error-correction', choices=list(config.ERROR_CORRECTION_LEVELS),
+                        default=config.DEFAULT_ERROR_CORRECTION)
+    return parser
+
+
+def normalize_row(row):
+    """
+    Convierte una fila de entrada en un elemento de generate_many
+
+    Args:
+        row: dict leído del CSV o JSONL
+
+    Returns:
+        dict: Elemento con 'type' (o 'content'), campos y parámetros de estilo
+
+    Raises:
+        ValueError: Si algún valor no tiene el tipo esperado
+    """
+    item = {}
+    for key, value in row.items():
+        if key is None or value is None or value == '':
+            continue
+        key = key.strip().lower()
+        key = COLUMN_ALIASES.get(key, key)
+
+        if key in INT_COLUMNS:
+            value = int(value)
+        elif key in BOOL_COLUMNS:
+            value = parse_bool(value)
+        item[key] = value
+
+    if 'content' not in item:
+        item.setdefault('type', 'url')
+    return item
+
+
+def read_rows(stream, input_format):
+    """
+    Lee las filas de forma perezosa (memoria constante)
+
+    Args:
+        stream: Archivo de texto abierto
+        input_format: 'csv' o 'jsonl'
+
+    Yields:
+        tuple: (número de fila, dict con la fila o None, error o None)
+    """
+    if input_format == 'csv':
+        reader = csv.DictReader(stream)
+        for row_number, row in enumerate(reader, start=1):
+            yield row_number, row, None
+        return
+
+    for row_number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, None, f"JSON inválido: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield row_number, None, "La fila no es un objeto JSON"
+            continue
+        yield row_number, row, None
+
+
+def _safe_name(name):
+    """Nombre de archivo seguro a partir del identificador de la fila"""
+    name = re.sub(r'[^\w.-]+', '_', str(name)).strip('._')
+    return name[:100]
+
+
+class BatchRun:
+    """
+    Ejecución de un lote: lee filas, genera en paralelo y escribe resultados
+    """
+
+    def __init__(self, args):
+        """
+        Inicializar la ejecución
+
+        Args:
+            args: Argumentos del subcomando 'batch'
+        """
+        self.args = args
+        self.output_dir = Path(args.output)
+        self.extension = FORMAT_EXTENSIONS[args.image_format]
+        self.style = {
+            'scale': args.scale,
+            'pattern_style': args.pattern_style,
+            'frame_style': args.frame_style,
+            'dark_color': args.dark_color,
+            'light_color': args.light_color,
+            'caption_text': args.caption_text,
+            'antialias': args.antialias,
+            'error_correction': args.error_correction
+        }
+        self.rows = 0
+        self.written = 0
+        self.failed = 0
+        self.start_time = None
+
+    def _items(self, stream, input_format):
+        """Convierte las filas en elementos; las filas inválidas se informan aquí"""
+        for row_number, row, error in read_rows(stream, input_format):
+            self.rows += 1
+            if error is None:
+                try:
+                    item = normalize_row(row)
+                except ValueError as e:
+                    error = f"{type(e).__name__}: {e}"
+            if error is not None:
+                self._report_failure(f"fila {row_number}", error)
+                continue
+
+            item['id'] = _safe_name(item.get('id') or f"{row_number:06d}") or f"{row_number:06d}"
+            yield item
+
+    def _report_failure(self, label, error):
+        """Informar de una fila fallida sin detener el lote"""
+        self.failed += 1
+        print(f"❌ {label}: {error}", file=sys.stderr)
+
+    def _report_progress(self, final=False):
+        """Mostrar filas procesadas y filas por segundo"""
+        elapsed = max(time.perf_counter() - self.start_time, 1e-9)
+        rate = self.rows / elapsed
+        prefix = "✅ Lote terminado:" if final else "⏳"
+        print(f"{prefix} {self.rows} filas en {elapsed:.1f} s ({rate:.1f} filas/s), "
+              f"{self.written} escritas, {self.failed} con error")
+
+    def run(self):
+        """
+        Ejecutar el lote completo
+
+        Returns:
+            int: Código de salida (0 = sin errores, 1 = alguna fila falló)
+        """
+        from core.qr_batch import generate_many
+
+        args = self.args
+        input_format = args.input_format
+        if input_format is None:
+            input_format = 'jsonl' if args.input.lower().endswith(('.jsonl', '.json')) else 'csv'
+
+        if args.input == '-':
+            stream = sys.stdin
+        else:
+            stream = open(args.input, newline='', encoding='utf-8')
+
+        archive = None
+        if args.archive:
+            from core.qr_archive import QRArchiveWriter
+            archive = QRArchiveWriter(args.archive)
+        else:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.start_time = time.perf_counter()
+
+        try:
+            results = generate_many(
+                self._items(stream, input_format),
+                self.style,
+                workers=args.workers,
+                ordered=not args.unordered,
+                encode=args.image_format
+            )
+            for result in results:
+                if result.error:
+                    self._report_failure(f"'{result.item['id']}'", result.error)
+                    continue
+
+                filename = f"{result.item['id']}{self.extension}"
+                if archive is not None:
+                    archive.add(filename, result.image)
+                else:
+                    (self.output_dir / filename).write_bytes(result.image)
+                self.written += 1
+
+                if self.written % PROGRESS_EVERY == 0:
+                    self._report_progress()
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if archive is not None:
+                archive.close()
+
+        self._report_progress(final=True)
+        print(f"📁 Salida: {args.archive or self.output_dir}")
+        return 0 if self.failed == 0 else 1
+
+
+def run_batch(args):
+    """
+    Punto de entrada del subcomando 'batch'
+
+    Args:
+        args: Argumentos del subcomando
+
+    Returns:
+        int: Código de salida
+    """
+    try:
+        return BatchRun(args).run()
+    except FileNotFoundError as e:
+        print(f"❌ No se encontró el archivo: {e.filename}", file=sys.stderr)
+        return 2
@@ -0,0 +1,338 @@
+"""
+Perfil de arranque en frío de la aplicación
+
+Uso:
+    python main.py --profile-startup            # interfaz gráfica
+    python main.py --profile-startup batch      # generación por lotes (sin Qt)
+    python main.py --profile-startup serve      # servicio HTTP (sin Qt)
+
+El arranque se repite en un proceso nuevo con 'python -X importtime' y se
+mide: el coste de cada import, la importación de config, la construcción
+de cada panel de la ventana, el primer pintado y el primer QR generado.
+El informe JSON se guarda en config.PROFILES_DIR.
+
+Con él se detectan regresiones cuando una pestaña nueva o una dependencia
+pesada (reportlab, svglib, vobject...) empieza a importarse al arrancar.
+
+Este módulo no importa Qt (solo el proceso medido en modo 'gui'). Los
+demás imports están dentro de las funciones para no contaminar la medida
+del proceso medido, que carga este mismo módulo.
+"""
+
+import sys
+import time
+
+
+# Modos de arranque que se pueden medir
+PROFILE_TARGETS = ['gui', 'batch', 'serve']
+
+# Módulos pesados que no deberían cargarse antes del primer pintado / QR
+WATCHED_MODULES = ['PIL', 'segno', 'numpy', 'reportlab', 'svglib', 'vobject', 'sqlite3']
+
+# Contenido del primer QR medido
+PROFILE_CONTENT = "https://www.example.com"
+
+# Espera máxima del proceso medido (s)
+PROFILE_TIMEOUT = 120
+
+
+def parse_importtime(stderr):
+    """
+    Interpreta la salida de 'python -X importtime'
+
+    Args:
+        stderr: Texto de la salida de errores del proceso
+
+    Returns:
+        list: {'module', 'self_us', 'cumulative_us', 'depth'} en orden de carga
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # Cabecera ("self [us] | cumulative | imported package")
+            continue
+        name = fields[2].rstrip()
+        imports.append({
+            'module': name.strip(),
+            'self_us': int(fields[0]),
+            'cumulative_us': int(fields[1]),
+            'depth': (len(name) - len(name.lstrip())) // 2
+        })
+    return imports
+
+
+def _loaded_watched():
+    """Módulos vigilados que ya están cargados en este proceso"""
+    return sorted({name.split('.')[0] for name in sys.modules} & set(WATCHED_MODULES))
+
+
+class _Clock:
+    """Marcas de tiempo en ms desde el arranque del proceso medido"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, name):
+        self.marks[name] = round((time.perf_counter() - self.start) * 1000, 2)
+
+    def timed(self, function, name):
+        """Envuelve una función para anotar su duración en ms"""
+        def wrapper(*args, **kwargs):
+            begin = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.marks[name] = round((time.perf_counter() - begin) * 1000, 2)
+        return wrapper
+
+
+def _profile_gui(clock, result):
+    """Arranque de la interfaz: paneles, primer pintado y primer QR"""
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEvent, QObject, QTimer
+
+    app = QApplication(sys.argv[:1])
+    clock.mark('qapplication')
+
+    from ui.main_window import MainWindow
+    clock.mark('import_main_window')
+
+    # Duración de cada panel (se mide la ventana real, sin copiar su código)
+    panels = {
+        'menu_bar': 'create_menu_bar',
+        'left_panel': 'create_left_panel',
+        'center_panel': 'create_center_panel',
+        'right_panel': 'create_right_panel',
+        'status_bar': 'create_status_bar'
+    }
+    panel_clock = _Clock()
+    for name, method in panels.items():
+        setattr(MainWindow, method, panel_clock.timed(getattr(MainWindow, method), name))
+
+    window = MainWindow()
+    clock.mark('main_window')
+    result['panels_ms'] = panel_clock.marks
+
+    class FirstPaint(QObject):
+        def eventFilter(self, watched, event):
+            if event.type() == QEvent.Type.Paint and 'first_paint' not in clock.marks:
+                clock.mark('first_paint')
+                result['loaded_before_first_paint'] = _loaded_watched()
+                # Primer QR en cuanto la ventana está en pantalla
+                QTimer.singleShot(0, lambda: window.preview_qr(PROFILE_CONTENT, 'url'))
+            return False
+
+    def on_rendered(*_):
+        clock.mark('first_qr')
+        app.quit()
+
+    def on_failed(message):
+        result['error'] = message
+        app.quit()
+
+    first_paint = FirstPaint()
+    app.installEventFilter(first_paint)
+    window.preview_renderer.rendered.connect(on_rendered)
+    window.preview_renderer.failed.connect(on_failed)
+    QTimer.singleShot(PROFILE_TIMEOUT * 1000, app.quit)
+
+    window.show()
+    app.exec()
+    window.preview_renderer.shutdown()
+
+
+def _profile_batch(clock, result):
+    """Arranque de la generación por lotes: módulo del comando y primer QR"""
+    import utils.batch_cli  # noqa: F401
+    clock.mark('import_command')
+    result['loaded_before_first_qr'] = _loaded_watched()
+
+    from core.qr_batch import init_worker, render_item
+    init_worker()
+    clock.mark('init_worker')
+    render_item(PROFILE_CONTENT, None, 'PNG')
+    clock.mark('first_qr')
+
+
+def _profile_serve(clock, result):
+    """Arranque del servicio: módulo, socket y primer QR a través del pool"""
+    import asyncio
+    import api.server
+    clock.mark('import_command')
+    result['loaded_before_first_qr'] = _loaded_watched()
+
+    import tempfile
+    from pathlib import Path
+
+    async def serve():
+        with tempfile.TemporaryDirectory() as tmp:
+            server = api.server.QRServer(
+                '127.0.0.1', 0, 1,
+                slug_db=Path(tmp) / 'slugs.db',
+                history_db=Path(tmp) / 'history.db',
+                disk_cache=False
+            )
+            await server.start()
+            clock.mark('server_start')
+            try:
+                # Incluye el arranque del proceso de render
+                await server.render({'content': PROFILE_CONTENT}, None, 'PNG')
+                clock.mark('first_qr')
+            finally:
+                await server.close()
+
+    asyncio.run(serve())
+
+
+def measure(target, output_path):
+    """
+    Proceso medido: arranca el modo pedido y escribe las medidas en JSON
+
+    Args:
+        target: Modo de arranque ('gui', 'batch', 'serve')
+        output_path: Archivo donde escribir el resultado
+    """
+    clock = _Clock()
+    import main  # noqa: F401  (mismo camino de imports que la aplicación; incluye config)
+    clock.mark('import_main')
+
+    result = {}
+    profilers = {'gui': _profile_gui, 'batch': _profile_batch, 'serve': _profile_serve}
+    try:
+        profilers[target](clock, result)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+
+    result['marks_ms'] = clock.marks
+
+    import json
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def build_report(target, measured, imports, wall_ms):
+    """
+    Informe de arranque
+
+    Args:
+        target: Modo medido
+        measured: Resultado del proceso medido
+        imports: Imports de parse_importtime()
+        wall_ms: Duración total del proceso medido
+
+    Returns:
+        dict: Informe serializable
+    """
+    import platform
+    from datetime import datetime
+
+    import config
+
+    by_module = {entry['module']: entry for entry in imports}
+    slowest = sorted(imports, key=lambda entry: entry['self_us'], reverse=True)[:25]
+
+    top_level = {}
+    for entry in imports:
+        package = entry['module'].split('.')[0]
+        top_level[package] = top_level.get(package, 0) + entry['self_us']
+
+    return {
+        'target': target,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'app_version': config.APP_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'wall_ms': round(wall_ms, 2),
+        'marks_ms': measured.get('marks_ms', {}),
+        'panels_ms': measured.get('panels_ms', {}),
+        'config_import_us': by_module.get('config', {}).get('cumulative_us'),
+        'import_total_us': sum(entry['self_us'] for entry in imports),
+        'import_by_package_us': dict(sorted(top_level.items(), key=lambda item: item[1], reverse=True)),
+        'slowest_imports': slowest,
+        'watched_loaded_early': measured.get(
+            'loaded_before_first_paint', measured.get('loaded_before_first_qr', [])
+        ),
+        'error': measured.get('error'),
+        'imports': imports
+    }
+
+
+def profile_startup(target='gui', output_dir=None):
+    """
+    Medir el arranque en un proceso nuevo y guardar el informe
+
+    Args:
+        target: Modo de arranque ('gui', 'batch', 'serve')
+        output_dir: Directorio del informe (None = config.PROFILES_DIR)
+
+    Returns:
+        int: Código de salida (0 si la medida se completó)
+    """
+    import json
+    import os
+    import subprocess
+    import tempfile
+    from datetime import datetime
+    from pathlib import Path
+
+    import config
+
+    if target not in PROFILE_TARGETS:
+        print(f"❌ Modo desconocido: {target} (usa {', '.join(PROFILE_TARGETS)})", file=sys.stderr)
+        return 2
+
+    env = dict(os.environ)
+    if target == 'gui':
+        # Sin ventana visible: el primer pintado se mide igual
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = Path(tmp) / 'result.json'
+        start = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'utils.startup_profiler', target, str(result_path)],
+            cwd=config.BASE_DIR, env=env, capture_output=True, text=True, timeout=PROFILE_TIMEOUT
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        if not result_path.exists():
+            print(f"❌ El proceso medido falló:\n{process.stderr[-2000:]}", file=sys.stderr)
+            return 1
+        measured = json.loads(result_path.read_text(encoding='utf-8'))
+
+    report = build_report(target, measured, parse_importtime(process.stderr), wall_ms)
+
+    output_dir = Path(output_dir or config.PROFILES_DIR)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_path = output_dir / f"startup-{target}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    report_path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    print_summary(report)
+    print(f"📁 Informe: {report_path}")
+    return 1 if report['error'] else 0
+
+
+def print_summary(report):
+    """Resumen legible de un informe"""
+    print(f"⏱️  Arranque '{report['target']}' ({report['wall_ms']:.0f} ms de proceso)")
+    for name, value in report['marks_ms'].items():
+        print(f"   {name:<24} {value:>9.1f} ms")
+    for name, value in report['panels_ms'].items():
+        print(f"   panel {name:<18} {value:>9.1f} ms")
+    if report['config_import_us'] is not None:
+        print(f"   import config            {report['config_import_us'] / 1000:>9.1f} ms")
+    print("   Imports más costosos (propios):")
+    for entry in report['slowest_imports'][:10]:
+        print(f"     {entry['module']:<40} {entry['self_us'] / 1000:>7.1f} ms")
+    if report['watched_loaded_early']:
+        print(f"⚠️ Cargados antes de tiempo: {', '.join(report['watched_loaded_early'])}")
+    if report['error']:
+        print(f"❌ Error: {report['error']}")
+
+
+if __name__ == "__main__":
+    # Proceso medido: python -X importtime -m utils.startup_profiler <modo> <salida.json>
+    measure(sys.argv[1], sys.argv[2])